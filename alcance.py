@@ -0,0 +1,143 @@
+import time
+
+import numpy as np
+
+from componentes import componentes_fortes
+from grafo_compacto import GrafoCompacto, bfs_csr, csr_de_pares, expandir_fronteira, grafo_compacto_de_networkx
+
+
+# Memória de trabalho (bytes) de cada bloco de colunas dos bitsets: limita a matriz desempacotada
+# (componentes x colunas do bloco)
+MEMORIA_BLOCO_ALCANCE = 64 * 2 ** 20
+
+# Tamanho máximo (bytes) do índice de alcance guardado (um bit por par de componentes fortes); acima
+# dele só as contagens são guardadas e as consultas de alcance viram BFS no DAG de componentes
+LIMITE_INDICE_ALCANCE = 256 * 2 ** 20
+
+# Função para condensar o grafo no DAG dos seus componentes fortemente conexos
+def condensar(grafo, rotulos_componentes=None):
+    """
+    DAG de componentes fortes: cada componente vira um nó e fica uma aresta entre dois componentes
+    se alguma aresta do grafo os liga (sem repetidas nem laços). `rotulos_componentes`: componente
+    forte de cada nó, se já calculado (métrica "componentes_fortes").
+    Retorna {"componente": componente de cada nó, "tamanhos", "indptr", "indices"} (CSR do DAG).
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    if rotulos_componentes is None:
+        rotulos_componentes = componentes_fortes(grafo)["rotulos"]
+    tamanhos = np.bincount(rotulos_componentes).astype(np.int64)
+    u = rotulos_componentes[grafo._origens()].astype(np.int64)
+    v = rotulos_componentes[grafo.indices].astype(np.int64)
+    entre_componentes = u != v
+    indptr, indices = csr_de_pares(u[entre_componentes], v[entre_componentes], len(tamanhos))
+    return {"componente": rotulos_componentes, "tamanhos": tamanhos, "indptr": indptr, "indices": indices}
+
+
+# Função para calcular a camada topológica de cada nó de um DAG (Kahn vetorizado)
+def camadas_topologicas(indptr, indices):
+    """
+    Camada de cada nó de um DAG em CSR: 0 para as fontes e, para os demais, o comprimento do maior
+    caminho vindo de uma fonte. Toda aresta u -> v tem camada[u] < camada[v]. Cada passo retira de
+    uma vez todos os nós sem predecessores restantes (grau de entrada zerado com np.bincount).
+    Levanta ValueError se o grafo tiver ciclo.
+    """
+    n = len(indptr) - 1
+    entrada = np.bincount(np.asarray(indices, dtype=np.int64), minlength=n)
+    camadas = np.full(n, -1, dtype=np.int32)
+    fronteira = np.flatnonzero(entrada == 0)
+    camada = 0
+    while len(fronteira):
+        camadas[fronteira] = camada
+        sucessores = expandir_fronteira(indptr, indices, fronteira)
+        entrada -= np.bincount(sucessores, minlength=n)
+        fronteira = np.unique(sucessores[entrada[sucessores] == 0])
+        camada += 1
+    if (camadas == -1).any():
+        raise ValueError("O grafo tem ciclo: não há ordem topológica")
+    return camadas
+
+
+# Função para montar o índice de alcance (quem alcança quem) sobre o DAG de componentes fortes
+def indice_alcance(grafo, rotulos_componentes=None, limite_indice=LIMITE_INDICE_ALCANCE):
+    """
+    Índice de alcance transitivo (ex.: "o artigo A cita B direta ou indiretamente?") sem BFS de
+    todos os pares: o grafo é condensado no DAG de componentes fortes e o conjunto de componentes
+    alcançáveis de cada componente vira um bitset, propagado das camadas mais fundas para as mais
+    rasas (bitset(u) = {u} | OU dos bitsets dos sucessores), uma camada inteira por vez com
+    np.bitwise_or.reduceat. As colunas são processadas em blocos de MEMORIA_BLOCO_ALCANCE.
+    Retorna o DAG (ver condensar), "camadas", "descendentes" e "ascendentes" de cada nó (quantos
+    nós ele alcança / o alcançam, sem contar ele mesmo), "pares_alcancaveis" (pares ordenados
+    u != v com caminho de u a v) e "bits": matriz (componentes x bytes) com o bitset de cada
+    componente, ou None se passar de `limite_indice` bytes (consultas por BFS; ver alcanca).
+    """
+    inicio = time.perf_counter()
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    dag = condensar(grafo, rotulos_componentes)
+    indptr, indices, tamanhos = dag["indptr"], dag["indices"], dag["tamanhos"]
+    c = len(tamanhos)
+    camadas = camadas_topologicas(indptr, indices)
+
+    # Arestas de cada camada com saída, da mais funda para a mais rasa, prontas para o reduceat
+    graus_saida = np.diff(np.asarray(indptr, dtype=np.int64))
+    passos = []
+    for camada in range(int(camadas.max(initial=-1)), -1, -1):
+        nos = np.flatnonzero((camadas == camada) & (graus_saida > 0))
+        if len(nos):
+            inicios = np.concatenate(([0], np.cumsum(graus_saida[nos])[:-1]))
+            passos.append((nos, expandir_fronteira(indptr, indices, nos), inicios))
+
+    bytes_linha = (c + 7) // 8
+    bits = np.zeros((c, bytes_linha), dtype=np.uint8) if c * bytes_linha <= limite_indice else None
+    alcancados = np.zeros(c, dtype=np.int64)  # nós alcançados por cada componente (incluindo os dele)
+    alcancam = np.zeros(c, dtype=np.int64)    # nós que alcançam cada componente (incluindo os dele)
+    largura = _largura_bloco(c, c)
+    for coluna in range(0, c, largura):
+        alvos = np.arange(coluna, min(coluna + largura, c))
+        bloco = np.zeros((c, (len(alvos) + 7) // 8), dtype=np.uint8)
+        bloco[alvos, (alvos - coluna) // 8] = np.left_shift(1, 7 - (alvos - coluna) % 8).astype(np.uint8)
+        for nos, sucessores, inicios in passos:
+            bloco[nos] |= np.bitwise_or.reduceat(bloco[sucessores], inicios, axis=0)
+
+        alcance_bloco = np.unpackbits(bloco, axis=1, count=len(alvos))
+        alcancados += alcance_bloco @ tamanhos[alvos]
+        alcancam[alvos] = tamanhos @ alcance_bloco
+        if bits is not None:
+            bits[:, coluna // 8:coluna // 8 + bloco.shape[1]] = bloco
+
+    componente = dag["componente"]
+    descendentes = alcancados[componente] - 1
+    return {
+        **dag,
+        "camadas": camadas,
+        "numero_camadas": int(camadas.max(initial=-1)) + 1,
+        "descendentes": descendentes,
+        "ascendentes": alcancam[componente] - 1,
+        "pares_alcancaveis": int(descendentes.sum()),
+        "bits": bits,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+# Função para consultar no índice se existe caminho de um nó a outro
+def alcanca(indice, origem, destino):
+    """
+    True se há caminho de `origem` a `destino` (índices internos do grafo compacto). Mesmo
+    componente forte: sim; camada topológica do componente de origem não menor que a do destino:
+    não; senão, o bit do índice (ou uma BFS no DAG, se o índice não guardou os bits).
+    """
+    de, para = int(indice["componente"][origem]), int(indice["componente"][destino])
+    if de == para:
+        return True
+    if indice["camadas"][de] >= indice["camadas"][para]:
+        return False
+    if indice["bits"] is not None:
+        return bool(indice["bits"][de, para // 8] >> (7 - para % 8) & 1)
+    return bool(bfs_csr(indice["indptr"], indice["indices"], de)[para] >= 0)
+
+
+def _largura_bloco(linhas, colunas):
+    """Colunas (múltiplo de 8) por bloco para que linhas x colunas caiba em MEMORIA_BLOCO_ALCANCE."""
+    largura = max(8, MEMORIA_BLOCO_ALCANCE // max(linhas, 1) // 8 * 8)
+    return min(largura, max(colunas, 1))
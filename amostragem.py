@@ -0,0 +1,230 @@
+from collections import deque
+
+import numpy as np
+
+from grafo_compacto import GrafoCompacto, csr_de_pares
+
+
+# Passos de passeio sem nó novo antes de saltar para um nó aleatório (evita ficar preso num componente pequeno)
+_PASSOS_SEM_NOVIDADE = 100
+
+
+# Função para sortear nós com um passeio aleatório (com reinício e saltos)
+def amostra_passeio_aleatorio(grafo, tamanho, semente=42, probabilidade_reinicio=0.15):
+    """
+    Passeio aleatório pelas arestas (vistas como não direcionadas). A cada passo volta ao nó inicial
+    com `probabilidade_reinicio`; se passar _PASSOS_SEM_NOVIDADE passos sem visitar nó novo, salta
+    para um nó sorteado. A chance de um nó entrar é ~ proporcional ao grau, então os pesos
+    de desenho são 1 / grau.
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    tamanho = min(tamanho, n)
+    visitados = {}
+    inicio = atual = int(gerador.integers(n))
+    sem_novidade = 0
+    while len(visitados) < tamanho:
+        if atual not in visitados:
+            visitados[atual] = None
+            sem_novidade = 0
+        else:
+            sem_novidade += 1
+        vizinhos = _vizinhos(grafo, atual)
+        if sem_novidade > _PASSOS_SEM_NOVIDADE or not len(vizinhos):
+            inicio = atual = int(gerador.integers(n))
+            sem_novidade = 0
+        elif gerador.random() < probabilidade_reinicio:
+            atual = inicio
+        else:
+            atual = int(vizinhos[gerador.integers(len(vizinhos))])
+    nos = np.sort(np.fromiter(visitados, dtype=np.int64, count=len(visitados)))
+    return _resultado("passeio_aleatorio", nos, 1.0 / np.maximum(_graus(grafo, nos), 1))
+
+
+# Função para sortear nós com o modelo de incêndio florestal (forest fire)
+def amostra_incendio_florestal(grafo, tamanho, semente=42, probabilidade_queima=0.7):
+    """
+    A partir de um nó sorteado, cada nó queimado incendeia um número geométrico de vizinhos
+    ainda não queimados (média p / (1 - p)); quando o fogo apaga, recomeça num nó sorteado.
+    Preserva aglomerados locais e caminhos; a probabilidade de inclusão não tem forma fechada,
+    então os pesos são uniformes (a amostra favorece regiões densas).
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    tamanho = min(tamanho, n)
+    queimados = {}
+    fila = deque()
+    while len(queimados) < tamanho:
+        if not fila:
+            inicio = int(gerador.integers(n))
+            if inicio in queimados:
+                continue
+            queimados[inicio] = None
+            fila.append(inicio)
+        u = fila.popleft()
+        vizinhos = _vizinhos(grafo, u)
+        novos = vizinhos[[int(v) not in queimados for v in vizinhos]] if len(vizinhos) else vizinhos
+        quantidade = min(int(gerador.geometric(1 - probabilidade_queima)) - 1, len(novos), tamanho - len(queimados))
+        for v in gerador.choice(novos, size=quantidade, replace=False).tolist() if quantidade > 0 else ():
+            queimados[v] = None
+            fila.append(v)
+    nos = np.sort(np.fromiter(queimados, dtype=np.int64, count=len(queimados)))
+    return _resultado("incendio_florestal", nos, np.ones(len(nos)))
+
+
+# Função para sortear nós com bola de neve (BFS a partir de sementes aleatórias)
+def amostra_bola_de_neve(grafo, tamanho, semente=42, sementes=1):
+    """
+    BFS a partir de `sementes` nós sorteados até juntar `tamanho` nós; se a busca esgota o
+    componente, continua de um novo nó sorteado. Dá subgrafos conexos e completos perto das
+    sementes (bom para desenhar), mas super-representa nós centrais: pesos uniformes.
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    tamanho = min(tamanho, n)
+    visitados = {}
+    fila = deque()
+    for inicio in gerador.choice(n, size=min(sementes, tamanho), replace=False).tolist():
+        visitados[inicio] = None
+        fila.append(inicio)
+    while len(visitados) < tamanho:
+        if not fila:
+            inicio = int(gerador.integers(n))
+            if inicio not in visitados:
+                visitados[inicio] = None
+                fila.append(inicio)
+            continue
+        for v in _vizinhos(grafo, fila.popleft()).tolist():
+            if v not in visitados:
+                visitados[v] = None
+                fila.append(v)
+                if len(visitados) >= tamanho:
+                    break
+    nos = np.sort(np.fromiter(visitados, dtype=np.int64, count=len(visitados)))
+    return _resultado("bola_de_neve", nos, np.ones(len(nos)))
+
+
+# Função para sortear arestas e usar o subgrafo induzido pelas suas pontas
+def amostra_arestas_induzidas(grafo, tamanho, semente=42):
+    """
+    Sorteia arestas uniformemente (posições de `indices`) e junta as duas pontas até ter `tamanho`
+    nós; o subgrafo induzido depois recupera as arestas entre eles (induced edge sampling).
+    Nós entram com chance ~ proporcional ao grau: pesos 1 / grau.
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    tamanho = min(tamanho, n)
+    total_arestas = len(grafo.indices)
+    nos = np.empty(0, dtype=np.int64)
+    while len(nos) < tamanho and total_arestas:
+        posicoes = gerador.integers(total_arestas, size=max(tamanho - len(nos), 16))
+        # Origem de cada posição sorteada por busca binária no indptr (sem expandir o CSR)
+        origens = np.searchsorted(grafo.indptr, posicoes, side="right") - 1
+        candidatos = np.stack([origens, np.asarray(grafo.indices)[posicoes]], axis=1).ravel()
+        # Mantém a ordem de chegada: corta exatamente em `tamanho` nós distintos
+        _, primeiros = np.unique(np.concatenate([nos, candidatos]), return_index=True)
+        todos = np.concatenate([nos, candidatos])[np.sort(primeiros)]
+        nos = todos[:tamanho].astype(np.int64)
+    if len(nos) < tamanho:
+        # Grafo sem arestas: completa com nós sorteados
+        nos = gerador.choice(n, size=tamanho, replace=False)
+    nos = np.sort(nos)
+    return _resultado("arestas_induzidas", nos, 1.0 / np.maximum(_graus(grafo, nos), 1))
+
+
+# Função para sortear nós estratificados por faixa de grau
+def amostra_estratificada_por_grau(grafo, tamanho, semente=42, estratos=10):
+    """
+    Divide os nós em faixas logarítmicas de grau e sorteia em cada uma proporcionalmente ao seu
+    tamanho, com pelo menos um nó por faixa: os hubs raros sempre aparecem. Os pesos são exatos
+    (tamanho da faixa / nós sorteados nela), então estimativas ponderadas não têm viés.
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    tamanho = min(tamanho, n)
+    graus = grafo.graus()
+    faixa = np.minimum(np.floor(np.log2(graus + 1) * estratos / np.log2(graus.max() + 2)), estratos - 1).astype(np.int64)
+    tamanhos_faixas = np.bincount(faixa, minlength=estratos)
+    cotas = np.where(tamanhos_faixas > 0, np.maximum(np.round(tamanhos_faixas * tamanho / n), 1), 0)
+    cotas = np.minimum(cotas, tamanhos_faixas).astype(np.int64)
+    ordem = np.argsort(faixa, kind="stable")
+    inicios = np.concatenate([[0], np.cumsum(tamanhos_faixas)])
+    nos, pesos = [], []
+    for indice, cota in enumerate(cotas.tolist()):
+        if cota:
+            nos.append(gerador.choice(ordem[inicios[indice]:inicios[indice + 1]], size=cota, replace=False))
+            pesos.append(np.full(cota, tamanhos_faixas[indice] / cota))
+    nos, pesos = np.concatenate(nos), np.concatenate(pesos)
+    ordem = np.argsort(nos)
+    return _resultado("estratificada_por_grau", nos[ordem], pesos[ordem])
+
+
+# Amostradores disponíveis por nome (argumento `amostrador` das funções de plotagem e de métricas)
+AMOSTRADORES = {
+    "passeio_aleatorio": amostra_passeio_aleatorio,
+    "incendio_florestal": amostra_incendio_florestal,
+    "bola_de_neve": amostra_bola_de_neve,
+    "arestas_induzidas": amostra_arestas_induzidas,
+    "estratificada_por_grau": amostra_estratificada_por_grau,
+}
+
+
+# Função para sortear uma amostra de nós com um amostrador (nome ou função)
+def amostrar(grafo, amostrador, tamanho, semente=42, **opcoes):
+    """
+    Retorna {"metodo", "nos", "pesos"}: índices internos dos nós sorteados (ordenados) e o peso de
+    desenho de cada um (inverso da probabilidade relativa de inclusão), para estimativas ponderadas.
+    """
+    if isinstance(amostrador, str):
+        if amostrador not in AMOSTRADORES:
+            raise ValueError(f"Amostrador desconhecido: {amostrador} (opções: {', '.join(AMOSTRADORES)})")
+        amostrador = AMOSTRADORES[amostrador]
+    return amostrador(grafo, tamanho, semente=semente, **opcoes)
+
+
+# Função para montar o subgrafo induzido por um conjunto de nós
+def subgrafo_induzido(grafo, nos):
+    """
+    GrafoCompacto com os nós `nos` (índices internos, ordenados) e as arestas entre eles.
+    O nó i do subgrafo é nos[i]; os rótulos originais são preservados. Custo proporcional à soma
+    dos graus dos nós da amostra (não ao tamanho do grafo).
+    """
+    nos = np.asarray(nos, dtype=np.int64)
+    k = len(nos)
+
+    def arestas_internas(indptr, indices):
+        inicios = np.asarray(indptr)[nos].astype(np.int64)
+        quantidades = np.asarray(indptr)[nos + 1].astype(np.int64) - inicios
+        deslocamentos = np.arange(quantidades.sum()) - np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+        destinos = np.asarray(indices)[np.repeat(inicios, quantidades) + deslocamentos].astype(np.int64)
+        origens = np.repeat(np.arange(k, dtype=np.int64), quantidades)
+        posicao = np.minimum(np.searchsorted(nos, destinos), max(k - 1, 0))
+        dentro = nos[posicao] == destinos
+        return origens[dentro], posicao[dentro]
+
+    u, v = arestas_internas(grafo.indptr, grafo.indices)
+    indptr, indices = csr_de_pares(u, v, k)
+    rotulos = np.asarray(grafo.rotulos)[nos]
+    if grafo.dirigido:
+        indptr_entrada, indices_entrada = csr_de_pares(v, u, k)
+        return GrafoCompacto(indptr, indices, rotulos, True, indptr_entrada, indices_entrada)
+    return GrafoCompacto(indptr, indices, rotulos, False)
+
+
+def _vizinhos(grafo, u):
+    """Vizinhos de u ignorando a direção das arestas."""
+    if grafo.dirigido:
+        return np.concatenate([grafo.vizinhos(u), grafo.predecessores(u)])
+    return grafo.vizinhos(u)
+
+
+def _graus(grafo, nos):
+    """Grau (sem direção) só dos nós da amostra, direto do indptr."""
+    graus = np.asarray(grafo.indptr)[nos + 1] - np.asarray(grafo.indptr)[nos]
+    if grafo.dirigido:
+        graus = graus + np.asarray(grafo.indptr_entrada)[nos + 1] - np.asarray(grafo.indptr_entrada)[nos]
+    return graus.astype(np.float64)
+
+
+def _resultado(metodo, nos, pesos):
+    return {"metodo": metodo, "nos": nos, "pesos": np.asarray(pesos, dtype=np.float64)}
@@ -1,14 +1,40 @@
-import networkx as nx
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+
 import numpy as np
-from collections import Counter
-import plotly.graph_objects as go
+
+from grafo_compacto import ARESTAS_POR_BLOCO, GrafoCompacto, carregar_grafo_compacto, grafo_compacto_de_networkx
+from pajek import carregar_grafo_pajek
+from pontes import analisar_pontes
+from componentes import componentes_fortes, componentes_fracos, histograma_tamanhos
+from centralidade import maiores, ranking
+from graus import estatisticas_graus_grafo
+from metricas import MetricasGrafo
+from cache_resultados import CacheResultados
+from incremental import DIRETORIO_INCREMENTAL, GrafoIncremental
+from layout import calcular_layout, decimar_arestas, rasterizar_arestas
+from amostragem import amostrar, subgrafo_induzido
+from exportacao import (
+    FORMATOS, ativar_exportacao, definir_grupo, figuras_exportadas, finalizar_exportacao, gravar_manifesto,
+    mostrar_figura
+)
+from instrumentacao import FONTES_MEMORIA, ativar_instrumentacao, etapa, finalizar_instrumentacao, registrar_grafo
+from relatorio import RelatorioHTML
+from distancias import (
+    distribuicao_distancias_amostrada, distribuicao_distancias_exata, distribuicao_distancias_hyperanf
+)
 
 
 # TODO: Função para carregar um grafo a partir de um arquivo CSV contendo arestas.
 def carregar_grafo_de_arestas(caminho_arquivo, coluna_origem, coluna_destino, dirigido):
     """Carrega um grafo a partir de um arquivo CSV contendo arestas."""
+    import pandas as pd
+    import networkx as nx
+
     arestas = pd.read_csv(caminho_arquivo)
 
     if dirigido:
@@ -19,161 +45,177 @@ def carregar_grafo_de_arestas(caminho_arquivo, coluna_origem, coluna_destino, di
     return grafo
 
 # TODO: Função para plotar um grafo, com a opção de amostrar nós para grafos grandes.
-def plotar_grafo(grafo, titulo, amostra=None):
-    if amostra and len(grafo.nodes) > amostra:
-        print(f"Grafo grande detectado! Amostrando {amostra} nós para visualização...")
-        nos_amostrados = list(grafo.nodes)[:amostra]
-        grafo = grafo.subgraph(nos_amostrados)
-    plt.figure(figsize=(10, 10))
-    pos = nx.spring_layout(grafo, seed=42)
-    nx.draw(
-        grafo,
-        pos,
-        node_size=10,
-        edge_color="gray",
-        node_color="purple",
-        with_labels=False,
-        alpha=0.7
+# Função para plotar o grafo inteiro (layout multinível + WebGL ou imagem rasterizada)
+def plotar_grafo(grafo, titulo, posicoes=None, modo="webgl", max_arestas=200_000, resolucao=1500, amostrador=None,
+                 tamanho_amostra=5000):
+    """
+    Desenha todos os nós do grafo. `posicoes` vem de layout.calcular_layout (ou da métrica "layout",
+    que fica no cache); sem ela o layout é calculado aqui.
+    modo="webgl": plotly Scattergl (interativo), com no máximo `max_arestas` arestas amostradas.
+    modo="raster": matplotlib, com todas as arestas acumuladas em uma imagem de densidade.
+    Com `amostrador` (ver amostragem.AMOSTRADORES), desenha só o subgrafo induzido por
+    `tamanho_amostra` nós sorteados (mantendo as posições do layout completo, se houver).
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    if amostrador is not None and grafo.number_of_nodes() > tamanho_amostra:
+        amostra = amostrar(grafo, amostrador, tamanho_amostra)
+        print(f"Amostrando {len(amostra['nos']):,} nós ({amostra['metodo']}) para visualização...")
+        grafo = subgrafo_induzido(grafo, amostra["nos"])
+        titulo = f"{titulo} - amostra {amostra['metodo']}"
+        if posicoes is not None:
+            posicoes = posicoes[amostra["nos"]]
+    if posicoes is None:
+        print(f"Calculando o layout de {grafo.number_of_nodes():,} nós...")
+        posicoes = calcular_layout(grafo)
+    graus = grafo.graus()
+
+    if modo == "raster":
+        import matplotlib.pyplot as plt
+
+        imagem = rasterizar_arestas(posicoes, decimar_arestas(grafo, max_arestas=grafo.number_of_edges()), resolucao)
+        plt.figure(figsize=(10, 10))
+        plt.imshow(np.log1p(imagem), origin="lower", extent=(0, 1, 0, 1), cmap="Purples")
+        plt.scatter(posicoes[:, 0], posicoes[:, 1], s=0.5, c="purple", alpha=0.5, linewidths=0, rasterized=True)
+        plt.axis("off")
+        plt.title(titulo, fontsize=15)
+        mostrar_figura(plt.gcf(), titulo)
+        return
+
+    import plotly.graph_objects as go
+
+    arestas = decimar_arestas(grafo, max_arestas)
+    # Todas as arestas em um único traço, separadas por NaN
+    x_arestas = np.full(3 * len(arestas), np.nan)
+    y_arestas = np.full(3 * len(arestas), np.nan)
+    x_arestas[0::3], x_arestas[1::3] = posicoes[arestas[:, 0], 0], posicoes[arestas[:, 1], 0]
+    y_arestas[0::3], y_arestas[1::3] = posicoes[arestas[:, 0], 1], posicoes[arestas[:, 1], 1]
+    fig = go.Figure(data=[
+        go.Scattergl(x=x_arestas, y=y_arestas, mode="lines", hoverinfo="skip", name="Arestas",
+                     line=dict(color="rgba(128, 128, 128, 0.15)", width=0.5)),
+        go.Scattergl(x=posicoes[:, 0], y=posicoes[:, 1], mode="markers", name="Nós",
+                     text=[f"{rotulo} (grau {grau})" for rotulo, grau in zip(grafo.rotulos, graus.tolist())],
+                     hoverinfo="text",
+                     marker=dict(size=3, color=np.log1p(graus), colorscale=[[0, "indigo"], [1, "violet"]],
+                                 colorbar=dict(title="log(1 + grau)"))),
+    ])
+    amostradas = f" ({len(arestas):,} de {grafo.number_of_edges():,} arestas)" if len(arestas) < grafo.number_of_edges() else ""
+    fig.update_layout(
+        title=dict(text=f"{titulo}{amostradas}", font=dict(size=20, color="black", family="Arial"), x=0.5),
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False, scaleanchor="x"),
+        showlegend=False,
+        plot_bgcolor="white"
     )
-    plt.title(titulo, fontsize=15)
-    plt.show()
+    mostrar_figura(fig, titulo)
 
 
 # TODO: Função para plotar a distribuição de graus dos vértices de um grafo.
-def plotar_distribuicao_grau(grafo, titulo):
-    graus = [grau for _, grau in grafo.degree()]
+def plotar_distribuicao_grau(grafo, titulo, estatisticas=None):
+    import matplotlib.pyplot as plt
+
+    distribuicao = (estatisticas or estatisticas_graus_grafo(grafo))["total"]["distribuicao"]
     plt.figure(figsize=(8, 6))
-    plt.hist(graus, bins=30, color="blue", edgecolor="black", alpha=0.7)
+    plt.hist(distribuicao["graus"], weights=distribuicao["quantidades"], bins=30, color="blue", edgecolor="black", alpha=0.7)
     plt.title(f"Distribuição de Graus - {titulo}", fontsize=15)
     plt.xlabel("Grau")
     plt.ylabel("Frequência")
-    plt.show()
-
+    mostrar_figura(plt.gcf(), f"Distribuição de Graus - {titulo}")
 
-def plotar_distribuicao_grau_plotly(grafo, titulo):
-    graus = [grau for _, grau in grafo.degree()]
-    quantidade = Counter(graus)
-    graus_unicos = list(quantidade.keys())
-    valores_quantidade = list(quantidade.values())
 
-    fig = go.Figure(data=[
-        go.Bar(
-            x=graus_unicos,
-            y=valores_quantidade,
-            text=valores_quantidade,
-            textposition='outside',
-            marker=dict(
-                color=valores_quantidade,
-                colorscale=[
-                    [0, 'indigo'],
-                    [1, 'violet']
-                ]
-            )
-        )
-    ])
-
-    fig.update_layout(
-        title=dict(
-            text=f"Distribuição de Graus - {titulo}",
-            font=dict(size=20, color="black", family="Arial"),
-            x=0.5  # Centraliza o título
-        ),
-        xaxis=dict(
-            title="Grau",
-            titlefont=dict(size=16, color="black", family="Arial"),
-            rangeslider=dict(visible=True)
-        ),
-        yaxis=dict(
-            title="Quantidade",
-            titlefont=dict(size=16, color="black", family="Arial")
-        ),
-        bargap=0.15
-    )
-    fig.show()
+def plotar_distribuicao_grau_plotly(grafo, titulo, estatisticas=None):
+    distribuicao = (estatisticas or estatisticas_graus_grafo(grafo))["total"]["distribuicao"]
+    plotar_grafico_graus(distribuicao, f"Distribuição de Graus - {titulo}", "Grau")
 
 
 # Função para calcular e exibir o grau médio
-def calcular_grau_medio(grafo):
-    """Calcula o grau médio do grafo."""
+def calcular_grau_medio(grafo, estatisticas=None):
+    """Calcula o grau médio do grafo. `estatisticas` (opcional) evita percorrer o grafo de novo."""
+    estatisticas = estatisticas or estatisticas_graus_grafo(grafo)
     if grafo.is_directed():
         # Grafo direcionado
-        grau_medio_entrada = sum(dict(grafo.in_degree()).values()) / grafo.number_of_nodes()
-        grau_medio_saida = sum(dict(grafo.out_degree()).values()) / grafo.number_of_nodes()
+        grau_medio_entrada = estatisticas["entrada"]["media"]
+        grau_medio_saida = estatisticas["saida"]["media"]
         print(f"Grau médio de entrada: {grau_medio_entrada:.2f}")
         print(f"Grau médio de saída: {grau_medio_saida:.2f}")
         return grau_medio_entrada, grau_medio_saida
     else:
         # Grafo não direcionado
-        grau_medio = sum(dict(grafo.degree()).values()) / grafo.number_of_nodes()
+        grau_medio = estatisticas["total"]["media"]
         print(f"Grau médio: {grau_medio:.2f}")
         return grau_medio
 
 # Função para plotar a distribuição de graus (geral, entrada e saída)
-def plotar_distribuicao_graus(grafo, titulo):
+def plotar_distribuicao_graus(grafo, titulo, estatisticas=None):
     """Plota a distribuição de graus para grafos direcionados e não direcionados."""
+    estatisticas = estatisticas or estatisticas_graus_grafo(grafo)
     if grafo.is_directed():
         # Distribuição de graus de entrada
-        graus_entrada = [grau for _, grau in grafo.in_degree()]
-        plotar_histograma(graus_entrada, f"Distribuição de Graus de Entrada - {titulo}", "Grau de Entrada")
+        entrada = estatisticas["entrada"]["distribuicao"]
+        plotar_histograma(entrada["graus"], f"Distribuição de Graus de Entrada - {titulo}", "Grau de Entrada",
+                          pesos=entrada["quantidades"])
 
         # Distribuição de graus de saída
-        graus_saida = [grau for _, grau in grafo.out_degree()]
-        plotar_histograma(graus_saida, f"Distribuição de Graus de Saída - {titulo}", "Grau de Saída")
+        saida = estatisticas["saida"]["distribuicao"]
+        plotar_histograma(saida["graus"], f"Distribuição de Graus de Saída - {titulo}", "Grau de Saída",
+                          pesos=saida["quantidades"])
     else:
         # Distribuição de graus para grafos não direcionados
-        graus = [grau for _, grau in grafo.degree()]
-        plotar_histograma(graus, f"Distribuição de Graus - {titulo}", "Grau")
+        total = estatisticas["total"]["distribuicao"]
+        plotar_histograma(total["graus"], f"Distribuição de Graus - {titulo}", "Grau", pesos=total["quantidades"])
 
 # Função auxiliar para plotar um histograma
-def plotar_histograma(dados, titulo, xlabel):
-    """Plota um histograma para os dados fornecidos."""
+def plotar_histograma(dados, titulo, xlabel, pesos=None):
+    """Plota um histograma para os dados fornecidos (com `pesos`, cada valor conta `peso` vezes)."""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(8, 6))
-    plt.hist(dados, bins=30, color="purple", edgecolor="black", alpha=0.7)
+    plt.hist(dados, weights=pesos, bins=30, color="purple", edgecolor="black", alpha=0.7)
     plt.title(titulo, fontsize=15)
     plt.xlabel(xlabel)
     plt.ylabel("Frequência")
-    plt.show()
+    mostrar_figura(plt.gcf(), titulo)
 
 
 # Função para calcular e exibir o grau médio e plotar a distribuição
-def calcular_e_plotar_graus(grafo, titulo):
+def calcular_e_plotar_graus(grafo, titulo, estatisticas=None):
     """
     Calcula o grau médio e gera gráficos de distribuição de graus de entrada e saída (para grafos direcionados).
     Para grafos não direcionados, calcula o grau geral.
+    `estatisticas` (opcional) é a métrica "estatisticas_graus" já calculada, para não percorrer o grafo de novo.
     """
+    estatisticas = estatisticas or estatisticas_graus_grafo(grafo)
     if grafo.is_directed():
-        # Para grafos direcionados: calcular graus de entrada e saída
-        distribuicao_grau_entrada = [grau for _, grau in grafo.in_degree()]
-        distribuicao_grau_saida = [grau for _, grau in grafo.out_degree()]
-
-        # Grau médio
-        grau_medio_entrada = sum(distribuicao_grau_entrada) / len(distribuicao_grau_entrada)
-        grau_medio_saida = sum(distribuicao_grau_saida) / len(distribuicao_grau_saida)
-
-        print(f"Grau médio de entrada: {grau_medio_entrada:.2f}")
-        print(f"Grau médio de saída: {grau_medio_saida:.2f}")
+        # Para grafos direcionados: graus de entrada e saída
+        print(f"Grau médio de entrada: {estatisticas['entrada']['media']:.2f}")
+        print(f"Grau médio de saída: {estatisticas['saida']['media']:.2f}")
 
         # Plotar distribuição de graus
-        plotar_grafico_graus(distribuicao_grau_entrada, f"Distribuição de Graus de Entrada - {titulo}", "Grau de Entrada")
-        plotar_grafico_graus(distribuicao_grau_saida, f"Distribuição de Graus de Saída - {titulo}", "Grau de Saída")
+        plotar_grafico_graus(estatisticas["entrada"]["distribuicao"], f"Distribuição de Graus de Entrada - {titulo}", "Grau de Entrada")
+        plotar_grafico_graus(estatisticas["saida"]["distribuicao"], f"Distribuição de Graus de Saída - {titulo}", "Grau de Saída")
     else:
-        # Para grafos não direcionados: calcular o grau geral
-        distribuicao_grau = [grau for _, grau in grafo.degree()]
-        grau_medio = sum(distribuicao_grau) / len(distribuicao_grau)
-        print(f"Grau médio: {grau_medio:.2f}")
+        # Para grafos não direcionados: grau geral
+        print(f"Grau médio: {estatisticas['total']['media']:.2f}")
 
         # Plotar distribuição de graus
-        plotar_grafico_graus(distribuicao_grau, f"Distribuição de Graus - {titulo}", "Grau")
+        plotar_grafico_graus(estatisticas["total"]["distribuicao"], f"Distribuição de Graus - {titulo}", "Grau")
 
 # Função para plotar gráficos de distribuição de graus
 def plotar_grafico_graus(dados, titulo, xlabel):
     """
     Plota a distribuição de graus com barra de rolagem.
+    `dados` é a distribuição já contada ({"graus", "quantidades"}) ou uma lista com o grau de cada nó.
     """
-    # Contar a frequência de cada grau
-    quantidade = Counter(dados)
-    graus_unicos = list(quantidade.keys())
-    valores_quantidade = list(quantidade.values())
+    import plotly.graph_objects as go
+
+    if isinstance(dados, dict):
+        graus_unicos = np.asarray(dados["graus"]).tolist()
+        valores_quantidade = np.asarray(dados["quantidades"]).tolist()
+    else:
+        # Contar a frequência de cada grau
+        contagens = np.bincount(np.asarray(dados, dtype=np.int64))
+        graus_unicos = np.flatnonzero(contagens).tolist()
+        valores_quantidade = contagens[graus_unicos].tolist()
 
     # Criar o gráfico
     fig = go.Figure(data=[
@@ -210,41 +252,83 @@ def plotar_grafico_graus(dados, titulo, xlabel):
         bargap=0.15  # Espaçamento entre as barras
     )
 
-    fig.show()
+    mostrar_figura(fig, titulo)
 
-def grafico_tamanho_componentes_agrupados(grafo, titulo="Distribuição dos Componentes"):
+# Função para plotar a distribuição de graus em escala log-log (CCDF, caixas logarítmicas e lei de potência)
+def plotar_distribuicao_graus_log(estatisticas, titulo, xlabel="Grau"):
+    """
+    Plota, em eixos log-log, a CCDF P(X >= k), o histograma com caixas logarítmicas e a reta
+    da lei de potência ajustada. `estatisticas` é o resultado de estatisticas_graus para um tipo de grau.
+    """
+    import plotly.graph_objects as go
+
+    ccdf = estatisticas["ccdf"]
+    histograma = estatisticas["histograma_log"]
+    fig = go.Figure(data=[
+        go.Scatter(x=ccdf["graus"], y=ccdf["probabilidades"], mode="markers", name="CCDF P(X ≥ k)",
+                   marker=dict(color="indigo", size=5)),
+        go.Scatter(x=histograma["centros"], y=histograma["densidades"], mode="markers+lines",
+                   name="Histograma (caixas log)", marker=dict(color="violet", size=7)),
+    ])
+    ajuste = estatisticas["lei_de_potencia"]
+    if ajuste is not None:
+        # CCDF do modelo na cauda: P(X >= k) = P(X >= xmin) * (k / xmin)^(1 - alfa)
+        graus = np.asarray(ccdf["graus"])
+        cauda = graus[graus >= ajuste["xmin"]]
+        inicio = np.asarray(ccdf["probabilidades"])[np.searchsorted(graus, ajuste["xmin"])]
+        fig.add_trace(go.Scatter(
+            x=cauda, y=inicio * (cauda / ajuste["xmin"]) ** (1 - ajuste["alfa"]), mode="lines",
+            name=f"Lei de potência α = {ajuste['alfa']:.2f} ± {ajuste['erro_padrao']:.2f} (k ≥ {ajuste['xmin']})",
+            line=dict(color="black", dash="dash")
+        ))
+    fig.update_layout(
+        title=dict(
+            text=f"Distribuição de Graus (log-log) - {titulo}",
+            font=dict(size=20, color="black", family="Arial"),
+            x=0.5
+        ),
+        xaxis=dict(title=xlabel, type="log", titlefont=dict(size=16, color="black", family="Arial")),
+        yaxis=dict(title="Probabilidade", type="log", titlefont=dict(size=16, color="black", family="Arial")),
+    )
+    mostrar_figura(fig, f"Distribuição de Graus (log-log) - {titulo}")
+
+def grafico_tamanho_componentes_agrupados(grafo, titulo="Distribuição dos Componentes", tamanhos=None, tamanhos_fortes=None):
+    """
+    `tamanhos` / `tamanhos_fortes` (opcionais) são os tamanhos dos componentes (fracos/conexos e fortes)
+    já calculados pelas métricas; sem eles os componentes são calculados aqui (módulo componentes).
+    """
     if grafo.is_directed():
         # Componentes Fortemente Conectados
-        componentes_fortes = list(nx.strongly_connected_components(grafo))
-        tamanhos_fortes = [len(componente) for componente in componentes_fortes]
-        frequencias_fortes = Counter(tamanhos_fortes)
+        if tamanhos_fortes is None:
+            tamanhos_fortes = componentes_fortes(grafo)["tamanhos"]
+        histograma = histograma_tamanhos(tamanhos_fortes)
         plotar_grafico_componentes(
-            tamanhos=list(frequencias_fortes.keys()),
-            frequencias=list(frequencias_fortes.values()),
+            tamanhos=histograma["tamanhos"].tolist(),
+            frequencias=histograma["quantidades"].tolist(),
             titulo=f"Distribuição de Componentes Fortemente Conectados - {titulo}",
             eixo_x="Tamanho do Componente",
             eixo_y="Quantidade de Componentes"
         )
 
         # Componentes Fracamente Conectados
-        componentes_fracos = list(nx.weakly_connected_components(grafo))
-        tamanhos_fracos = [len(componente) for componente in componentes_fracos]
-        frequencias_fracos = Counter(tamanhos_fracos)
+        if tamanhos is None:
+            tamanhos = componentes_fracos(grafo)["tamanhos"]
+        histograma = histograma_tamanhos(tamanhos)
         plotar_grafico_componentes(
-            tamanhos=list(frequencias_fracos.keys()),
-            frequencias=list(frequencias_fracos.values()),
+            tamanhos=histograma["tamanhos"].tolist(),
+            frequencias=histograma["quantidades"].tolist(),
             titulo=f"Distribuição de Componentes Fracamente Conectados - {titulo}",
             eixo_x="Tamanho do Componente",
             eixo_y="Quantidade de Componentes"
         )
     else:
         # Componentes Conectados (para grafos não direcionados)
-        componentes = list(nx.connected_components(grafo))
-        tamanhos = [len(componente) for componente in componentes]
-        frequencias = Counter(tamanhos)
+        if tamanhos is None:
+            tamanhos = componentes_fracos(grafo)["tamanhos"]
+        histograma = histograma_tamanhos(tamanhos)
         plotar_grafico_componentes(
-            tamanhos=list(frequencias.keys()),
-            frequencias=list(frequencias.values()),
+            tamanhos=histograma["tamanhos"].tolist(),
+            frequencias=histograma["quantidades"].tolist(),
             titulo=f"Distribuição de Componentes Conectados - {titulo}",
             eixo_x="Tamanho do Componente",
             eixo_y="Quantidade de Componentes"
@@ -256,6 +340,8 @@ def plotar_grafico_componentes(tamanhos, frequencias, titulo, eixo_x, eixo_y):
     """
     Plota gráficos de barra para distribuição de componentes.
     """
+    import plotly.graph_objects as go
+
     fig = go.Figure(data=[
         go.Bar(
             x=tamanhos,
@@ -290,34 +376,48 @@ def plotar_grafico_componentes(tamanhos, frequencias, titulo, eixo_x, eixo_y):
         bargap=0.15
     )
 
-    fig.show()
+    mostrar_figura(fig, titulo)
 
     # Função para calcular e plotar a distribuição das distâncias
-def grafico_distancia_pares(grafo, titulo="Distância Média e Distribuição"):
+def grafico_distancia_pares(grafo, titulo="Distância Média e Distribuição", modo="exato", amostras=200,
+                            tempo_maximo=None, bits_registro=6, processos=None, amostrador=None):
     """
     Calcula a distância média e a distribuição das distâncias entre todos os pares de vértices.
     Plota a distribuição das distâncias.
+    modo="exato" conta as distâncias de todos os pares em paralelo (`processos`), guardando só o
+    histograma; modo="amostragem" (BFS de `amostras` fontes aleatórias, limitado por `tempo_maximo`)
+    e modo="hyperanf" (precisão dada por `bits_registro`) estimam a distribuição e a média com
+    margem de erro. Na amostragem, `amostrador` (ver amostragem.AMOSTRADORES) escolhe as fontes.
+    Pares de um vértice com ele mesmo (distância 0) não entram na média.
     """
-    if grafo.is_directed():
-        # Calcula as distâncias para grafos dirigidos
-        distancias = dict(nx.all_pairs_shortest_path_length(grafo))
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+
+    if modo == "exato":
+        distribuicao = distribuicao_distancias_exata(grafo, processos=processos)
+    elif modo == "amostragem":
+        distribuicao = distribuicao_distancias_amostrada(
+            grafo, amostras=amostras, tempo_maximo=tempo_maximo, amostrador=amostrador
+        )
+    elif modo == "hyperanf":
+        distribuicao = distribuicao_distancias_hyperanf(grafo, bits_registro=bits_registro)
     else:
-        # Calcula as distâncias para grafos não dirigidos
-        distancias = dict(nx.all_pairs_shortest_path_length(grafo.to_undirected()))
+        raise ValueError(f"Modo de distância desconhecido: {modo}")
 
-    # Extrair todas as distâncias calculadas
-    todas_distancias = []
-    for origem, destinos in distancias.items():
-        todas_distancias.extend(destinos.values())
+    if modo != "exato":
+        inferior, superior = distribuicao["intervalo_95"]
+        print(f"Estimativa ({distribuicao['metodo']}): {distribuicao['distancia_media']:.2f} "
+              f"± {distribuicao['erro_padrao']:.2f} (IC 95%: {inferior:.2f} a {superior:.2f})")
 
-    # Filtrar apenas distâncias finitas (desconsidera vértices desconectados)
-    todas_distancias = [d for d in todas_distancias if d < float('inf')]
+    plotar_distribuicao_distancias(distribuicao["histograma"], titulo)
+    return distribuicao["distancia_media"]
 
-    # Calcular a distância média
-    distancia_media = np.mean(todas_distancias)
 
-    # Contar a frequência de cada distância
-    distribuicao = Counter(todas_distancias)
+# Função para plotar o gráfico de barras da distribuição das distâncias
+def plotar_distribuicao_distancias(distribuicao, titulo):
+    """Plota a distribuição das distâncias a partir de um Counter {distância: quantidade de pares}."""
+    import plotly.graph_objects as go
+
     distancias_unicas = list(distribuicao.keys())
     frequencias = list(distribuicao.values())
 
@@ -351,469 +451,811 @@ def grafico_distancia_pares(grafo, titulo="Distância Média e Distribuição"):
         ),
         bargap=0.15  # Espaçamento entre as barras
     )
-    fig.show()
+    mostrar_figura(fig, f"Distribuição das Distâncias - {titulo}")
+
+
+# Função para plotar o clustering médio em função do grau (eixo de graus em escala log)
+def plotar_clustering_por_grau(clustering, titulo):
+    """`clustering` é a métrica "clustering"; o tamanho de cada ponto cresce com a quantidade de nós do grau."""
+    import plotly.graph_objects as go
+
+    curva = clustering["clustering_por_grau"]
+    com_trios = curva["graus"] > 1
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=curva["graus"][com_trios], y=curva["clustering"][com_trios], mode="markers",
+            text=[f"{quantidade:,} nós" for quantidade in curva["quantidades"][com_trios]],
+            marker=dict(color="teal", size=np.clip(np.log2(curva["quantidades"][com_trios]) + 4, 4, 16)),
+            name="C(k)"
+        )
+    ])
+    fig.add_hline(y=clustering["clustering_medio"], line=dict(color="black", dash="dash"),
+                  annotation_text=f"Clustering médio {clustering['clustering_medio']:.4f}")
+    fig.update_layout(
+        title=dict(
+            text=f"Clustering por Grau - {titulo}",
+            font=dict(size=20, color="black", family="Arial"),
+            x=0.5
+        ),
+        xaxis=dict(title="Grau", type="log", titlefont=dict(size=16, color="black", family="Arial")),
+        yaxis=dict(title="Clustering médio C(k)", titlefont=dict(size=16, color="black", family="Arial")),
+    )
+    mostrar_figura(fig, f"Clustering por Grau - {titulo}")
+
 
-    return distancia_media
 def encontrar_pontes(grafo):
     """
     Identifica arestas que são pontes em um grafo.
-    Utiliza uma abordagem baseada em DFS e valores low-link.
+    Utiliza uma DFS iterativa (pilha explícita) e valores low-link sobre o grafo compacto.
     Funciona para grafos não direcionados.
+    Para obter também quantidade, amostra e componentes 2-aresta-conexos numa só chamada,
+    use analisar_pontes.
     """
-    # Inicializações
-    discovery = {}  # Tempo de descoberta (disc)
-    low = {}        # Valor low-link
-    parent = {}     # Pai no DFS
-    pontes = []     # Lista para armazenar pontes
-    tempo = [0]     # Tempo de descoberta global (imutável no escopo)
-
-    def dfs(u):
-        discovery[u] = low[u] = tempo[0]
-        tempo[0] += 1
-
-        for v in grafo.neighbors(u):
-            if v not in discovery:  # v não foi visitado
-                parent[v] = u
-                dfs(v)
+    return analisar_pontes(grafo)["pontes"]
 
-                # Atualizar low-link de u com base no retorno de v
-                low[u] = min(low[u], low[v])
-
-                # Verificar se a aresta (u, v) é uma ponte
-                if low[v] > discovery[u]:
-                    pontes.append((u, v))
-            elif parent.get(u) != v:  # Atualizar low-link de u com base no ciclo
-                low[u] = min(low[u], discovery[v])
-
-    # Executar DFS para todos os vértices
-    for u in grafo.nodes:
-        if u not in discovery:
-            dfs(u)
-
-    return pontes
-
-# TODO: Dicionário que configura os caminhos dos arquivos de entrada e suas colunas.
-# Configurar os caminhos dos arquivos
-arquivos_dados = {
-    "deezer": {
-        "caminho": "social_networks/deezer_europe/deezer_europe_edges.csv",
-        "coluna_origem": "node_1",
-        "coluna_destino": "node_2",
-        "bool": False
-    },
-    # "facebook": {
-    #     "caminho": "social_networks/facebook_large/musae_facebook_edges.csv",
-    #     "coluna_origem": "id_1",
-    #     "coluna_destino": "id_2",
-    #     "bool": False
-    # },
-    "lastfm": {
-        "caminho": "social_networks/lastfm_asia/lastfm_asia_edges.csv",
-        "coluna_origem": "node_1",
-        "coluna_destino": "node_2",
-        "bool": False
-    },
-    "scientometrics": {
-        "caminho": "scientometrics/scientometrics/scientometrics.net"
+# Função para montar a linha de resultados do HTML a partir das métricas já calculadas
+def resumo_metricas(metricas, secoes=None):
+    """
+    Resumo das métricas de uma rede para o relatório (reaproveita os valores memorizados).
+    `secoes` (opcional) limita o resumo às seções pedidas (ver SECOES); nada além delas é calculado.
+    """
+    grafo = metricas.grafo
+    secoes = SECOES if secoes is None else secoes
+    resumo = {
+        "numero_nos": grafo.number_of_nodes(),
+        "numero_arestas": grafo.number_of_edges(),
     }
-}
-
-# TODO: Bloco principal para processar os grafos das redes sociais e exibir análises.
-# Processar grafos das redes sociais
-resultados = {}
-for rede in ["deezer", "lastfm"]:
-    print(f"\n{'=' * 60}")
-    print(f"Processando a Rede: {rede.capitalize()}")
-    print(f"{'=' * 60}\n")
-
-    # TODO: Carregar o grafo da rede social atual.
-    grafo = carregar_grafo_de_arestas(
-        arquivos_dados[rede]["caminho"],
-        arquivos_dados[rede]["coluna_origem"],
-        arquivos_dados[rede]["coluna_destino"],
-        arquivos_dados[rede]["bool"]
-    )
-    print(f"Grafo carregado com sucesso: {len(grafo.nodes):,} nós, {len(grafo.edges):,} arestas.\n")
-
-
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-
-    # TODO: Plotar o grafo (Questão 1A).
-    # Questão 1A: Plotar o grafo
-    print(f"{'-' * 40}")
-    print(f"Questão 1A: Plotando o Grafo")
-    print(f"{'-' * 40}")
-    plotar_grafo(grafo, f"Grafo da Rede {rede.capitalize()}", amostra=500)
-
-
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-
+    if "densidade" in secoes:
+        resumo["densidade"] = metricas["densidade"]
+    if grafo.is_directed():
+        if "graus" in secoes:
+            resumo["grau_medio_entrada"] = metricas["grau_medio"]["entrada"]
+            resumo["grau_medio_saida"] = metricas["grau_medio"]["saida"]
+        if "componentes" in secoes:
+            resumo["numero_componentes_fortes"] = len(metricas["componentes_fortes"]["tamanhos"])
+            resumo["tamanho_maior_componente_forte"] = int(metricas["componentes_fortes"]["tamanhos"].max())
+            resumo["numero_componentes_fracos"] = len(metricas["componentes"]["tamanhos"])
+            resumo["tamanho_maior_componente_fraco"] = int(metricas["componentes"]["tamanhos"].max())
+        if "ciclos" in secoes:
+            ciclos = metricas["ciclos"]
+            resumo["ciclos"] = ciclos["ciclos"] if ciclos["completo"] else f"≥ {ciclos['ciclos']} (parcial)"
+            resumo["posto_ciclos"] = ciclos["posto_ciclos"]
+    else:
+        if "graus" in secoes:
+            resumo["grau_medio"] = metricas["grau_medio"]["total"]
+        if "componentes" in secoes:
+            resumo["numero_componentes"] = len(metricas["componentes"]["tamanhos"])
+            resumo["tamanho_maior_componente"] = int(metricas["componentes"]["tamanhos"].max())
+        if "pontes" in secoes:
+            resumo["numero_arestas_pontes"] = metricas["pontes"]["quantidade"]
+            # Lista completa: o relatório mostra as primeiras linhas e grava todas em CSV
+            resumo["pontes"] = metricas["pontes"]["pontes"]
+    if "centralidade" in secoes:
+        resumo["maiores_pagerank"] = ranking(grafo, metricas["pagerank"]["valores"])
+        if grafo.is_directed():
+            resumo["maiores_autoridades_hits"] = ranking(grafo, metricas["hits"]["autoridades"])
+        resumo["maiores_intermediacao"] = ranking(grafo, metricas["intermediacao"]["valores"])
+    if "clustering" in secoes:
+        clustering = metricas["clustering"]
+        resumo["triangulos"] = clustering["triangulos"]
+        resumo["clustering_medio"] = clustering["clustering_medio"]
+        resumo["transitividade"] = clustering["transitividade"]
+        curva = clustering["clustering_por_grau"]
+        resumo["clustering_por_grau"] = [(int(grau), float(valor)) for grau, valor in zip(curva["graus"], curva["clustering"])]
+    if "distancias" in secoes:
+        if grafo.is_directed():
+            resumo["camadas_topologicas"] = metricas["alcance"]["numero_camadas"]
+            resumo["pares_alcancaveis"] = metricas["alcance"]["pares_alcancaveis"]
+        resumo["distancia_media"] = metricas["distancias"]["distancia_media"]
+        for tipo, extremos in excentricidades_por_tipo(metricas).items():
+            sufixo = "" if tipo == "conexo" else f"_componente_{tipo}"
+            resumo[f"diametro{sufixo}"] = extremos["diametro"]
+            resumo[f"raio{sufixo}"] = extremos["raio"]
+            resumo[f"periferia{sufixo}"] = extremos["periferia"]
+            resumo[f"centro{sufixo}"] = extremos["centro"]
+    return resumo
+
+
+# Função para juntar os extremos das distâncias de cada tipo de componente da rede
+def excentricidades_por_tipo(metricas):
+    """{"conexo": ...} em grafos não dirigidos; {"forte": ..., "fraco": ...} em dirigidos."""
+    if not metricas.grafo.is_directed():
+        return metricas["excentricidades"]
+    return {"forte": metricas["excentricidades_fortes"], **metricas["excentricidades"]}
+
+
+# Função para exibir diâmetro, raio, periferia e centro do maior componente
+def imprimir_excentricidades(excentricidades, amostra=5):
+    """`excentricidades`: um resultado por tipo de componente (ver excentricidades_por_tipo)."""
+    nomes = {"conexo": "conexo", "forte": "fortemente conectado", "fraco": "fracamente conectado"}
+    for tipo, extremos in excentricidades.items():
+        if extremos["completo"]:
+            valores = f"diâmetro {extremos['diametro']}, raio {extremos['raio']}"
+        else:
+            (diametro_minimo, diametro_maximo), (raio_minimo, raio_maximo) = extremos["intervalo_diametro"], extremos["intervalo_raio"]
+            valores = (f"diâmetro entre {diametro_minimo} e {diametro_maximo}, raio entre {raio_minimo} e {raio_maximo} "
+                       f"(limite de BFS atingido)")
+        print(f"Maior componente {nomes[tipo]} ({extremos['nos_componente']:,} nós): {valores} — {extremos['bfs']} BFS")
+        for nome in ("periferia", "centro"):
+            nos = extremos[nome]
+            print(f"  {nome.capitalize()}: {len(nos):,} nós {nos[:amostra]}{' ...' if len(nos) > amostra else ''}")
+
+
+# Função para exibir o DAG de componentes fortes e os nós que mais alcançam / são alcançados
+def imprimir_alcance(metricas, k=5):
+    """Resumo da métrica "alcance": camadas topológicas e top-k de descendentes e ascendentes."""
+    grafo, alcance = metricas.grafo, metricas["alcance"]
+    print(f"DAG de componentes fortes: {len(alcance['tamanhos']):,} componentes, {len(alcance['indices']):,} arestas, "
+          f"{alcance['numero_camadas']} camadas topológicas")
+    for nome, valores in (("descendentes (nós alcançáveis a partir dele)", alcance["descendentes"]),
+                          ("ascendentes (nós que o alcançam)", alcance["ascendentes"])):
+        print(f"\nTop {k} nós por {nome}:")
+        for no, quantidade in ranking(grafo, valores, k):
+            print(f"Nó {no}: {quantidade}")
+    print()
+
+
+# Função para exibir os nós mais centrais por PageRank, HITS e intermediação
+def imprimir_centralidades(metricas, k=5):
+    """Top-k de cada centralidade (seleção parcial, sem ordenar todos os nós)."""
+    grafo = metricas.grafo
+    centralidades = [("PageRank", metricas["pagerank"]["valores"])]
+    if grafo.is_directed():
+        centralidades += [("HITS - autoridade", metricas["hits"]["autoridades"]),
+                          ("HITS - hub", metricas["hits"]["hubs"])]
+    for nome, valores in centralidades:
+        print(f"\nTop {k} nós por {nome}:")
+        for no, valor in ranking(grafo, valores, k):
+            print(f"Nó {no}: {valor:.6f}")
+
+    intermediacao = metricas["intermediacao"]
+    estimativa = "exata" if intermediacao["exato"] else f"estimada com {intermediacao['fontes']} fontes"
+    print(f"\nTop {k} nós por intermediação ({estimativa}):")
+    for i in maiores(intermediacao["valores"], k):
+        # ± 1,96 erro padrão: intervalo aproximado de 95% para cada nó
+        erro = "" if intermediacao["exato"] else f" ± {1.96 * intermediacao['erro_padrao'][i]:.6f}"
+        print(f"Nó {np.asarray(grafo.rotulos)[i].item()}: {intermediacao['valores'][i]:.6f}{erro}")
+
+
+# Função para exibir triângulos, clustering médio, transitividade e os nós com mais triângulos
+def imprimir_clustering(metricas, k=5):
+    """Resumo da métrica "clustering" (exata ou estimada por amostragem de nós)."""
+    clustering = metricas["clustering"]
+    if "amostras" in clustering:
+        print(f"Estimativa com {clustering['amostras']} nós ({clustering['metodo']})")
+        print(f"Triângulos (estimados): {clustering['triangulos']:,.0f}")
+    else:
+        print(f"Triângulos: {clustering['triangulos']:,}")
+    print(f"Clustering médio: {clustering['clustering_medio']:.4f}")
+    print(f"Transitividade (clustering global): {clustering['transitividade']:.4f}")
+    if "clustering_local" in clustering:
+        print(f"\nTop {k} nós por triângulos:")
+        for no, quantidade in ranking(metricas.grafo, clustering["triangulos_por_no"], k):
+            print(f"Nó {no}: {quantidade}")
 
 
-    # Questão 1B: Calcular o grau médio e gerar gráficos
-    print(f"\n{'-' * 40}")
-    print(f"Questão 1B: Grau Médio e Distribuição de Graus")
-    print(f"{'-' * 40}")
-    calcular_e_plotar_graus(grafo, f"Rede {rede.capitalize()}")
+# Arquivo de configuração das redes: caminho, formato, colunas, direção e tipo de análise de cada uma
+ARQUIVO_REDES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "redes.json")
 
+# Formatos de arquivo de arestas aceitos na configuração (csv: com cabeçalho; lista_arestas: "u v" por linha;
+# pajek: .net com *Vertices/*Arcs/*Edges, lido direto para o formato compacto)
+FORMATOS_ARQUIVO = ("csv", "lista_arestas", "pajek")
 
+# Análises disponíveis: Questão 1 (redes sociais) e Questão 2 (rede de citações)
+ANALISES = ("rede_social", "citacoes")
 
 
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
+# Função para ler a configuração das redes
+def carregar_configuracao_redes(caminho=ARQUIVO_REDES):
+    """
+    Lê o JSON {rede: {"caminho", "formato", "coluna_origem", "coluna_destino", "dirigido", "analise",
+    "memoria_maxima", "externo"}}. Caminhos relativos partem da pasta do arquivo de configuração.
+    Padrões: formato "csv", dirigido false, analise "rede_social", externo false. "externo" (só csv):
+    grafo montado em disco por ordenação externa e analisado em blocos, para redes maiores que a RAM.
+    """
+    with open(caminho, encoding="utf-8") as f:
+        configuracao = json.load(f)
+    base = os.path.dirname(os.path.abspath(caminho))
+    redes = {}
+    for rede, dados in configuracao.items():
+        dados = {"formato": "csv", "dirigido": False, "analise": "rede_social", **dados}
+        if dados["formato"] not in FORMATOS_ARQUIVO:
+            raise ValueError(f"Rede {rede}: formato desconhecido {dados['formato']} (opções: {', '.join(FORMATOS_ARQUIVO)})")
+        if dados["analise"] not in ANALISES:
+            raise ValueError(f"Rede {rede}: análise desconhecida {dados['analise']} (opções: {', '.join(ANALISES)})")
+        if dados["formato"] == "csv" and not {"coluna_origem", "coluna_destino"} <= dados.keys():
+            raise ValueError(f"Rede {rede}: arquivos csv precisam de coluna_origem e coluna_destino")
+        if dados.get("externo") and dados["formato"] != "csv":
+            raise ValueError(f"Rede {rede}: o armazenamento externo só está disponível para arquivos csv")
+        dados["caminho"] = os.path.join(base, dados["caminho"])
+        redes[rede] = dados
+    return redes
 
 
-    # # TODO: Plotar a distribuição de graus (Questão 1C).
-    # # Questão 1C: Plotar a distribuição de graus
-    print(f"\n{'-' * 40}")
-    print(f"Questão 1C: Distribuição de Graus")
-    print(f"{'-' * 40}")
-    # plotar_distribuicao_grau(grafo, f"Rede {rede.capitalize()}")
-    # plotar_distribuicao_grau(grafo, f"Rede {rede.capitalize()}")
-    # Plotar a distribuição com plotly
-    plotar_distribuicao_grau_plotly(grafo, f"Rede {rede.capitalize()}")
+# TODO: Dicionário que configura os caminhos dos arquivos de entrada e suas colunas.
+# Configurar os caminhos dos arquivos (lidos de redes.json no primeiro uso; use --config para outro arquivo)
+arquivos_dados = {}
 
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
 
+# Função para trocar a configuração das redes em uso (ex.: --config)
+def usar_configuracao_redes(caminho=ARQUIVO_REDES):
+    """Lê `caminho` e atualiza arquivos_dados no lugar: quem já importou o dicionário vê a nova configuração."""
+    configuracao = carregar_configuracao_redes(caminho)
+    arquivos_dados.clear()
+    arquivos_dados.update(configuracao)
+    return arquivos_dados
 
-    # TODO: Calcular o número de componentes conexos e o tamanho do maior componente (Questão 1D).
-    # Atualizando a Questão 1D no fluxo principal
-    print(f"\n{'-' * 40}")
-    print(f"Questão 1D: Componentes Conexos")
-    print(f"{'-' * 40}")
 
-    # Calcular e exibir componentes conectados
-    if grafo.is_directed():
-        # Componentes Fortemente Conectados
-        componentes_fortes = list(nx.strongly_connected_components(grafo))
-        tamanhos_fortes = [len(componente) for componente in componentes_fortes]
-        maior_componente_forte = max(tamanhos_fortes)
-        num_componentes_fortes = len(componentes_fortes)
+# Função para obter a configuração das redes, lendo redes.json só no primeiro uso
+def configuracao_redes():
+    """arquivos_dados, carregado de ARQUIVO_REDES se nenhuma configuração foi escolhida antes."""
+    return arquivos_dados if arquivos_dados else usar_configuracao_redes()
 
-        # Componentes Fracamente Conectados
-        componentes_fracos = list(nx.weakly_connected_components(grafo))
-        tamanhos_fracos = [len(componente) for componente in componentes_fracos]
-        maior_componente_fraco = max(tamanhos_fracos)
-        num_componentes_fracos = len(componentes_fracos)
-
-        print(f"Número de componentes fortemente conectados: {num_componentes_fortes}")
-        print(f"Tamanho do maior componente fortemente conectado: {maior_componente_forte:,} nós.")
-        print(f"Número de componentes fracamente conectados: {num_componentes_fracos}")
-        print(f"Tamanho do maior componente fracamente conectado: {maior_componente_fraco:,} nós.")
-    else:
-        # Componentes Conectados (para grafos não direcionados)
-        componentes = list(nx.connected_components(grafo))
-        tamanhos = [len(componente) for componente in componentes]
-        maior_componente = max(tamanhos)
-        num_componentes = len(componentes)
+# Seções da análise que podem ser escolhidas na linha de comando (--metricas)
+# grafo: 1A | graus: 1B, 1C, 2B | componentes: 1D, 2C | distancias: 1E, 2D | pontes: 1F
+# densidade: 2A | ciclos: 2D | centralidade: 2E (e PageRank/HITS/intermediação nas redes sociais)
+# clustering: triângulos, clustering médio, transitividade e clustering por grau
+SECOES = ("grafo", "graus", "componentes", "distancias", "pontes", "densidade", "ciclos", "centralidade", "clustering")
 
-        print(f"Número de componentes conexos: {num_componentes}")
-        print(f"Tamanho do maior componente: {maior_componente:,} nós.")
 
-    # Gerar os gráficos da distribuição de tamanhos dos componentes
-    grafico_tamanho_componentes_agrupados(grafo, titulo=f"Rede {rede.capitalize()}")
+# Função para carregar o grafo de uma rede conforme a configuração (csv, pajek ou lista de arestas)
+def carregar_grafo_rede(rede):
+    """
+    Retorna (grafo_compacto, grafo_networkx). CSV e Pajek vão direto para o formato compacto (com cache
+    em disco) e grafo_networkx é None; listas de arestas são lidas pelo networkx, que fica guardado.
+    Não imprime nada: pode rodar numa thread de pré-carga enquanto outra rede é analisada.
+    """
+    dados = configuracao_redes()[rede]
+    with etapa("Carregamento", rede):
+        if dados["formato"] == "csv":
+            grafo_networkx = None
+            grafo_compacto = carregar_grafo_compacto(
+                dados["caminho"],
+                dados["coluna_origem"],
+                dados["coluna_destino"],
+                dados["dirigido"],
+                memoria_maxima=dados.get("memoria_maxima"),
+                externo=dados.get("externo", False)
+            )
+        elif dados["formato"] == "pajek":
+            grafo_networkx = None
+            grafo_compacto = carregar_grafo_pajek(dados["caminho"], dados["dirigido"])
+        else:
+            import networkx as nx
+
+            grafo_networkx = nx.read_edgelist(dados["caminho"], create_using=nx.DiGraph() if dados["dirigido"] else nx.Graph())
+            grafo_compacto = grafo_compacto_de_networkx(grafo_networkx)
+        registrar_grafo(grafo_compacto)
+    return grafo_compacto, grafo_networkx
+
+
+# Função para calcular o identificador do grafo de uma rede no cache de resultados
+def chave_grafo_rede(rede, cache_resultados):
+    """Hash do arquivo da rede mais as opções de carga (None sem cache)."""
+    if cache_resultados is None:
+        return None
+    dados = configuracao_redes()[rede]
+    if dados["formato"] == "csv":
+        return cache_resultados.chave_entrada(
+            dados["caminho"],
+            coluna_origem=dados["coluna_origem"],
+            coluna_destino=dados["coluna_destino"],
+            dirigido=dados["dirigido"]
+        )
+    if dados["formato"] == "pajek":
+        # Rótulos inteiros (lista_arestas usa texto): as métricas guardadas não podem ser trocadas entre os formatos
+        return cache_resultados.chave_entrada(dados["caminho"], formato="pajek", dirigido=dados["dirigido"])
+    return cache_resultados.chave_entrada(dados["caminho"], dirigido=dados["dirigido"])
 
 
+# Função para abrir o estado incremental de uma rede (grafo base + lotes aplicados com incremental.py)
+def abrir_estado_incremental(rede, cache_resultados=None, grafos=None, diretorio=DIRETORIO_INCREMENTAL):
+    """GrafoIncremental da rede; sem lotes gravados, é o próprio grafo base."""
+    grafo_base = (grafos if grafos is not None else carregar_grafo_rede(rede))[0]
+    return GrafoIncremental.abrir(os.path.join(diretorio, rede), grafo_base, chave_grafo_rede(rede, cache_resultados))
 
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
 
-    # Atualizando a Questão 1E no fluxo principal
-    print(f"\n{'-' * 40}")
-    print(f"Questão 1E: Distância Média e Distribuição")
-    print(f"{'-' * 40}")
+# Função para montar o objeto de métricas de uma rede (grafo compacto + cache em disco)
+def carregar_metricas_rede(rede, cache_resultados=None, modo_distancias="amostragem", amostrador=None, grafos=None,
+                           incremental=False, processos=None, clustering_amostras=None):
+    """
+    Carrega o grafo da rede (ou usa `grafos`, o par já pré-carregado por carregar_grafo_rede) e devolve
+    o MetricasGrafo (métricas calculadas sob demanda). Com `incremental`, usa o grafo base mais os
+    lotes de arestas aplicados com incremental.py (graus e componentes já vêm mantidos).
+    `processos`: processos das métricas paralelas (distâncias exatas, triângulos); None = um por CPU.
+    `clustering_amostras`: estima o clustering a partir desse número de nós; None = contagem exata.
+    """
+    dados = configuracao_redes()[rede]
+    if incremental:
+        estado = abrir_estado_incremental(rede, cache_resultados, grafos)
+        print(f"Grafo incremental: {estado.number_of_nodes():,} nós, {estado.number_of_edges():,} arestas "
+              f"({len(estado.lotes)} lote(s) sobre o grafo base).\n")
+        return estado.metricas(nome=rede, cache=cache_resultados, arquivo=dados["caminho"],
+                               modo_distancias=modo_distancias, amostrador=amostrador, processos=processos,
+                               clustering_amostras=clustering_amostras)
+    # TODO: Carregar o grafo da rede social atual.
+    grafo_compacto, grafo_networkx = grafos if grafos is not None else carregar_grafo_rede(rede)
+    print(f"Grafo carregado com sucesso: {grafo_compacto.number_of_nodes():,} nós, {grafo_compacto.number_of_edges():,} arestas.\n")
+    # Métricas calculadas sob demanda e memorizadas: console, gráficos e HTML usam os mesmos valores
+    return MetricasGrafo(
+        grafo_compacto, nome=rede, grafo_networkx=grafo_networkx, modo_distancias=modo_distancias,
+        amostrador=amostrador, processos=processos, cache=cache_resultados,
+        chave_grafo=chave_grafo_rede(rede, cache_resultados), arquivo=dados["caminho"],
+        arestas_por_bloco=ARESTAS_POR_BLOCO if dados.get("externo") else None, clustering_amostras=clustering_amostras
+    )
 
-    # Calcular e plotar a distribuição das distâncias
-    distancia_media = grafico_distancia_pares(grafo, titulo=f"Rede {rede.capitalize()}")
-    print(f"Distância média na rede: {distancia_media:.2f}")
 
+# TODO: Bloco principal para processar os grafos das redes sociais e exibir análises.
+# Função com as Questões 1A-1F para uma rede social
+def analisar_rede_social(rede, metricas, secoes=SECOES, graficos=True):
+    """Imprime (e, com `graficos`, plota) as seções pedidas da Questão 1 para uma rede social."""
+    grafo_compacto = metricas.grafo
+
+    if "grafo" in secoes and graficos:
+        # TODO: Plotar o grafo (Questão 1A).
+        # Questão 1A: Plotar o grafo
+        with etapa("Questão 1A: Grafo", rede, grafo_compacto):
+            print(f"{'-' * 40}")
+            print(f"Questão 1A: Plotando o Grafo")
+            print(f"{'-' * 40}")
+            # Grafo inteiro: posições da métrica "layout" (calculadas uma vez e guardadas no cache)
+            plotar_grafo(grafo_compacto, f"Grafo da Rede {rede.capitalize()}", posicoes=metricas["layout"])
+
+    if "graus" in secoes:
+        # Questão 1B: Calcular o grau médio e gerar gráficos
+        with etapa("Questão 1B: Grau médio", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Questão 1B: Grau Médio e Distribuição de Graus")
+            print(f"{'-' * 40}")
+            estatisticas = metricas["estatisticas_graus"]
+            if graficos:
+                calcular_e_plotar_graus(grafo_compacto, f"Rede {rede.capitalize()}", estatisticas=estatisticas)
+            else:
+                calcular_grau_medio(grafo_compacto, estatisticas=estatisticas)
+
+        # TODO: Plotar a distribuição de graus (Questão 1C).
+        # Questão 1C: Plotar a distribuição de graus
+        with etapa("Questão 1C: Distribuição de graus", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Questão 1C: Distribuição de Graus")
+            print(f"{'-' * 40}")
+            estatisticas_total = estatisticas["total"]
+            if graficos:
+                # Plotar a distribuição com plotly
+                plotar_distribuicao_grau_plotly(grafo_compacto, f"Rede {rede.capitalize()}", estatisticas=estatisticas)
+                # Escala log-log com CCDF e ajuste de lei de potência
+                plotar_distribuicao_graus_log(estatisticas_total, f"Rede {rede.capitalize()}")
+            quantis = estatisticas_total["quantis"]
+            print(f"Variância do grau: {estatisticas_total['variancia']:.2f}; mediana: {quantis[0.5]:.0f}; "
+                  f"percentil 99: {quantis[0.99]:.0f}; máximo: {estatisticas_total['maximo']}")
+            if estatisticas_total["lei_de_potencia"] is not None:
+                ajuste = estatisticas_total["lei_de_potencia"]
+                print(f"Expoente da lei de potência (MLE): {ajuste['alfa']:.2f} ± {ajuste['erro_padrao']:.2f} "
+                      f"para k ≥ {ajuste['xmin']} (KS = {ajuste['ks']:.3f})")
+
+    if "componentes" in secoes:
+        # TODO: Calcular o número de componentes conexos e o tamanho do maior componente (Questão 1D).
+        # Questão 1D: Componentes Conexos
+        with etapa("Questão 1D: Componentes", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Questão 1D: Componentes Conexos")
+            print(f"{'-' * 40}")
+
+            # Calcular e exibir componentes conectados
+            if grafo_compacto.is_directed():
+                # Componentes Fortemente Conectados
+                tamanhos_fortes = metricas["componentes_fortes"]["tamanhos"]
+                # Componentes Fracamente Conectados
+                tamanhos_fracos = metricas["componentes"]["tamanhos"]
+
+                print(f"Número de componentes fortemente conectados: {len(tamanhos_fortes)}")
+                print(f"Tamanho do maior componente fortemente conectado: {int(tamanhos_fortes.max()):,} nós.")
+                print(f"Número de componentes fracamente conectados: {len(tamanhos_fracos)}")
+                print(f"Tamanho do maior componente fracamente conectado: {int(tamanhos_fracos.max()):,} nós.")
+
+                # Gerar os gráficos da distribuição de tamanhos dos componentes
+                if graficos:
+                    grafico_tamanho_componentes_agrupados(
+                        grafo_compacto, titulo=f"Rede {rede.capitalize()}", tamanhos=tamanhos_fracos,
+                        tamanhos_fortes=tamanhos_fortes
+                    )
+            else:
+                # Componentes Conectados (para grafos não direcionados), direto no grafo compacto
+                tamanhos = metricas["componentes"]["tamanhos"]
+                print(f"Número de componentes conexos: {len(tamanhos)}")
+                print(f"Tamanho do maior componente: {int(tamanhos.max()):,} nós.")
+
+                # Gerar os gráficos da distribuição de tamanhos dos componentes
+                if graficos:
+                    grafico_tamanho_componentes_agrupados(grafo_compacto, titulo=f"Rede {rede.capitalize()}", tamanhos=tamanhos)
+
+    if "distancias" in secoes:
+        # Questão 1E: Distância Média e Distribuição
+        with etapa("Questão 1E: Distâncias", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Questão 1E: Distância Média e Distribuição")
+            print(f"{'-' * 40}")
+
+            # Calcular e plotar a distribuição das distâncias (estimativa por BFS amostrada: segundos em vez de horas)
+            distribuicao = metricas["distancias"]
+            inferior, superior = distribuicao["intervalo_95"]
+            print(f"Distância média na rede: {distribuicao['distancia_media']:.2f} (IC 95%: {inferior:.2f} a {superior:.2f})")
+            # Distâncias extremas exatas, com poucas BFS (limites de excentricidade)
+            imprimir_excentricidades(excentricidades_por_tipo(metricas))
+            if graficos:
+                plotar_distribuicao_distancias(distribuicao["histograma"], f"Rede {rede.capitalize()}")
+
+    if "pontes" in secoes:
+        # Questão 1F: Arestas Pontes
+        with etapa("Questão 1F: Pontes", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Questão 1F: Arestas Pontes")
+            print(f"{'-' * 40}")
+
+            analise_pontes = metricas["pontes"]
+            print(f"Quantidade de arestas que podem ser pontes: {analise_pontes['quantidade']}")
+            print(f"Arestas com grandes chances de serem pontes: {analise_pontes['pontes']}")
+            print(f"Componentes 2-aresta-conexos: {len(analise_pontes['tamanhos_componentes'])}")
+
+    if "centralidade" in secoes:
+        # Centralidade dos usuários: PageRank, HITS e intermediação amostrada
+        with etapa("Centralidade", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Centralidade dos Nós")
+            print(f"{'-' * 40}")
+            imprimir_centralidades(metricas)
+
+    if "clustering" in secoes:
+        # Triângulos e coeficientes de clustering (contagem exata em paralelo ou estimativa por amostragem)
+        with etapa("Clustering", rede, grafo_compacto):
+            print(f"\n{'-' * 40}")
+            print(f"Triângulos e Clustering")
+            print(f"{'-' * 40}")
+            imprimir_clustering(metricas)
+            if graficos:
+                plotar_clustering_por_grau(metricas["clustering"], f"Rede {rede.capitalize()}")
 
 
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
+# TODO: Carregar o grafo de citações como orientado.
+# Função para montar o objeto de métricas da rede de citações (grafo orientado)
+def carregar_metricas_citacoes(cache_resultados=None, rede="scientometrics", grafos=None, incremental=False,
+                               processos=None, clustering_amostras=None):
+    """Carrega o grafo de citações (orientado, ver redes.json) e devolve o MetricasGrafo."""
+    return carregar_metricas_rede(rede, cache_resultados, modo_distancias="exato", grafos=grafos, incremental=incremental,
+                                  processos=processos, clustering_amostras=clustering_amostras)
 
 
-    # Atualizando a Questão 1F no fluxo principal
-    print(f"\n{'-' * 40}")
-    print(f"Questão 1F: Arestas Pontes")
-    print(f"{'-' * 40}")
+# TODO: Bloco dedicado à análise da rede Scientometrics (Questão 2).
+# Função com as Questões 2A-2E para a rede de citações
+def analisar_citacoes(metricas_citacoes, secoes=SECOES):
+    """Imprime as seções pedidas da Questão 2 para a rede de citações."""
+    rede, grafo = metricas_citacoes.nome, metricas_citacoes.grafo
+    if "densidade" in secoes:
+        # TODO: Calcular a densidade do grafo (Questão 2A).
+        # Questão 2A: Densidade do Grafo
+        with etapa("Questão 2A: Densidade", rede, grafo):
+            print(f"{'-' * 40}")
+            print("Questão 2A: Densidade do Grafo")
+            print(f"{'-' * 40}")
+            densidade = metricas_citacoes["densidade"]
+            print(f"Densidade do Grafo: {densidade:.4f}\n")
+
+    if "graus" in secoes:
+        # TODO: Calcular o grau médio de entrada e saída (Questão 2B).
+        # Questão 2B: Grau dos Vértices
+        with etapa("Questão 2B: Graus", rede, grafo):
+            print(f"{'-' * 40}")
+            print("Questão 2B: Grau dos Vértices")
+            print(f"{'-' * 40}")
+            grau_entrada = metricas_citacoes["grau_medio"]["entrada"]
+            grau_saida = metricas_citacoes["grau_medio"]["saida"]
+            print(f"Grau médio de entrada: {grau_entrada:.2f}")
+            print(f"Grau médio de saída: {grau_saida:.2f}\n")
+
+    if "componentes" in secoes:
+        # TODO: Identificar componentes fortemente e fracamente conectados (Questão 2C).
+        # Questão 2C: Componentes Conexos
+        with etapa("Questão 2C: Componentes", rede, grafo):
+            print(f"{'-' * 40}")
+            print("Questão 2C: Componentes Conexos")
+            print(f"{'-' * 40}")
+            componentes_fortes = len(metricas_citacoes["componentes_fortes"]["tamanhos"])
+            componentes_fracos = len(metricas_citacoes["componentes"]["tamanhos"])
+            print(f"Número de componentes fortemente conectados: {componentes_fortes}")
+            print(f"Número de componentes fracamente conectados: {componentes_fracos}\n")
+
+    if "ciclos" in secoes or "distancias" in secoes:
+        # TODO: Verificar ciclos e calcular caminhos mais curtos na maior componente (Questão 2D).
+        # Questão 2D: Caminhos e Ciclos
+        print(f"{'-' * 40}")
+        print("Questão 2D: Caminhos e Ciclos")
+        print(f"{'-' * 40}")
+
+    if "ciclos" in secoes:
+        with etapa("Questão 2D: Ciclos", rede, grafo):
+            print("Verificando a presença de ciclos...")
+            # Contagem sem guardar os ciclos, só dentro dos componentes fortes, com limite de tempo/quantidade
+            ciclos = metricas_citacoes["ciclos"]
+            print(f"O grafo é acíclico (DAG)? {'Sim' if ciclos['aciclico'] else 'Não'}")
+            print(f"Posto de ciclos (m - n + c): {ciclos['posto_ciclos']}")
+            if ciclos["completo"]:
+                print(f"Número de ciclos encontrados: {ciclos['ciclos']}")
+            else:
+                print(f"Número de ciclos encontrados: pelo menos {ciclos['ciclos']} "
+                      f"(busca interrompida por {ciclos['motivo_interrupcao']})")
+            if ciclos["por_comprimento"]:
+                print(f"Ciclos por comprimento: {ciclos['por_comprimento']}")
+
+    if "distancias" in secoes:
+        with etapa("Questão 2D: Distância média", rede, grafo):
+            print("\nCalculando a média dos caminhos mais curtos...")
+            # Grafo não fortemente conectado: a média considera só os pares (u, v) com caminho de u a v
+            distancias = metricas_citacoes["distancias"]
+            n = grafo.number_of_nodes()
+            fracao = distancias["pares"] / (n * (n - 1)) if n > 1 else 0.0
+            print(f"Pares com caminho: {distancias['pares']:,} ({fracao:.2%} dos pares ordenados)")
+            print(f"Média dos caminhos mais curtos entre os pares com caminho: {distancias['distancia_media']:.2f}")
+            imprimir_alcance(metricas_citacoes)
+            imprimir_excentricidades(excentricidades_por_tipo(metricas_citacoes))
+
+    if "centralidade" in secoes:
+        # TODO: Exibir centralidade de grau normalizada e grau absoluto (Questão 2E).
+        # Questão 2E: Centralidade de Grau
+        with etapa("Questão 2E: Centralidade", rede, grafo):
+            print(f"{'-' * 40}")
+            print("Questão 2E: Centralidade de Grau")
+            print(f"{'-' * 40}")
+            graus = metricas_citacoes["graus"]
+            n = grafo.number_of_nodes()
+
+            # TODO: Calcular e exibir centralidade de grau normalizada.
+            # Centralidade de Grau Normalizada (grau / (n - 1)), só os 5 maiores são selecionados
+            print("\nTop 5 nós por centralidade de grau (entrada - normalizada):")
+            for no, valor in ranking(grafo, graus["entrada"] / max(n - 1, 1)):
+                print(f"Nó {no}: {valor:.4f}")
+
+            print("\nTop 5 nós por centralidade de grau (saída - normalizada):")
+            for no, valor in ranking(grafo, graus["saida"] / max(n - 1, 1)):
+                print(f"Nó {no}: {valor:.4f}")
+
+            # TODO: Calcular e exibir grau absoluto.
+            # Grau Absoluto
+            print("\nTop 5 nós por grau de entrada (absoluto):")
+            for no, grau in ranking(grafo, graus["entrada"]):
+                print(f"Nó {no}: {grau}")
+
+            print("\nTop 5 nós por grau de saída (absoluto):")
+            for no, grau in ranking(grafo, graus["saida"]):
+                print(f"Nó {no}: {grau}")
+
+            imprimir_centralidades(metricas_citacoes)
+
+    if "clustering" in secoes:
+        # Triângulos de citações, com as citações vistas sem direção
+        with etapa("Clustering", rede, grafo):
+            print(f"\n{'-' * 40}")
+            print(f"Triângulos e Clustering (citações sem direção)")
+            print(f"{'-' * 40}")
+            imprimir_clustering(metricas_citacoes)
 
-    pontes = encontrar_pontes(grafo)
-    print(f"Quantidade de arestas que podem ser pontes: {len(pontes)}")
-    print(f"Arestas com grandes chances de serem pontes: {pontes}")
 
+# TODO: HTML
+# Função para gerar o relatório HTML a partir dos resumos de cada rede
+def gerar_html(resultados, caminho="resultados.html", figuras=None):
+    """
+    `resultados` é {rede: resumo_metricas(...)}; grava o relatório em `caminho` (ver relatorio.RelatorioHTML).
+    `figuras` (opcional) é {rede: entradas do manifesto de exportacao.py} para embutir os gráficos.
+    """
+    with RelatorioHTML(caminho) as relatorio:
+        for rede, analise in resultados.items():
+            relatorio.adicionar_secao(rede, analise, (figuras or {}).get(rede, ()))
+    print(f"Arquivo HTML gerado: {caminho}")
 
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo: ################################################################################################################
-# todo:#################################################################################################################
-# todo:#################################################################################################################
-# todo:
-# todo:     QUESTÃO 2 A BAIXO:
-# todo:     QUESTÃO 2 A BAIXO:
-# todo:     QUESTÃO 2 A BAIXO:
-# todo:
-# todo:#################################################################################################################
-# todo:#################################################################################################################
 
+# Função para processar uma rede conforme o tipo de análise configurado (Questão 1 ou Questão 2)
+def processar_rede(rede, secoes=SECOES, graficos=True, cache_resultados=None, modo_distancias="amostragem",
+                   amostrador=None, grafos=None, incremental=False, processos=None, clustering_amostras=None):
+    """
+    Imprime o cabeçalho, monta as métricas (com `grafos` pré-carregados, se houver) e roda a análise.
+    `processos` e `clustering_amostras`: ver carregar_metricas_rede.
+    """
+    citacoes = configuracao_redes()[rede]["analise"] == "citacoes"
+    print(f"\n{'=' * 60}")
+    print(f"Processando o Grafo de Citações: {rede.capitalize()}" if citacoes else f"Processando a Rede: {rede.capitalize()}")
+    print(f"{'=' * 60}\n")
+    if citacoes:
+        # Questão 2: Ciência Cientométrica
+        metricas = carregar_metricas_citacoes(cache_resultados, rede, grafos, incremental, processos, clustering_amostras)
+        analisar_citacoes(metricas, secoes)
+    else:
+        metricas = carregar_metricas_rede(rede, cache_resultados, modo_distancias, amostrador, grafos, incremental, processos,
+                                          clustering_amostras)
+        analisar_rede_social(rede, metricas, secoes, graficos)
+    return metricas
 
-# TODO: Bloco dedicado à análise da rede Scientometrics (Questão 2).
-# Questão 2: Ciência Cientométrica
-print(f"\n{'=' * 60}")
-print("Processando o Grafo de Citações: Scientometrics")
-print(f"{'=' * 60}\n")
 
-# TODO: Carregar o grafo de citações como orientado.
-# Carregar o grafo como orientado
-grafo_citacoes = nx.read_edgelist(
-    arquivos_dados["scientometrics"]["caminho"],
-    create_using=nx.DiGraph()
-)
-print(f"Grafo carregado com sucesso: {len(grafo_citacoes.nodes):,} nós, {len(grafo_citacoes.edges):,} arestas.\n")
-
-# TODO: Calcular a densidade do grafo (Questão 2A).
-# Questão 2A: Densidade do Grafo
-print(f"{'-' * 40}")
-print("Questão 2A: Densidade do Grafo")
-print(f"{'-' * 40}")
-densidade = nx.density(grafo_citacoes)
-print(f"Densidade do Grafo: {densidade:.4f}\n")
-
-# TODO: Calcular o grau médio de entrada e saída (Questão 2B).
-# Questão 2B: Grau dos Vértices
-print(f"{'-' * 40}")
-print("Questão 2B: Grau dos Vértices")
-print(f"{'-' * 40}")
-grau_entrada = sum(dict(grafo_citacoes.in_degree()).values()) / len(grafo_citacoes.nodes)
-grau_saida = sum(dict(grafo_citacoes.out_degree()).values()) / len(grafo_citacoes.nodes)
-print(f"Grau médio de entrada: {grau_entrada:.2f}")
-print(f"Grau médio de saída: {grau_saida:.2f}\n")
-
-# TODO: Identificar componentes fortemente e fracamente conectados (Questão 2C).
-# Questão 2C: Componentes Conexos
-print(f"{'-' * 40}")
-print("Questão 2C: Componentes Conexos")
-print(f"{'-' * 40}")
-componentes_fortes = nx.number_strongly_connected_components(grafo_citacoes)
-componentes_fracos = nx.number_weakly_connected_components(grafo_citacoes)
-print(f"Número de componentes fortemente conectados: {componentes_fortes}")
-print(f"Número de componentes fracamente conectados: {componentes_fracos}\n")
-
-# TODO: Verificar ciclos e calcular caminhos mais curtos na maior componente (Questão 2D).
-# Questão 2D: Caminhos e Ciclos
-print(f"{'-' * 40}")
-print("Questão 2D: Caminhos e Ciclos")
-print(f"{'-' * 40}")
-print("Verificando a presença de ciclos...")
-ciclos = list(nx.simple_cycles(grafo_citacoes))
-print(f"Número de ciclos encontrados: {len(ciclos)}")
-
-print("\nCalculando a média dos caminhos mais curtos...")
-try:
-    distancia_media = nx.average_shortest_path_length(grafo_citacoes)
-    print(f"Média dos caminhos mais curtos: {distancia_media:.2f}")
-except nx.NetworkXError:
-    print("O grafo não é fortemente conectado; não é possível calcular a distância média.\n")
-
-# TODO: Exibir centralidade de grau normalizada e grau absoluto (Questão 2E).
-# Questão 2E: Centralidade de Grau
-print(f"{'-' * 40}")
-print("Questão 2E: Centralidade de Grau")
-print(f"{'-' * 40}")
-
-# TODO: Calcular e exibir centralidade de grau normalizada.
-# Centralidade de Grau Normalizada
-centralidade_grau_entrada = nx.in_degree_centrality(grafo_citacoes)
-centralidade_grau_saida = nx.out_degree_centrality(grafo_citacoes)
-
-print("\nTop 5 nós por centralidade de grau (entrada - normalizada):")
-for no, valor in sorted(centralidade_grau_entrada.items(), key=lambda x: x[1], reverse=True)[:5]:
-    print(f"Nó {no}: {valor:.4f}")
-
-print("\nTop 5 nós por centralidade de grau (saída - normalizada):")
-for no, valor in sorted(centralidade_grau_saida.items(), key=lambda x: x[1], reverse=True)[:5]:
-    print(f"Nó {no}: {valor:.4f}")
-
-# TODO: Calcular e exibir grau absoluto.
-# Grau Absoluto
-graus_entrada = dict(grafo_citacoes.in_degree())
-graus_saida = dict(grafo_citacoes.out_degree())
-
-print("\nTop 5 nós por grau de entrada (absoluto):")
-for no, grau in sorted(graus_entrada.items(), key=lambda x: x[1], reverse=True)[:5]:
-    print(f"Nó {no}: {grau}")
-
-print("\nTop 5 nós por grau de saída (absoluto):")
-for no, grau in sorted(graus_saida.items(), key=lambda x: x[1], reverse=True)[:5]:
-    print(f"Nó {no}: {grau}")
-
-# TODO:
-# TODO:
-# TODO: HTML
-# TODO:
-# TODO:
-# TODO: Dicionário global para resultados
-resultados = {}
-
-# Processar redes sociais (Deezer e Lastfm, por exemplo)
-for rede in ["deezer", "lastfm"]:
-    # Carregar o grafo
-    grafo = carregar_grafo_de_arestas(
-        arquivos_dados[rede]["caminho"],
-        arquivos_dados[rede]["coluna_origem"],
-        arquivos_dados[rede]["coluna_destino"],
-        arquivos_dados[rede]["bool"]
-    )
+def _processar_rede_isolada(rede, secoes, graficos, opcoes):
+    """
+    Roda num processo do pool (--processos): analisa uma rede inteira e devolve só dados leves e
+    serializáveis (texto do console, resumo do relatório, etapas medidas e figuras exportadas).
+    As figuras são renderizadas no próprio processo (sem outro pool dentro dele).
+    """
+    usar_configuracao_redes(opcoes["config"])
+    instrumentacao = ativar_instrumentacao(opcoes["memoria"], opcoes["perfil"])
+    if graficos:
+        ativar_exportacao(opcoes["exportar_graficos"], opcoes["formatos"], processos=0)
+    definir_grupo(rede)
+    cache_resultados = None if opcoes["sem_cache"] else CacheResultados()
+    saida = io.StringIO()
+    try:
+        with redirect_stdout(saida):
+            metricas = processar_rede(rede, secoes, graficos, cache_resultados, opcoes["modo_distancias"],
+                                      opcoes["amostrador"], incremental=opcoes["incremental"],
+                                      processos=opcoes["processos_por_rede"],
+                                      clustering_amostras=opcoes["clustering_amostras"])
+            resumo = resumo_metricas(metricas, secoes)
+    finally:
+        figuras = finalizar_exportacao(gravar=False)
+        finalizar_instrumentacao()
+    return {"rede": rede, "saida": saida.getvalue(), "resumo": resumo, "etapas": instrumentacao.etapas,
+            "figuras": figuras}
+
+
+# Função principal: python analise_grafos.py [--config ...] [--redes ...] [--metricas ...] [--processos N]
+def main(argumentos=None):
+    """
+    Retorna {rede: MetricasGrafo}; com --processos > 1 as métricas ficam nos processos do pool e o
+    retorno é {rede: resumo_metricas(...)}.
+    """
+    parser = argparse.ArgumentParser(description="Análise das redes sociais (Questão 1) e de citações (Questão 2).")
+    parser.add_argument("--config", default=ARQUIVO_REDES,
+                        help="Arquivo JSON com as redes (caminho, formato, colunas, direção, análise).")
+    parser.add_argument("--redes", default=None,
+                        help="Redes a processar, separadas por vírgula (padrão: todas as da configuração).")
+    parser.add_argument("--metricas", default=",".join(SECOES),
+                        help=f"Seções a calcular, separadas por vírgula (padrão: todas: {','.join(SECOES)}).")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="Redes analisadas ao mesmo tempo, cada uma num processo (padrão: 1, com pré-carga da próxima).")
+    parser.add_argument("--sem-graficos", action="store_true",
+                        help="Não gera gráficos (matplotlib e plotly nem são importados).")
+    parser.add_argument("--exportar-graficos", metavar="DIRETORIO",
+                        help="Grava os gráficos em arquivos neste diretório (em segundo plano) em vez de exibi-los.")
+    parser.add_argument("--formatos", default="html,png",
+                        help=f"Formatos dos gráficos exportados, separados por vírgula (opções: {','.join(FORMATOS)}).")
+    parser.add_argument("--html", default="resultados.html", help="Caminho do relatório HTML.")
+    parser.add_argument("--sem-html", action="store_true", help="Não gera o relatório HTML.")
+    parser.add_argument("--sem-cache", action="store_true", help="Não lê nem grava o cache de resultados em disco.")
+    parser.add_argument("--modo-distancias", default="amostragem", choices=("exato", "amostragem", "hyperanf"))
+    parser.add_argument("--amostrador", default=None,
+                        help="Amostrador das fontes de BFS e, com --clustering-amostras, dos nós (ver amostragem.AMOSTRADORES).")
+    parser.add_argument("--clustering-amostras", type=int, metavar="N",
+                        help="Estima o clustering a partir de N nós em vez da contagem exata de triângulos.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Usa o grafo base mais os lotes de arestas aplicados com incremental.py.")
+    parser.add_argument("--memoria", default="rss", choices=FONTES_MEMORIA,
+                        help="Como medir a memória de cada etapa (tracemalloc é mais preciso e mais lento).")
+    parser.add_argument("--tempos-json", metavar="ARQUIVO", help="Grava o tempo e a memória de cada etapa em JSON.")
+    parser.add_argument("--perfil", metavar="DIRETORIO", help="Grava um perfil cProfile (.prof) de cada etapa.")
+    argumentos = parser.parse_args(argumentos)
+
+    try:
+        configuracao = usar_configuracao_redes(argumentos.config)
+    except (OSError, ValueError) as erro:
+        parser.error(f"configuração inválida em {argumentos.config}: {erro}")
+    redes = [rede.strip() for rede in (argumentos.redes or ",".join(configuracao)).split(",") if rede.strip()]
+    secoes = [secao.strip() for secao in argumentos.metricas.split(",") if secao.strip()]
+    for nome, escolhidos, validos in (("rede", redes, tuple(configuracao)), ("métrica", secoes, SECOES)):
+        desconhecidos = [valor for valor in escolhidos if valor not in validos]
+        if desconhecidos:
+            parser.error(f"{nome} desconhecida: {', '.join(desconhecidos)} (opções: {', '.join(validos)})")
+    graficos = not argumentos.sem_graficos
+    formatos = [formato.strip() for formato in argumentos.formatos.split(",") if formato.strip()]
+    if any(formato not in FORMATOS for formato in formatos):
+        parser.error(f"formato desconhecido em --formatos (opções: {', '.join(FORMATOS)})")
+    paralelo = argumentos.processos > 1 and len(redes) > 1
+    if paralelo and graficos and not argumentos.exportar_graficos:
+        parser.error("com --processos > 1 os gráficos não podem ser exibidos: use --exportar-graficos ou --sem-graficos")
+    if graficos and argumentos.exportar_graficos and not paralelo:
+        # Modo sem janelas: cada figura vira arquivos, renderizados em paralelo com o cálculo das métricas
+        ativar_exportacao(argumentos.exportar_graficos, formatos)
+
+    # Tempo, CPU e memória de cada etapa (carregamento e cada Questão), exibidos no fim e no relatório
+    instrumentacao = ativar_instrumentacao(argumentos.memoria, argumentos.perfil)
+    # O relatório é escrito rede a rede, assim que as métricas de cada uma ficam prontas
+    relatorio = None if argumentos.sem_html else RelatorioHTML(argumentos.html)
+    try:
+        if paralelo:
+            opcoes = {
+                "config": argumentos.config,
+                "exportar_graficos": argumentos.exportar_graficos,
+                "formatos": formatos,
+                "sem_cache": argumentos.sem_cache,
+                "modo_distancias": argumentos.modo_distancias,
+                "amostrador": argumentos.amostrador,
+                "clustering_amostras": argumentos.clustering_amostras,
+                "incremental": argumentos.incremental,
+                "memoria": argumentos.memoria,
+                "perfil": argumentos.perfil,
+                # Cada rede do pool divide as CPUs com as outras nas métricas paralelas
+                "processos_por_rede": max(1, (os.cpu_count() or 1) // min(argumentos.processos, len(redes))),
+            }
+            resultados, manifesto = _executar_em_paralelo(
+                redes, secoes, graficos, opcoes, argumentos.processos, relatorio, instrumentacao
+            )
+        else:
+            # Cache em disco das métricas: reexecuções só recalculam o que mudou (entrada, opções ou versão da métrica)
+            cache_resultados = None if argumentos.sem_cache else CacheResultados()
+            resultados = _executar_em_sequencia(
+                redes, secoes, graficos, cache_resultados, argumentos.modo_distancias, argumentos.amostrador, relatorio,
+                argumentos.incremental, argumentos.clustering_amostras
+            )
+            manifesto = []
+    finally:
+        if not paralelo:
+            # Espera os gráficos ainda em renderização (só há o que esperar com --exportar-graficos)
+            with etapa("Exportação dos gráficos") if graficos and argumentos.exportar_graficos else nullcontext():
+                manifesto = finalizar_exportacao()
+        finalizar_instrumentacao()
+        if relatorio is not None:
+            relatorio.adicionar_etapas(instrumentacao.etapas)
+            relatorio.fechar()
 
-    # Atualizar os resultados no dicionário
-    resultados[rede] = {
-        "numero_nos": grafo.number_of_nodes(),
-        "numero_arestas": grafo.number_of_edges(),
-        "grau_medio_entrada": sum(dict(grafo.in_degree()).values()) / grafo.number_of_nodes(),
-        "grau_medio_saida": sum(dict(grafo.out_degree()).values()) / grafo.number_of_nodes(),
-        "numero_componentes_fortes": nx.number_strongly_connected_components(grafo),
-        "tamanho_maior_componente_forte": max(len(c) for c in nx.strongly_connected_components(grafo)),
-        "numero_componentes_fracos": nx.number_weakly_connected_components(grafo),
-        "tamanho_maior_componente_fraco": max(len(c) for c in nx.weakly_connected_components(grafo)),
-        "distancia_media": grafico_distancia_pares(grafo, titulo=f"Rede {rede.capitalize()}"),
-        "numero_arestas_pontes": len(encontrar_pontes(grafo)),
-        "pontes_amostra": encontrar_pontes(grafo)[:10],  # Exibir apenas as primeiras 10 pontes
-    }
+    print(f"\n{'=' * 60}")
+    print("Tempo e memória por etapa")
+    print(f"{'=' * 60}")
+    print(instrumentacao.tabela())
+    if argumentos.tempos_json:
+        instrumentacao.para_json(argumentos.tempos_json)
+        print(f"Tempos gravados em {argumentos.tempos_json}")
+    if argumentos.perfil:
+        print(f"Perfis cProfile gravados em {argumentos.perfil}")
+    if manifesto:
+        print(f"{len(manifesto)} gráfico(s) exportado(s) em {argumentos.exportar_graficos}")
+    if relatorio is not None:
+        print(f"Arquivo HTML gerado: {argumentos.html}")
+    return resultados
+
+
+def _executar_em_sequencia(redes, secoes, graficos, cache_resultados, modo_distancias, amostrador, relatorio,
+                           incremental=False, clustering_amostras=None):
+    """Uma rede por vez; enquanto uma é analisada, uma thread já carrega o arquivo da próxima."""
+    metricas_por_rede = {}
+    with ThreadPoolExecutor(1) as pre_carga:
+        proxima = pre_carga.submit(carregar_grafo_rede, redes[0]) if redes else None
+        for indice, rede in enumerate(redes):
+            grafos = proxima.result()
+            proxima = pre_carga.submit(carregar_grafo_rede, redes[indice + 1]) if indice + 1 < len(redes) else None
+            definir_grupo(rede)
+            metricas_por_rede[rede] = processar_rede(
+                rede, secoes, graficos, cache_resultados, modo_distancias, amostrador, grafos, incremental,
+                clustering_amostras=clustering_amostras
+            )
+            if relatorio is not None:
+                # Reaproveita as métricas já calculadas acima (nada é recarregado nem recalculado)
+                relatorio.adicionar_secao(rede, resumo_metricas(metricas_por_rede[rede], secoes), figuras_exportadas(rede))
+    return metricas_por_rede
 
-# Processar o grafo de citações para a Questão 2
-grafo_citacoes = nx.read_edgelist(
-    arquivos_dados["scientometrics"]["caminho"],
-    create_using=nx.DiGraph()
-)
 
-resultados["scientometrics"] = {
-    "densidade": nx.density(grafo_citacoes),
-    "grau_medio_entrada": sum(dict(grafo_citacoes.in_degree()).values()) / grafo_citacoes.number_of_nodes(),
-    "grau_medio_saida": sum(dict(grafo_citacoes.out_degree()).values()) / grafo_citacoes.number_of_nodes(),
-    "componentes_fortes": nx.number_strongly_connected_components(grafo_citacoes),
-    "componentes_fracos": nx.number_weakly_connected_components(grafo_citacoes),
-    "ciclos": len(list(nx.simple_cycles(grafo_citacoes))),
-    "distancia_media": grafico_distancia_pares(grafo, titulo=f"Rede {rede.capitalize()}"),
-}
-
-# Geração do HTML
-html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">z
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Resultados da Análise de Grafos</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 0;
-            background-color: #f9f9f9;
-            color: #333;
-        }
-        header {
-            background-color: #5c2d91;
-            color: white;
-            padding: 20px;
-            text-align: center;
-        }
-        .container {
-            margin: 20px auto;
-            max-width: 900px;
-            padding: 20px;
-            background: white;
-            box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-            border-radius: 8px;
-        }
-        h1, h2 {
-            font-family: 'Arial Black', sans-serif;
-            margin-top: 0;
-        }
-        h3 {
-            color: #5c2d91;
-        }
-        .section {
-            margin-bottom: 30px;
-        }
-        .results-table {
-            border-collapse: collapse;
-            width: 100%;
-            margin-top: 10px;
-        }
-        .results-table th, .results-table td {
-            border: 1px solid #ddd;
-            padding: 10px;
-            text-align: left;
-        }
-        .results-table th {
-            background-color: #e6e6e6;
-        }
-        ul {
-            padding-left: 20px;
-        }
-        li {
-            margin-bottom: 5px;
-        }
-        p {
-            font-size: 1.1em;
-            margin: 5px 0;
-        }
-        footer {
-            text-align: center;
-            padding: 10px 0;
-            background-color: #5c2d91;
-            color: white;
-            margin-top: 20px;
-        }
-    </style>
-</head>
-<body>
-<header>
-    <h1>Resultados da Análise de Grafos</h1>
-</header>
-<div class="container">
-"""
-
-# Adicionar seções para cada rede
-for rede, analise in resultados.items():
-    html_content += f"""
-    <div class="section">
-        <h3>Rede: {rede.capitalize()}</h3>
-        <table class="results-table">
-            <tr><th>Métrica</th><th>Valor</th></tr>
-    """
-    for metrica, valor in analise.items():
-        html_content += f"<tr><td>{metrica.replace('_', ' ').capitalize()}</td><td>{valor}</td></tr>"
-    html_content += "</table></div>"
-
-html_content += """
-</div>
-<footer>
-    <p>&copy; 2024 Análise de Grafos</p>
-</footer>
-</body>
-</html>
-"""
-
-# Salvar o HTML
-with open("resultados.html", "w", encoding="utf-8") as f:
-    f.write(html_content)
-
-print("Arquivo HTML gerado: resultados.html")
+def _executar_em_paralelo(redes, secoes, graficos, opcoes, processos, relatorio, instrumentacao):
+    """
+    Várias redes ao mesmo tempo, uma por processo. A saída de cada uma é impressa inteira e o
+    relatório recebe as seções na ordem da configuração, assim que cada rede (e as anteriores) termina.
+    """
+    resumos, manifesto = {}, []
+    with ProcessPoolExecutor(min(processos, len(redes))) as executor:
+        futuros = [executor.submit(_processar_rede_isolada, rede, secoes, graficos, opcoes) for rede in redes]
+        for futuro in futuros:
+            resultado = futuro.result()
+            print(resultado["saida"], end="")
+            resumos[resultado["rede"]] = resultado["resumo"]
+            instrumentacao.etapas.extend(resultado["etapas"])
+            manifesto.extend(resultado["figuras"])
+            if relatorio is not None:
+                relatorio.adicionar_secao(resultado["rede"], resultado["resumo"], resultado["figuras"])
+    if manifesto:
+        gravar_manifesto(opcoes["exportar_graficos"], manifesto)
+    return resumos, manifesto
+
+
+if __name__ == "__main__":
+    main()
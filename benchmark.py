@@ -0,0 +1,438 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from grafo_compacto import carregar_grafo_compacto, construir_grafo_compacto
+
+
+# Arquivo padrão do histórico de medições (uma medição por linha, JSON)
+HISTORICO_PADRAO = os.path.join(".benchmarks", "historico.jsonl")
+
+# Tamanhos padrão (número de nós) dos grafos sintéticos
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000)
+
+# Grau médio dos grafos sintéticos Erdős–Rényi e Barabási–Albert
+GRAU_MEDIO_SINTETICO = 10
+
+# Tolerância padrão para regressão: mais lento que a referência por mais de 20%
+TOLERANCIA_PADRAO = 0.2
+
+# Diferenças absolutas menores que isso (segundos) nunca contam como regressão (ruído de medição)
+_PISO_REGRESSAO = 0.01
+
+# Quantas medições anteriores (mesmo caso, grafo e máquina) formam a referência
+_MEDICOES_REFERENCIA = 5
+
+
+# Função para gerar um grafo aleatório Erdős–Rényi G(n, m) com semente fixa
+def grafo_erdos_renyi(n, grau_medio=GRAU_MEDIO_SINTETICO, semente=42):
+    """Sorteia m = n * grau_medio / 2 arestas uniformes (laços e repetidas são descartados)."""
+    gerador = np.random.default_rng(semente)
+    m = int(n * grau_medio / 2)
+    origens = gerador.integers(n, size=m)
+    destinos = gerador.integers(n, size=m)
+    sem_laco = origens != destinos
+    # GrafoCompacto só conhece nós com arestas: com grau médio baixo, o n efetivo fica um pouco menor que n
+    return construir_grafo_compacto(origens[sem_laco], destinos[sem_laco], False)
+
+
+# Função para gerar um grafo Barabási–Albert (ligação preferencial) com semente fixa
+def grafo_barabasi_albert(n, grau_medio=GRAU_MEDIO_SINTETICO, semente=42):
+    """
+    Cada novo nó liga-se a k = grau_medio / 2 nós escolhidos com probabilidade proporcional ao grau
+    (sorteio uniforme na lista de pontas de arestas já criadas). Gera uma cauda de lei de potência.
+    """
+    gerador = np.random.default_rng(semente)
+    k = max(1, grau_medio // 2)
+    pontas = np.empty(2 * k * n, dtype=np.int64)
+    origens = np.empty(k * n, dtype=np.int64)
+    destinos = np.empty(k * n, dtype=np.int64)
+    # Núcleo inicial: estrela com k + 1 nós
+    quantidade_arestas = 0
+    for v in range(1, k + 1):
+        origens[quantidade_arestas], destinos[quantidade_arestas] = v, 0
+        quantidade_arestas += 1
+    pontas[:2 * quantidade_arestas] = np.stack([origens[:quantidade_arestas], destinos[:quantidade_arestas]], 1).ravel()
+    quantidade_pontas = 2 * quantidade_arestas
+    sorteios = gerador.random((n, k))
+    for novo in range(k + 1, n):
+        alvos = np.unique(pontas[(sorteios[novo] * quantidade_pontas).astype(np.int64)])
+        fim = quantidade_arestas + len(alvos)
+        origens[quantidade_arestas:fim] = novo
+        destinos[quantidade_arestas:fim] = alvos
+        pontas[quantidade_pontas:quantidade_pontas + 2 * len(alvos):2] = novo
+        pontas[quantidade_pontas + 1:quantidade_pontas + 2 * len(alvos):2] = alvos
+        quantidade_arestas, quantidade_pontas = fim, quantidade_pontas + 2 * len(alvos)
+    return construir_grafo_compacto(origens[:quantidade_arestas], destinos[:quantidade_arestas], False)
+
+
+# Função para gerar um caminho longo (pior caso para recursão e para BFS por níveis)
+def grafo_caminho(n, semente=42):
+    """Caminho 0 - 1 - ... - (n - 1), com os rótulos embaralhados para não favorecer a ordem do CSR."""
+    rotulos = np.random.default_rng(semente).permutation(n)
+    return construir_grafo_compacto(rotulos[:-1], rotulos[1:], False)
+
+
+# Geradores sintéticos disponíveis (nome -> função(n, semente))
+GERADORES = {
+    "erdos_renyi": grafo_erdos_renyi,
+    "barabasi_albert": grafo_barabasi_albert,
+    "caminho": grafo_caminho,
+}
+
+# Casos que só fazem sentido em grafos não direcionados (como em analise_grafos)
+_CASOS_NAO_DIRIGIDOS = ("encontrar_pontes",)
+
+# Geradores cujo diâmetro cresce linearmente com n
+_GERADORES_DIAMETRO_LONGO = ("caminho",)
+
+
+class EntradaBenchmark:
+    """
+    Um grafo de teste: o GrafoCompacto e, sob demanda (fora da medição), o CSV de arestas e o
+    grafo networkx usados pelas funções que partem deles.
+    """
+
+    def __init__(self, nome, grafo, caminho_csv=None, colunas=("origem", "destino"), diametro_longo=False):
+        self.nome = nome
+        self.grafo = grafo
+        self.diametro_longo = diametro_longo
+        self._caminho_csv = caminho_csv
+        self.colunas = colunas
+        self._grafo_networkx = None
+        self._temporario = None
+
+    @property
+    def caminho_csv(self):
+        if self._caminho_csv is None:
+            self._temporario = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+            self._temporario.close()
+            origens = np.repeat(np.arange(self.grafo.number_of_nodes()), np.diff(self.grafo.indptr))
+            metade = origens <= self.grafo.indices if not self.grafo.dirigido else slice(None)
+            rotulos = np.asarray(self.grafo.rotulos)
+            arestas = np.stack([rotulos[origens[metade]], rotulos[np.asarray(self.grafo.indices)[metade]]], 1)
+            np.savetxt(self._temporario.name, arestas, fmt="%s", delimiter=",",
+                       header=",".join(self.colunas), comments="")
+            self._caminho_csv = self._temporario.name
+        return self._caminho_csv
+
+    @property
+    def grafo_networkx(self):
+        if self._grafo_networkx is None:
+            self._grafo_networkx = self.grafo.para_networkx()
+        return self._grafo_networkx
+
+    def limpar(self):
+        if self._temporario is not None and os.path.exists(self._temporario.name):
+            os.remove(self._temporario.name)
+
+
+def _caso_carregar_networkx(entrada):
+    from analise_grafos import carregar_grafo_de_arestas
+
+    return carregar_grafo_de_arestas(entrada.caminho_csv, *entrada.colunas, entrada.grafo.dirigido)
+
+
+def _caso_carregar_compacto(entrada):
+    return carregar_grafo_compacto(entrada.caminho_csv, *entrada.colunas, entrada.grafo.dirigido, diretorio_cache=None)
+
+
+def _caso_pontes(entrada):
+    from analise_grafos import encontrar_pontes
+
+    return encontrar_pontes(entrada.grafo)
+
+
+def _caso_componentes(entrada):
+    return entrada.grafo.componentes_conexos()
+
+
+def _caso_componentes_networkx(entrada):
+    import networkx as nx
+
+    grafo = entrada.grafo_networkx
+    if grafo.is_directed():
+        return [len(c) for c in nx.weakly_connected_components(grafo)]
+    return [len(c) for c in nx.connected_components(grafo)]
+
+
+def _caso_componentes_fortes(entrada):
+    from componentes import componentes_fortes
+
+    return componentes_fortes(entrada.grafo)
+
+
+def _caso_componentes_fortes_networkx(entrada):
+    import networkx as nx
+
+    grafo = entrada.grafo_networkx
+    if grafo.is_directed():
+        return [len(c) for c in nx.strongly_connected_components(grafo)]
+    return [len(c) for c in nx.connected_components(grafo)]
+
+
+def _caso_graus(entrada):
+    from graus import estatisticas_graus_grafo
+
+    return estatisticas_graus_grafo(entrada.grafo)
+
+
+def _caso_distancias_amostragem(entrada):
+    from distancias import distribuicao_distancias_amostrada
+
+    return distribuicao_distancias_amostrada(entrada.grafo, amostras=50)
+
+
+def _caso_distancias_hyperanf(entrada):
+    from distancias import distribuicao_distancias_hyperanf
+
+    return distribuicao_distancias_hyperanf(entrada.grafo)
+
+
+def _caso_distancias_exata(entrada):
+    from distancias import distribuicao_distancias_exata
+
+    return distribuicao_distancias_exata(entrada.grafo)
+
+
+def _caso_excentricidades(entrada):
+    from excentricidades import extremos_distancias
+
+    return extremos_distancias(entrada.grafo, limite_bfs=100)
+
+
+def _caso_pagerank(entrada):
+    from centralidade import pagerank
+
+    return pagerank(entrada.grafo)
+
+
+def _caso_intermediacao(entrada):
+    from centralidade import intermediacao_amostrada
+
+    return intermediacao_amostrada(entrada.grafo, amostras=50)
+
+
+def _caso_triangulos(entrada):
+    from triangulos import contar_triangulos
+
+    return contar_triangulos(entrada.grafo)
+
+
+def _caso_triangulos_networkx(entrada):
+    import networkx as nx
+
+    return nx.triangles(nx.Graph(entrada.grafo_networkx))
+
+
+# Casos de benchmark: nome -> (função, maior número de nós em que o caso roda, idem para grafos de diâmetro longo)
+# None = sem limite. As BFS por níveis custam uma passada por nível, então caminhos longos têm limite próprio.
+# Os casos de distância correspondem ao cálculo feito por grafico_distancia_pares (sem o gráfico)
+CASOS = {
+    "carregar_grafo_de_arestas": (_caso_carregar_networkx, 200_000, 200_000),
+    "carregar_grafo_compacto": (_caso_carregar_compacto, None, None),
+    "encontrar_pontes": (_caso_pontes, None, None),
+    "componentes_conexos": (_caso_componentes, None, None),
+    "componentes_networkx": (_caso_componentes_networkx, 200_000, 200_000),
+    "componentes_fortes": (_caso_componentes_fortes, None, None),
+    "componentes_fortes_networkx": (_caso_componentes_fortes_networkx, 200_000, 200_000),
+    "estatisticas_graus": (_caso_graus, None, None),
+    "distancias_amostragem": (_caso_distancias_amostragem, None, 10_000),
+    "distancias_hyperanf": (_caso_distancias_hyperanf, 200_000, 1_000),
+    "distancias_exata": (_caso_distancias_exata, 30_000, 1_000),
+    "excentricidades": (_caso_excentricidades, None, 10_000),
+    "pagerank": (_caso_pagerank, None, None),
+    "intermediacao_amostrada": (_caso_intermediacao, None, 10_000),
+    "triangulos": (_caso_triangulos, None, None),
+    "triangulos_networkx": (_caso_triangulos_networkx, 200_000, 200_000),
+}
+
+
+# Função para medir tempo e pico de memória de uma chamada
+def medir(funcao, *argumentos, repeticoes=3):
+    """
+    Roda `funcao` `repeticoes` vezes sem instrumentação (tempo de parede: mediana e mínimo) e uma vez
+    com tracemalloc (pico de memória alocada pelo Python e pelo NumPy durante a chamada).
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    try:
+        funcao(*argumentos)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "segundos": statistics.median(tempos),
+        "segundos_min": min(tempos),
+        "repeticoes": repeticoes,
+        "pico_memoria_bytes": int(pico),
+    }
+
+
+# Função para montar as entradas: grafos sintéticos de tamanho crescente e datasets reais
+def entradas_benchmark(geradores=tuple(GERADORES), tamanhos=TAMANHOS_PADRAO, reais=(), semente=42):
+    """Gera (sob demanda) cada EntradaBenchmark; os reais vêm da configuração de analise_grafos (redes.json)."""
+    for gerador in geradores:
+        for n in tamanhos:
+            yield EntradaBenchmark(f"{gerador}_{n}", GERADORES[gerador](n, semente=semente),
+                                   diametro_longo=gerador in _GERADORES_DIAMETRO_LONGO)
+    if reais:
+        from analise_grafos import carregar_grafo_rede, configuracao_redes
+
+        for rede in reais:
+            dados = configuracao_redes()[rede]
+            if dados["formato"] == "csv":
+                grafo = carregar_grafo_compacto(dados["caminho"], dados["coluna_origem"], dados["coluna_destino"],
+                                                dados["dirigido"], memoria_maxima=dados.get("memoria_maxima"))
+                yield EntradaBenchmark(rede, grafo, dados["caminho"], (dados["coluna_origem"], dados["coluna_destino"]))
+            else:
+                grafo, grafo_networkx = carregar_grafo_rede(rede)
+                entrada = EntradaBenchmark(rede, grafo)
+                entrada._grafo_networkx = grafo_networkx
+                yield entrada
+
+
+# Função para rodar o benchmark e devolver as medições
+def rodar_benchmark(casos=tuple(CASOS), entradas=None, repeticoes=3, verbose=True):
+    """Mede cada caso em cada entrada (respeitando o limite de tamanho do caso) e retorna a lista de medições."""
+    # Importa as bibliotecas pesadas antes de medir: o custo de importação não entra no primeiro caso
+    import analise_grafos  # noqa: F401
+    import networkx  # noqa: F401
+    import pandas  # noqa: F401
+
+    maquina = identificar_maquina()
+    medicoes = []
+    for entrada in entradas if entradas is not None else entradas_benchmark():
+        n, m = entrada.grafo.number_of_nodes(), entrada.grafo.number_of_edges()
+        try:
+            for caso in casos:
+                funcao, limite, limite_diametro_longo = CASOS[caso]
+                if entrada.diametro_longo:
+                    limite = limite_diametro_longo
+                if (limite is not None and n > limite) or (caso in _CASOS_NAO_DIRIGIDOS and entrada.grafo.dirigido):
+                    continue
+                # Preparação (CSV temporário, grafo networkx) fica fora da medição
+                if caso in ("carregar_grafo_de_arestas", "carregar_grafo_compacto"):
+                    entrada.caminho_csv
+                elif caso in ("componentes_networkx", "componentes_fortes_networkx"):
+                    entrada.grafo_networkx
+                medicao = medir(funcao, entrada, repeticoes=repeticoes)
+                medicao.update(caso=caso, grafo=entrada.nome, nos=n, arestas=m, **maquina)
+                medicoes.append(medicao)
+                if verbose:
+                    print(f"{caso:<26} {entrada.nome:<24} {n:>9,} nós {m:>10,} arestas "
+                          f"{medicao['segundos']:>9.3f} s {medicao['pico_memoria_bytes'] / 2 ** 20:>9.1f} MB")
+        finally:
+            entrada.limpar()
+    return medicoes
+
+
+# Função para identificar a máquina e a versão do código (medições só se comparam na mesma máquina)
+def identificar_maquina():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "maquina": f"{platform.node()}|{platform.machine()}|{os.cpu_count()}",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+# Função para ler o histórico de medições
+def ler_historico(caminho=HISTORICO_PADRAO):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+# Função para acrescentar medições ao histórico (JSON Lines: uma medição por linha)
+def gravar_historico(medicoes, caminho=HISTORICO_PADRAO):
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "a", encoding="utf-8") as f:
+        for medicao in medicoes:
+            f.write(json.dumps(medicao, ensure_ascii=False) + "\n")
+
+
+# Função para comparar medições novas com o histórico e apontar regressões
+def detectar_regressoes(medicoes, historico, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Para cada medição, a referência é a mediana das últimas _MEDICOES_REFERENCIA medições do mesmo
+    caso e grafo na mesma máquina. É regressão se o tempo passou de referência * (1 + tolerancia)
+    e a diferença absoluta é maior que _PISO_REGRESSAO segundos.
+    """
+    anteriores = {}
+    for registro in historico:
+        anteriores.setdefault((registro["caso"], registro["grafo"], registro["maquina"]), []).append(registro)
+    regressoes = []
+    for medicao in medicoes:
+        registros = anteriores.get((medicao["caso"], medicao["grafo"], medicao["maquina"]), [])
+        if not registros:
+            continue
+        referencia = statistics.median(r["segundos"] for r in registros[-_MEDICOES_REFERENCIA:])
+        if medicao["segundos"] > referencia * (1 + tolerancia) and medicao["segundos"] - referencia > _PISO_REGRESSAO:
+            regressoes.append({
+                "caso": medicao["caso"],
+                "grafo": medicao["grafo"],
+                "referencia_segundos": referencia,
+                "segundos": medicao["segundos"],
+                "razao": medicao["segundos"] / referencia,
+            })
+    return regressoes
+
+
+# Comandos: python benchmark.py [--casos ...] [--geradores ...] [--tamanhos ...] [--reais ...]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark das funções de análise em grafos reais e sintéticos.")
+    parser.add_argument("--casos", default=",".join(CASOS), help=f"Casos (padrão: todos: {','.join(CASOS)}).")
+    parser.add_argument("--geradores", default=",".join(GERADORES),
+                        help=f"Grafos sintéticos (padrão: {','.join(GERADORES)}); vazio para nenhum.")
+    parser.add_argument("--tamanhos", default=",".join(str(n) for n in TAMANHOS_PADRAO),
+                        help="Números de nós dos grafos sintéticos.")
+    parser.add_argument("--reais", default="", help="Datasets reais (ex.: deezer,lastfm,facebook,scientometrics).")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--historico", default=HISTORICO_PADRAO, help="Arquivo JSON Lines com o histórico.")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="Fração de lentidão aceita antes de acusar regressão (0.2 = 20%%).")
+    parser.add_argument("--nao-gravar", action="store_true", help="Não acrescenta as medições ao histórico.")
+    argumentos = parser.parse_args()
+
+    casos = [caso for caso in argumentos.casos.split(",") if caso]
+    geradores = [gerador for gerador in argumentos.geradores.split(",") if gerador]
+    reais = [rede for rede in argumentos.reais.split(",") if rede]
+    for nome, escolhidos, validos in (("caso", casos, CASOS), ("gerador", geradores, GERADORES)):
+        desconhecidos = [valor for valor in escolhidos if valor not in validos]
+        if desconhecidos:
+            parser.error(f"{nome} desconhecido: {', '.join(desconhecidos)}")
+
+    medicoes = rodar_benchmark(
+        casos,
+        entradas_benchmark(geradores, [int(n) for n in argumentos.tamanhos.split(",") if n], reais),
+        repeticoes=argumentos.repeticoes,
+    )
+    regressoes = detectar_regressoes(medicoes, ler_historico(argumentos.historico), argumentos.tolerancia)
+    if not argumentos.nao_gravar:
+        gravar_historico(medicoes, argumentos.historico)
+        print(f"{len(medicoes)} medição(ões) gravada(s) em {argumentos.historico}")
+    for regressao in regressoes:
+        print(f"REGRESSÃO: {regressao['caso']} em {regressao['grafo']}: {regressao['segundos']:.3f} s "
+              f"(referência {regressao['referencia_segundos']:.3f} s, {regressao['razao']:.2f}x)")
+    sys.exit(1 if regressoes else 0)
@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+
+# Diretório padrão do cache de resultados entre execuções
+DIRETORIO_RESULTADOS = ".cache_resultados"
+
+# Arquivo (dentro do diretório do cache) que guarda o hash de conteúdo já calculado de cada entrada
+_INDICE_ARQUIVOS = "arquivos.json"
+
+
+class CacheResultados:
+    """
+    Cache de métricas em disco, endereçado por conteúdo.
+    A chave de cada valor é o hash de: conteúdo do arquivo de entrada + opções do grafo
+    (ex.: dirigido) + nome e versão da métrica + opções da métrica. Mudar qualquer um deles
+    gera outra chave, então só o que mudou é recalculado.
+    Cada entrada são dois arquivos: <chave>.pkl (valor) e <chave>.json (metadados, para listar).
+    """
+
+    def __init__(self, diretorio=DIRETORIO_RESULTADOS):
+        self.diretorio = diretorio
+
+    def chave_entrada(self, caminho_arquivo, **opcoes_grafo):
+        """Identificador do grafo: hash do conteúdo do arquivo de entrada mais as opções de carga."""
+        conteudo = self._hash_conteudo(caminho_arquivo)
+        return _resumo({"conteudo": conteudo, "opcoes": opcoes_grafo})
+
+    def chave(self, chave_grafo, metrica, versao, opcoes=None):
+        return _resumo({"grafo": chave_grafo, "metrica": metrica, "versao": versao, "opcoes": opcoes or {}})
+
+    def obter(self, chave):
+        """Retorna (True, valor) se a chave está no cache, senão (False, None)."""
+        caminho = os.path.join(self.diretorio, f"{chave}.pkl")
+        if not os.path.exists(caminho):
+            return False, None
+        try:
+            with open(caminho, "rb") as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Entrada corrompida (ex.: execução interrompida): trata como ausente
+            return False, None
+
+    def contem(self, chave):
+        """Há valor guardado para a chave? (sem ler o arquivo)"""
+        return os.path.exists(os.path.join(self.diretorio, f"{chave}.pkl"))
+
+    def guardar(self, chave, valor, **metadados):
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = os.path.join(self.diretorio, f"{chave}.pkl")
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+        metadados.update(chave=chave, criado_em=time.time(), bytes=os.path.getsize(caminho))
+        with open(os.path.join(self.diretorio, f"{chave}.json"), "w", encoding="utf-8") as f:
+            json.dump(metadados, f, ensure_ascii=False, default=str)
+
+    def listar(self):
+        """Metadados de todas as entradas do cache, das mais novas para as mais antigas."""
+        if not os.path.isdir(self.diretorio):
+            return []
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if not nome.endswith(".json") or nome == _INDICE_ARQUIVOS:
+                continue
+            try:
+                with open(os.path.join(self.diretorio, nome), encoding="utf-8") as f:
+                    entradas.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(entradas, key=lambda entrada: entrada.get("criado_em", 0), reverse=True)
+
+    def remover(self, metrica=None, arquivo=None, dias=None):
+        """
+        Remove entradas do cache. Sem filtros remove tudo; com filtros remove só as entradas
+        da métrica, do arquivo de entrada, e/ou mais antigas que `dias`. Retorna quantas removeu.
+        """
+        limite = time.time() - dias * 86400 if dias is not None else None
+        removidas = 0
+        for entrada in self.listar():
+            if metrica is not None and entrada.get("metrica") != metrica:
+                continue
+            if arquivo is not None and os.path.abspath(entrada.get("arquivo", "")) != os.path.abspath(arquivo):
+                continue
+            if limite is not None and entrada.get("criado_em", 0) >= limite:
+                continue
+            for extensao in (".pkl", ".json"):
+                caminho = os.path.join(self.diretorio, f"{entrada['chave']}{extensao}")
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+            removidas += 1
+        return removidas
+
+    def _hash_conteudo(self, caminho_arquivo):
+        """SHA-256 do conteúdo; reaproveitado enquanto caminho, tamanho e data do arquivo não mudam."""
+        estado = os.stat(caminho_arquivo)
+        identificacao = f"{os.path.abspath(caminho_arquivo)}|{estado.st_size}|{estado.st_mtime_ns}"
+        caminho_indice = os.path.join(self.diretorio, _INDICE_ARQUIVOS)
+        indice = _ler_indice(caminho_indice)
+        if identificacao in indice:
+            return indice[identificacao]
+
+        resumo = hashlib.sha256()
+        with open(caminho_arquivo, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                resumo.update(bloco)
+        # Relê o índice logo antes de gravar (outro processo pode ter acrescentado entradas) e o
+        # substitui de uma vez, como em guardar: quem lê nunca vê o arquivo pela metade
+        indice = _ler_indice(caminho_indice)
+        indice[identificacao] = resumo.hexdigest()
+        os.makedirs(self.diretorio, exist_ok=True)
+        temporario = f"{caminho_indice}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(indice, f)
+        os.replace(temporario, caminho_indice)
+        return indice[identificacao]
+
+
+def _ler_indice(caminho_indice):
+    """Índice de hashes de conteúdo ({} se ainda não existe ou não pode ser lido)."""
+    if not os.path.exists(caminho_indice):
+        return {}
+    try:
+        with open(caminho_indice, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _resumo(dados):
+    return hashlib.sha256(json.dumps(dados, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# Comandos para inspecionar e limpar o cache: python cache_resultados.py listar | remover
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspeciona e limpa o cache de resultados das métricas.")
+    parser.add_argument("--diretorio", default=DIRETORIO_RESULTADOS)
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("listar", help="Lista as métricas guardadas no cache.")
+    remover = subcomandos.add_parser("remover", help="Remove entradas (sem filtros, remove tudo).")
+    remover.add_argument("--metrica", help="Remove só as entradas desta métrica.")
+    remover.add_argument("--arquivo", help="Remove só as entradas calculadas a partir deste arquivo.")
+    remover.add_argument("--dias", type=float, help="Remove só as entradas mais antigas que este número de dias.")
+    argumentos = parser.parse_args()
+
+    cache = CacheResultados(argumentos.diretorio)
+    if argumentos.comando == "listar":
+        entradas = cache.listar()
+        for entrada in entradas:
+            criado_em = time.strftime("%Y-%m-%d %H:%M", time.localtime(entrada.get("criado_em", 0)))
+            print(f"{entrada['chave'][:12]}  {criado_em}  {entrada.get('bytes', 0):>12,} B  "
+                  f"{entrada.get('metrica')} v{entrada.get('versao')}  {entrada.get('arquivo')}")
+        print(f"{len(entradas)} entrada(s), {sum(e.get('bytes', 0) for e in entradas):,} bytes.")
+    else:
+        removidas = cache.remover(argumentos.metrica, argumentos.arquivo, argumentos.dias)
+        print(f"{removidas} entrada(s) removida(s).")
@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+
+from grafo_compacto import GrafoCompacto, expandir_fronteira, grafo_compacto_de_networkx
+
+
+# Função para selecionar os k maiores valores sem ordenar o array inteiro
+def maiores(valores, k=5):
+    """Índices dos k maiores valores, do maior para o menor (argpartition: O(n) + O(k log k))."""
+    valores = np.asarray(valores)
+    k = min(k, len(valores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidatos = np.argpartition(-valores, k - 1)[:k]
+    # Empates entre os selecionados: menor índice primeiro
+    return candidatos[np.lexsort((candidatos, -valores[candidatos]))]
+
+
+# Função para listar os k nós com maior valor de uma centralidade, com os rótulos originais
+def ranking(grafo, valores, k=5):
+    """[(rótulo, valor), ...] dos k maiores valores; `valores` segue a ordem dos nós do grafo compacto."""
+    rotulos = np.asarray(grafo.rotulos)
+    valores = np.asarray(valores)
+    return [(rotulos[i].item(), valores[i].item()) for i in maiores(valores, k)]
+
+
+# Função para calcular o PageRank por iteração de potência vetorizada sobre o CSR
+def pagerank(grafo, amortecimento=0.85, tolerancia=1e-6, max_iteracoes=100):
+    """
+    PageRank com teleporte uniforme; nós sem arestas de saída redistribuem o seu peso para todos
+    (mesma convenção e mesmo critério de parada do nx.pagerank). Cada iteração é um produto
+    matriz-vetor esparso feito com np.bincount sobre os arrays de arestas: O(m), sem laço por nó.
+    Retorna {"valores", "iteracoes", "convergiu"}.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    n = grafo.number_of_nodes()
+    origens, destinos = _arestas(grafo)
+    saida = grafo.graus_saida().astype(np.float64)
+    sem_saida = saida == 0
+    inverso_saida = np.divide(1.0, saida, out=np.zeros(n), where=~sem_saida)
+    valores = np.full(n, 1.0 / n)
+    for iteracao in range(1, max_iteracoes + 1):
+        anterior = valores
+        recebido = np.bincount(destinos, weights=(anterior * inverso_saida)[origens], minlength=n)
+        valores = amortecimento * (recebido + anterior[sem_saida].sum() / n) + (1 - amortecimento) / n
+        if np.abs(valores - anterior).sum() < n * tolerancia:
+            return {"valores": valores, "iteracoes": iteracao, "convergiu": True}
+    return {"valores": valores, "iteracoes": max_iteracoes, "convergiu": False}
+
+
+# Função para calcular hubs e autoridades (HITS) por iteração de potência vetorizada
+def hits(grafo, tolerancia=1e-8, max_iteracoes=100):
+    """
+    Autoridade de v: soma dos hubs que apontam para v; hub de u: soma das autoridades para onde
+    u aponta. Os dois produtos esparsos por iteração usam np.bincount sobre os arrays de arestas.
+    Valores normalizados para somar 1, como no nx.hits. Retorna {"hubs", "autoridades", "iteracoes", "convergiu"}.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    n = grafo.number_of_nodes()
+    origens, destinos = _arestas(grafo)
+    hubs = np.full(n, 1.0 / n)
+    autoridades = hubs
+    convergiu = False
+    for iteracao in range(1, max_iteracoes + 1):
+        anterior = hubs
+        autoridades = np.bincount(destinos, weights=hubs[origens], minlength=n)
+        autoridades /= autoridades.sum() or 1.0
+        hubs = np.bincount(origens, weights=autoridades[destinos], minlength=n)
+        hubs /= hubs.sum() or 1.0
+        if np.abs(hubs - anterior).sum() < n * tolerancia:
+            convergiu = True
+            break
+    return {"hubs": hubs, "autoridades": autoridades, "iteracoes": iteracao, "convergiu": convergiu}
+
+
+# Função para estimar a centralidade de intermediação com Brandes a partir de fontes sorteadas
+def intermediacao_amostrada(grafo, amostras=200, semente=42, tempo_maximo=None):
+    """
+    Intermediação (betweenness) normalizada como no nx.betweenness_centrality(k=amostras): Brandes
+    a partir de `amostras` fontes sorteadas, com a contagem de caminhos mínimos e o acúmulo das
+    dependências feitos por nível da BFS (vetorizados). O resultado escala a soma das dependências
+    por n / k. Com todas as fontes o valor é exato.
+    Retorna também o erro padrão de cada nó (variância amostral das dependências, com correção de
+    população finita). Não há limite uniforme para todos os nós: o de Hoeffding com união sobre os
+    n nós não depende dos dados e fica ordens de grandeza acima dos valores normalizados.
+    `tempo_maximo` (segundos) pode parar a amostragem antes; o resultado usa as fontes já processadas.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    n = grafo.number_of_nodes()
+    fontes = np.random.default_rng(semente).choice(n, size=min(amostras, n), replace=False)
+    soma = np.zeros(n)
+    soma_quadrados = np.zeros(n)
+    inicio = time.perf_counter()
+    k = 0
+    for origem in fontes:
+        dependencias = _dependencias_brandes(grafo.indptr, grafo.indices, int(origem))
+        soma += dependencias
+        soma_quadrados += dependencias ** 2
+        k += 1
+        if tempo_maximo is not None and time.perf_counter() - inicio > tempo_maximo:
+            break
+
+    escala = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 0.0
+    media = soma / max(k, 1)
+    if 1 < k < n:
+        variancia = np.maximum(soma_quadrados - k * media ** 2, 0) / (k - 1)
+        erro_padrao = escala * n * np.sqrt(variancia / k * (1 - k / n))
+    else:
+        erro_padrao = np.zeros(n) if k == n else np.full(n, np.nan)
+    return {
+        "valores": escala * n * media,
+        "erro_padrao": erro_padrao,
+        "fontes": k,
+        "exato": k == n,
+    }
+
+
+def _dependencias_brandes(indptr, indices, origem):
+    """
+    Dependências de `origem` em todos os nós (Brandes): BFS por níveis contando os caminhos mínimos
+    (sigma) e guardando as arestas entre níveis consecutivos; depois, do nível mais fundo para o
+    mais raso, delta[v] += sigma[v] / sigma[w] * (1 + delta[w]) para cada aresta v -> w do DAG.
+    """
+    n = len(indptr) - 1
+    distancia = np.full(n, -1, dtype=np.int32)
+    sigma = np.zeros(n)
+    distancia[origem] = 0
+    sigma[origem] = 1.0
+    fronteira = np.array([origem], dtype=np.int64)
+    arestas_por_nivel = []
+    nivel = 0
+    while len(fronteira):
+        quantidades = np.asarray(indptr)[fronteira + 1].astype(np.int64) - np.asarray(indptr)[fronteira]
+        u = np.repeat(fronteira, quantidades)
+        v = expandir_fronteira(indptr, indices, fronteira)
+        novos = np.unique(v[distancia[v] == -1])
+        distancia[novos] = nivel + 1
+        no_proximo_nivel = distancia[v] == nivel + 1
+        u, v = u[no_proximo_nivel], v[no_proximo_nivel]
+        np.add.at(sigma, v, sigma[u])
+        arestas_por_nivel.append((u, v))
+        fronteira = novos
+        nivel += 1
+
+    delta = np.zeros(n)
+    for u, v in reversed(arestas_por_nivel):
+        np.add.at(delta, u, sigma[u] / sigma[v] * (1 + delta[v]))
+    delta[origem] = 0.0
+    return delta
+
+
+def _arestas(grafo):
+    """Arrays (origem, destino) de todas as arestas do CSR de saída."""
+    n = grafo.number_of_nodes()
+    return np.repeat(np.arange(n, dtype=np.int64), np.diff(grafo.indptr)), np.asarray(grafo.indices)
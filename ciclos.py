@@ -0,0 +1,177 @@
+import time
+from collections import Counter, defaultdict
+
+from componentes import componentes_fortes, componentes_fracos, nos_dos_componentes
+from grafo_compacto import GrafoCompacto, grafo_compacto_de_networkx
+
+
+# A cada quantos passos da busca o tempo e o limite de ciclos são verificados
+_PASSOS_ENTRE_VERIFICACOES = 10_000
+
+
+# Função para contar ciclos simples sem guardá-los, com limite de comprimento, tempo e quantidade
+def contar_ciclos(grafo, comprimento_maximo=None, tempo_maximo=None, limite=None, componentes=None):
+    """
+    Conta os ciclos simples de um grafo dirigido (networkx) sem montar a lista de ciclos.
+    A busca roda apenas dentro dos componentes fortemente conexos com mais de um nó
+    (laços contam como ciclos de comprimento 1). Sem `comprimento_maximo` usa o algoritmo de
+    Johnson (iterativo); com ele, uma DFS limitada em profundidade conta só ciclos de até esse tamanho.
+    `tempo_maximo` (segundos) e `limite` (quantidade) interrompem a busca: o resultado fica
+    marcado como parcial ("completo": False) e a contagem é um limite inferior.
+    `componentes` (opcional): nós de cada componente fortemente conexo com mais de um nó, já
+    calculados (ex.: pela métrica "componentes_fortes"); sem ela, são calculados aqui.
+    """
+    import networkx as nx
+
+    inicio = time.perf_counter()
+    por_comprimento = Counter()
+    estado = {"passos": 0, "total": 0, "motivo": None}
+
+    def continuar():
+        estado["passos"] += 1
+        if estado["passos"] % _PASSOS_ENTRE_VERIFICACOES:
+            return True
+        if tempo_maximo is not None and time.perf_counter() - inicio > tempo_maximo:
+            estado["motivo"] = "tempo_maximo"
+        return estado["motivo"] is None
+
+    def registrar(comprimento):
+        por_comprimento[comprimento] += 1
+        estado["total"] += 1
+        if limite is not None and estado["total"] >= limite:
+            estado["motivo"] = "limite"
+
+    lacos = nx.number_of_selfloops(grafo)
+    for _ in range(lacos):
+        if estado["motivo"] is None:
+            registrar(1)
+
+    if componentes is None:
+        componentes = []
+        if grafo.number_of_edges():
+            compacto = grafo_compacto_de_networkx(grafo)
+            componentes = nos_dos_componentes(compacto, componentes_fortes(compacto)["rotulos"])
+    for componente in componentes:
+        if estado["motivo"] is not None:
+            break
+        # Índices locais: cada ciclo é contado uma vez, a partir do seu menor vértice
+        ordem = {no: i for i, no in enumerate(componente)}
+        adjacencia = [[] for _ in ordem]
+        for no, i in ordem.items():
+            adjacencia[i] = [ordem[v] for v in grafo.successors(no) if v in ordem and v != no]
+        for origem in range(len(adjacencia)):
+            if estado["motivo"] is not None:
+                break
+            if comprimento_maximo is None:
+                _johnson(adjacencia, origem, registrar, continuar, estado)
+            else:
+                _dfs_limitada(adjacencia, origem, comprimento_maximo, registrar, continuar, estado)
+
+    return {
+        "ciclos": estado["total"],
+        "por_comprimento": dict(sorted(por_comprimento.items())),
+        "completo": estado["motivo"] is None,
+        "motivo_interrupcao": estado["motivo"],
+        "comprimento_maximo": comprimento_maximo,
+        "componentes_com_ciclos": len(componentes),
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+# Função para verificar rapidamente se o grafo é acíclico
+def e_aciclico(grafo):
+    """True se o grafo dirigido não tem ciclos (DAG). Custo O(n + m)."""
+    import networkx as nx
+
+    return nx.is_directed_acyclic_graph(grafo)
+
+
+# Função para calcular o posto de ciclos (número ciclomático)
+def posto_ciclos(grafo, componentes=None):
+    """
+    Número ciclomático m - n + c (c = componentes fracamente conexos): quantidade de ciclos
+    independentes do grafo visto como não direcionado. Custo O(n + m).
+    `componentes` (opcional) é o número de componentes fracamente conexos, se já calculado.
+    """
+    if componentes is None:
+        if not isinstance(grafo, GrafoCompacto):
+            if grafo.number_of_edges() == 0:
+                return 0
+            # Nós isolados somam 1 a n e 1 a c: o posto é o mesmo no grafo compacto, que não os tem
+            grafo = grafo_compacto_de_networkx(grafo)
+        componentes = len(componentes_fracos(grafo)["tamanhos"])
+    return grafo.number_of_edges() - grafo.number_of_nodes() + componentes
+
+
+def _johnson(adjacencia, origem, registrar, continuar, estado):
+    """Circuitos elementares que começam em `origem` usando só vértices >= origem (Johnson, com pilha explícita)."""
+    bloqueados = {origem}
+    dependentes = defaultdict(set)
+    pilha = [(origem, iter(adjacencia[origem]))]
+    fechou = [False]
+    while pilha:
+        if not continuar():
+            return
+        v, vizinhos = pilha[-1]
+        avancou = False
+        for w in vizinhos:
+            if w < origem:
+                continue
+            if w == origem:
+                registrar(len(pilha))
+                fechou[-1] = True
+                if estado["motivo"] is not None:
+                    return
+            elif w not in bloqueados:
+                bloqueados.add(w)
+                pilha.append((w, iter(adjacencia[w])))
+                fechou.append(False)
+                avancou = True
+                break
+        if avancou:
+            continue
+
+        pilha.pop()
+        encontrou = fechou.pop()
+        if encontrou:
+            _desbloquear(v, bloqueados, dependentes)
+        else:
+            for w in adjacencia[v]:
+                if w >= origem:
+                    dependentes[w].add(v)
+        if fechou:
+            fechou[-1] = fechou[-1] or encontrou
+
+
+def _desbloquear(no, bloqueados, dependentes):
+    pendentes = [no]
+    while pendentes:
+        u = pendentes.pop()
+        if u in bloqueados:
+            bloqueados.discard(u)
+            pendentes.extend(dependentes[u])
+            dependentes[u].clear()
+
+
+def _dfs_limitada(adjacencia, origem, comprimento_maximo, registrar, continuar, estado):
+    """Ciclos que começam em `origem` (menor vértice do ciclo) com até comprimento_maximo arestas."""
+    no_caminho = {origem}
+    pilha = [(origem, iter(adjacencia[origem]))]
+    while pilha:
+        if not continuar():
+            return
+        _, vizinhos = pilha[-1]
+        avancou = False
+        for w in vizinhos:
+            if w == origem:
+                registrar(len(pilha))
+                if estado["motivo"] is not None:
+                    return
+            elif w > origem and w not in no_caminho and len(pilha) < comprimento_maximo:
+                no_caminho.add(w)
+                pilha.append((w, iter(adjacencia[w])))
+                avancou = True
+                break
+        if not avancou:
+            v, _ = pilha.pop()
+            no_caminho.discard(v)
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# Arrays compartilhados com as tarefas (no processo atual ou preenchido em cada processo trabalhador)
+ARRAYS_COMPARTILHADOS = {}
+
+
+# Função para rodar tarefas sobre arrays grandes em processos, sem copiar os arrays para cada um
+@contextmanager
+def pool_compartilhado(arrays, processos):
+    """
+    Uso: with pool_compartilhado({"indptr": ..., "indices": ...}, processos) as mapear:
+             for parcial in mapear(funcao_da_tarefa, tarefas): ...
+    As funções de tarefa leem os arrays de ARRAYS_COMPARTILHADOS. Com processos <= 1 as tarefas
+    rodam no processo atual (map comum, sem cópia); senão cada array vai para um bloco de memória
+    compartilhada, mapeado por cada trabalhador do ProcessPoolExecutor na inicialização, e os
+    blocos são liberados na saída. A memória fica linear no tamanho dos arrays, qualquer que seja
+    o número de processos.
+    """
+    if processos <= 1:
+        ARRAYS_COMPARTILHADOS.update(arrays)
+        try:
+            yield map
+        finally:
+            ARRAYS_COMPARTILHADOS.clear()
+        return
+
+    blocos = []
+    try:
+        descricao = {}
+        for nome, array in arrays.items():
+            bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocos.append(bloco)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)[:] = array
+            descricao[nome] = (bloco.name, array.shape, array.dtype.str)
+        with ProcessPoolExecutor(processos, initializer=_inicializar_trabalhador, initargs=(descricao,)) as executor:
+            yield executor.map
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+
+def _inicializar_trabalhador(descricao):
+    """Conecta o processo trabalhador aos blocos de memória compartilhada dos arrays."""
+    for nome, (nome_bloco, forma, dtype) in descricao.items():
+        bloco = shared_memory.SharedMemory(name=nome_bloco)
+        ARRAYS_COMPARTILHADOS[f"_bloco_{nome}"] = bloco  # mantém a referência viva
+        ARRAYS_COMPARTILHADOS[nome] = np.ndarray(forma, dtype=dtype, buffer=bloco.buf)
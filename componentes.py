@@ -0,0 +1,162 @@
+import numpy as np
+
+from grafo_compacto import GrafoCompacto, blocos_de_arestas, grafo_compacto_de_networkx
+
+
+# Função para calcular os componentes fracamente conexos (conexos, se não dirigido) com union-find vetorizado
+def componentes_fracos(grafo, arestas_por_bloco=None):
+    """
+    Componentes conexos (fracamente conexos em grafos dirigidos) de um GrafoCompacto (ou networkx).
+    Retorna {"rotulos": componente de cada nó, "tamanhos": tamanho de cada componente,
+    "histograma": {"tamanhos", "quantidades"}}; componentes numerados pelo menor nó, como numa BFS.
+    `arestas_por_bloco`: lê as arestas em blocos sequenciais (grafos mapeados maiores que a RAM).
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    rotulos, tamanhos = componentes_fracos_csr(grafo.indptr, grafo.indices, grafo.dirigido, arestas_por_bloco)
+    return {"rotulos": rotulos, "tamanhos": tamanhos, "histograma": histograma_tamanhos(tamanhos)}
+
+
+# Função para calcular os componentes fortemente conexos com Tarjan iterativo
+def componentes_fortes(grafo, arestas_por_bloco=None):
+    """
+    Componentes fortemente conexos de um GrafoCompacto (ou networkx), no mesmo formato de
+    componentes_fracos. Em grafos não dirigidos são os próprios componentes conexos (e
+    `arestas_por_bloco` vale como em componentes_fracos); nos dirigidos o Tarjan lê o CSR inteiro.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    if not grafo.dirigido:
+        return componentes_fracos(grafo, arestas_por_bloco)
+    rotulos, tamanhos = componentes_fortes_csr(grafo.indptr, grafo.indices)
+    return {"rotulos": rotulos, "tamanhos": tamanhos, "histograma": histograma_tamanhos(tamanhos)}
+
+
+# Função para agrupar os nós (rótulos originais) de cada componente com pelo menos `tamanho_minimo` nós
+def nos_dos_componentes(grafo, rotulos, tamanho_minimo=2):
+    """Lista de listas de rótulos de nós, uma por componente com pelo menos `tamanho_minimo` nós."""
+    tamanhos = np.bincount(rotulos) if len(rotulos) else np.empty(0, dtype=np.int64)
+    nos = np.flatnonzero(tamanhos[rotulos] >= tamanho_minimo)
+    if not len(nos):
+        return []
+    nos = nos[np.argsort(rotulos[nos], kind="stable")]
+    cortes = np.cumsum(tamanhos[tamanhos >= tamanho_minimo])[:-1]
+    return [grupo.tolist() for grupo in np.split(np.asarray(grafo.rotulos)[nos], cortes)]
+
+
+def componentes_fracos_csr(indptr, indices, dirigido=False, arestas_por_bloco=None):
+    """
+    Union-find vetorizado direto dos arrays de arestas: a cada rodada, a raiz maior de cada aresta
+    que ainda liga componentes diferentes é ligada à menor (np.minimum.at) e os caminhos são
+    comprimidos com pai = pai[pai] até estabilizar. Só as arestas que ainda cruzam componentes
+    seguem para a rodada seguinte. A raiz de cada componente termina sendo o seu menor nó.
+    Com `arestas_por_bloco`, as arestas entram em blocos lidos em ordem do CSR (blocos_de_arestas)
+    e só `pai` (um inteiro por nó) fica inteiro em memória; sem ele, tudo num bloco só.
+    Retorna (rótulo do componente de cada nó, tamanho de cada componente).
+    """
+    n = len(indptr) - 1
+    pai = np.arange(n, dtype=np.int64)
+    for u, v in blocos_de_arestas(indptr, indices, arestas_por_bloco or max(len(indices), 1)):
+        # Em grafos não dirigidos cada aresta aparece nos dois sentidos: basta uma cópia
+        manter = u != v if dirigido else u < v
+        pai = unir_arestas(pai, u[manter], v[manter])
+    return numerar_componentes(pai)
+
+
+def unir_arestas(pai, u, v):
+    """
+    Une no union-find `pai` (comprimido: cada nó aponta para a raiz) os extremos das arestas (u, v),
+    em rodadas vetorizadas; retorna `pai` comprimido de novo.
+    """
+    while len(u):
+        raiz_u, raiz_v = pai[u], pai[v]
+        cruzam = raiz_u != raiz_v
+        u, v = raiz_u[cruzam], raiz_v[cruzam]
+        if not len(u):
+            break
+        np.minimum.at(pai, np.maximum(u, v), np.minimum(u, v))
+        pai = comprimir_caminhos(pai)
+    return pai
+
+
+def componentes_fortes_csr(indptr, indices):
+    """
+    Tarjan iterativo (pilha explícita, sem recursão) sobre o CSR de saída, com o estado de cada nó
+    em listas indexadas pelo nó. Tempo O(n + m).
+    Retorna (rótulo do componente de cada nó, tamanho de cada componente), numerados pelo menor nó.
+    """
+    n = len(indptr) - 1
+    indptr = np.asarray(indptr).tolist()
+    indices = np.asarray(indices).tolist()
+    descoberta = [-1] * n
+    low = [0] * n
+    na_pilha = [False] * n
+    proxima = indptr[:-1]  # próxima posição de indices a visitar para cada nó
+    componente = [-1] * n
+    pilha_componente = []
+    tempo = 0
+    componentes = 0
+
+    for raiz in range(n):
+        if descoberta[raiz] != -1:
+            continue
+        descoberta[raiz] = low[raiz] = tempo
+        tempo += 1
+        pilha = [raiz]
+        pilha_componente.append(raiz)
+        na_pilha[raiz] = True
+        while pilha:
+            u = pilha[-1]
+            if proxima[u] < indptr[u + 1]:
+                v = indices[proxima[u]]
+                proxima[u] += 1
+                if descoberta[v] == -1:
+                    descoberta[v] = low[v] = tempo
+                    tempo += 1
+                    pilha.append(v)
+                    pilha_componente.append(v)
+                    na_pilha[v] = True
+                elif na_pilha[v] and descoberta[v] < low[u]:
+                    low[u] = descoberta[v]
+                continue
+
+            # Todos os sucessores de u visitados: propaga o low-link e fecha o componente se u é a raiz dele
+            pilha.pop()
+            if pilha and low[u] < low[pilha[-1]]:
+                low[pilha[-1]] = low[u]
+            if low[u] == descoberta[u]:
+                while True:
+                    w = pilha_componente.pop()
+                    na_pilha[w] = False
+                    componente[w] = componentes
+                    if w == u:
+                        break
+                componentes += 1
+
+    # Tarjan fecha os componentes em ordem topológica reversa; renumera pelo menor nó
+    return numerar_componentes(np.array(componente, dtype=np.int64))
+
+
+def numerar_componentes(raizes):
+    """Raiz (ou rótulo qualquer) do componente de cada nó -> (rótulos numerados pelo menor nó, tamanhos)."""
+    _, primeiros, inverso = np.unique(raizes, return_index=True, return_inverse=True)
+    posicao = np.empty(len(primeiros), dtype=np.int64)
+    posicao[np.argsort(primeiros)] = np.arange(len(primeiros))
+    rotulos = posicao[inverso].reshape(-1).astype(np.int32)
+    return rotulos, np.bincount(rotulos, minlength=len(primeiros)).astype(np.int64)
+
+
+def histograma_tamanhos(tamanhos):
+    """Tamanhos distintos de componente (crescentes) e quantos componentes têm cada tamanho."""
+    valores, quantidades = np.unique(np.asarray(tamanhos, dtype=np.int64), return_counts=True)
+    return {"tamanhos": valores, "quantidades": quantidades.astype(np.int64)}
+
+
+# Função para apontar cada nó de uma floresta union-find direto para a raiz
+def comprimir_caminhos(pai):
+    """Compressão de caminho vetorizada: cada nó passa a apontar direto para a raiz."""
+    while True:
+        avo = pai[pai]
+        if np.array_equal(avo, pai):
+            return pai
+        pai = avo
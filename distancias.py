@@ -0,0 +1,312 @@
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from compartilhado import ARRAYS_COMPARTILHADOS, pool_compartilhado
+from grafo_compacto import bfs_csr
+
+
+# Constante da HyperLogLog para o erro relativo padrão de um contador com m registros
+_ERRO_HLL = 1.04
+
+# Grupos de registros do jackknife da HyperANF: cada réplica descarta um grupo de registros de todos
+# os contadores e reestima a curva N(t) e a distância média com os registros restantes
+GRUPOS_JACKKNIFE = 8
+
+
+# Quantidade de palavras de 64 bits por vértice na BFS em lote (64 fontes por palavra)
+PALAVRAS_POR_LOTE = 4
+
+
+# Função para calcular a distribuição exata das distâncias em paralelo, guardando só o histograma
+def distribuicao_distancias_exata(grafo, processos=None, palavras_por_lote=PALAVRAS_POR_LOTE):
+    """
+    Distribuição exata das distâncias entre todos os pares (u != v, u alcança v), sem guardar
+    a distância de cada par: cada tarefa faz BFS simultânea de 64 * palavras_por_lote fontes
+    (um bit por fonte) e devolve apenas um histograma, que o processo principal soma.
+    A adjacência fica em memória compartilhada (compartilhado.pool_compartilhado); a memória é
+    linear no tamanho do grafo.
+    Com processos=1 tudo roda no processo atual.
+    """
+    n = grafo.number_of_nodes()
+    if grafo.dirigido:
+        # dist(s -> u) = nível em que algum predecessor de u foi alcançado: usa o CSR de entrada
+        indptr, indices = grafo.indptr_entrada, grafo.indices_entrada
+    else:
+        indptr, indices = grafo.indptr, grafo.indices
+    fontes_por_lote = 64 * palavras_por_lote
+    lotes = [(inicio, min(inicio + fontes_por_lote, n)) for inicio in range(0, n, fontes_por_lote)]
+    processos = processos or os.cpu_count() or 1
+
+    histograma = np.zeros(1, dtype=np.int64)
+    arrays = {"indptr": np.asarray(indptr, dtype=np.int64), "indices": np.asarray(indices)}
+    with pool_compartilhado(arrays, min(processos, len(lotes))) as mapear:
+        for parcial in mapear(_histograma_lote, lotes):
+            histograma = _somar_histogramas(histograma, parcial)
+
+    total_pares = int(histograma.sum())
+    media = float(np.dot(np.arange(len(histograma)), histograma) / total_pares) if total_pares else float("nan")
+    return {
+        "metodo": "exato",
+        "histograma": Counter({d: int(c) for d, c in enumerate(histograma) if c}),
+        "distancia_media": media,
+        "erro_padrao": 0.0,
+        "intervalo_95": (media, media),
+        "pares": total_pares,
+    }
+
+
+def _histograma_lote(lote):
+    """
+    BFS simultânea das fontes lote[0]..lote[1]-1, com um bit por fonte em cada vértice.
+    Em cada nível, a nova fronteira de u é o OU das fronteiras dos seus vizinhos (de entrada).
+    """
+    indptr = ARRAYS_COMPARTILHADOS["indptr"]
+    indices = ARRAYS_COMPARTILHADOS["indices"]
+    n = len(indptr) - 1
+    inicio, fim = lote
+    palavras = (fim - inicio + 63) // 64
+    fontes = np.arange(inicio, fim)
+    deslocamento = fontes - inicio
+
+    fronteira = np.zeros((n, palavras), dtype=np.uint64)
+    fronteira[fontes, deslocamento // 64] = np.uint64(1) << (deslocamento % 64).astype(np.uint64)
+    visitados = fronteira.copy()
+    com_vizinhos = np.flatnonzero(np.diff(indptr) > 0)
+    blocos = _blocos_por_arestas(indptr, com_vizinhos)
+
+    histograma = [0]
+    while True:
+        proxima = np.zeros_like(fronteira)
+        for bloco in blocos:
+            comeco, final = indptr[bloco[0]], indptr[bloco[-1] + 1]
+            proxima[bloco] = np.bitwise_or.reduceat(fronteira[indices[comeco:final]], indptr[bloco] - comeco, axis=0)
+        proxima &= ~visitados
+        alcancados = int(_contar_bits(proxima))
+        if alcancados == 0:
+            break
+        histograma.append(alcancados)
+        visitados |= proxima
+        fronteira = proxima
+    return np.array(histograma, dtype=np.int64)
+
+
+def _somar_histogramas(acumulado, parcial):
+    if len(parcial) > len(acumulado):
+        acumulado = np.pad(acumulado, (0, len(parcial) - len(acumulado)))
+    acumulado[:len(parcial)] += parcial
+    return acumulado
+
+
+def _contar_bits(palavras):
+    """Total de bits 1 num array de uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(palavras).sum(dtype=np.int64)
+    return np.unpackbits(palavras.view(np.uint8)).sum(dtype=np.int64)
+
+
+# Função para estimar a distribuição de distâncias com BFS a partir de k fontes aleatórias
+def distribuicao_distancias_amostrada(grafo, amostras=200, tempo_maximo=None, semente=42, amostrador=None):
+    """
+    Estima a distribuição das distâncias entre pares de vértices (u != v, u alcança v) rodando
+    BFS a partir de `amostras` fontes sorteadas. Cada BFS custa O(n + m), então o tempo total
+    é controlado por `amostras` e, opcionalmente, por `tempo_maximo` (segundos).
+    Com `amostrador` (nome em amostragem.AMOSTRADORES ou função), as fontes vêm desse amostrador
+    e cada uma pesa o inverso da sua probabilidade relativa de inclusão (estimador ponderado).
+    Retorna um dicionário com o histograma estimado (pares ordenados), a distância média,
+    o erro padrão da média e um intervalo de 95%.
+    """
+    n = grafo.number_of_nodes()
+    if amostrador is None:
+        gerador = np.random.default_rng(semente)
+        fontes = gerador.choice(n, size=min(amostras, n), replace=False)
+        pesos_fontes = np.ones(len(fontes))
+    else:
+        from amostragem import amostrar
+
+        amostra = amostrar(grafo, amostrador, amostras, semente=semente)
+        fontes, pesos_fontes = amostra["nos"], amostra["pesos"]
+
+    contagem = np.zeros(1, dtype=np.float64)
+    somas, quantidades = [], []
+    inicio = time.perf_counter()
+    for origem, peso in zip(fontes, pesos_fontes):
+        distancias = bfs_csr(grafo.indptr, grafo.indices, int(origem))
+        distancias = distancias[distancias > 0]
+        por_distancia = np.bincount(distancias)
+        if len(por_distancia) > len(contagem):
+            contagem = np.pad(contagem, (0, len(por_distancia) - len(contagem)))
+        contagem[:len(por_distancia)] += peso * por_distancia
+        somas.append(int(distancias.sum()))
+        quantidades.append(len(distancias))
+        if tempo_maximo is not None and time.perf_counter() - inicio > tempo_maximo:
+            break
+
+    k = len(somas)
+    pesos = np.asarray(pesos_fontes[:k], dtype=np.float64)
+    somas = np.array(somas, dtype=np.float64)
+    quantidades = np.array(quantidades, dtype=np.float64)
+    total_pares = (pesos * quantidades).sum()
+    media = (pesos * somas).sum() / total_pares if total_pares else float("nan")
+
+    # Estimador de razão: erro padrão pelo método delta, tratando cada fonte como uma amostra
+    if k > 1 and total_pares:
+        residuos = pesos * (somas - media * quantidades)
+        erro_padrao = float(np.sqrt(k / (k - 1) * np.sum(residuos ** 2)) / total_pares)
+    else:
+        erro_padrao = float("nan")
+
+    escala = n / pesos.sum() if k else 0.0
+    histograma = Counter({d: float(c * escala) for d, c in enumerate(contagem) if c})
+    return {
+        "metodo": "amostragem_bfs" if amostrador is None else f"amostragem_bfs_{amostra['metodo']}",
+        "histograma": histograma,
+        "distancia_media": float(media),
+        "erro_padrao": erro_padrao,
+        "intervalo_95": (media - 1.96 * erro_padrao, media + 1.96 * erro_padrao),
+        "fontes": k,
+    }
+
+
+# Função para estimar a distribuição de distâncias com a função de vizinhança HyperANF
+def distribuicao_distancias_hyperanf(grafo, bits_registro=6, max_iteracoes=None):
+    """
+    Estima a função de vizinhança N(t) = número de pares (u, v) com dist(u, v) <= t usando um
+    contador HyperLogLog por vértice (HyperANF). A cada iteração o contador de u recebe a união
+    dos contadores dos seus sucessores, então t iterações custam O(t * m * 2^bits_registro).
+    `bits_registro` é o controle de precisão: erro relativo ~ 1.04 / sqrt(2^bits_registro).
+    O erro padrão da distância média é estimado por jackknife sobre GRUPOS_JACKKNIFE grupos de
+    registros (sem iterações extras): os erros dos N(t) são correlacionados e a média é uma razão
+    de diferenças, então o erro relativo de cada contador não se propaga direto para ela.
+    """
+    n = grafo.number_of_nodes()
+    m = 2 ** bits_registro
+    registros = _registros_iniciais(n, bits_registro)
+    indptr = np.asarray(grafo.indptr, dtype=np.int64)
+    indices = np.asarray(grafo.indices)
+    com_vizinhos = np.flatnonzero(np.diff(indptr) > 0)
+
+    grupos = min(GRUPOS_JACKKNIFE, m)
+    vizinhanca = [_vizinhanca_jackknife(registros, grupos)]
+    iteracao = 0
+    while max_iteracoes is None or iteracao < max_iteracoes:
+        novos = registros.copy()
+        # União dos contadores dos vizinhos: máximo registro a registro, por segmento do CSR.
+        # Processa em blocos de vértices para não materializar registros[indices] inteiro.
+        for bloco in _blocos_por_arestas(indptr, com_vizinhos):
+            inicio, fim = indptr[bloco[0]], indptr[bloco[-1] + 1]
+            uniao = np.maximum.reduceat(registros[indices[inicio:fim]], indptr[bloco] - inicio, axis=0)
+            np.maximum(novos[bloco], uniao, out=uniao)
+            novos[bloco] = uniao
+        iteracao += 1
+        if np.array_equal(novos, registros):
+            break
+        registros = novos
+        vizinhanca.append(_vizinhanca_jackknife(registros, grupos))
+
+    # N(t) nunca decresce; a estimativa pode oscilar um pouco, então força a monotonicidade
+    # (coluna 0: todos os registros; demais: réplicas do jackknife)
+    vizinhanca = np.maximum.accumulate(np.array(vizinhanca), axis=0)
+    por_distancia = np.diff(vizinhanca, axis=0)
+    pares = vizinhanca[-1] - vizinhanca[0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        medias = np.arange(1, len(por_distancia) + 1) @ por_distancia / np.where(pares > 0, pares, np.nan)
+    media = float(medias[0])
+    replicas = medias[1:]
+    erro_padrao = float(np.sqrt((grupos - 1) / grupos * np.sum((replicas - replicas.mean()) ** 2)))
+    por_distancia = por_distancia[:, 0]
+    erro_relativo = _ERRO_HLL / np.sqrt(m)
+    histograma = Counter({d + 1: float(c) for d, c in enumerate(por_distancia) if c > 0})
+    return {
+        "metodo": "hyperanf",
+        "histograma": histograma,
+        "distancia_media": media,
+        "erro_padrao": erro_padrao,
+        # Aproximado: normal com o erro padrão do jackknife
+        "intervalo_95": (media - 1.96 * erro_padrao, media + 1.96 * erro_padrao),
+        "erro_relativo_pares": float(erro_relativo),
+        "iteracoes": iteracao,
+    }
+
+
+def _blocos_por_arestas(indptr, vertices, arestas_por_bloco=1_000_000):
+    """Divide vértices (em ordem crescente) em blocos com cerca de arestas_por_bloco arestas cada."""
+    if not len(vertices):
+        return []
+    acumulado = indptr[vertices + 1] - indptr[vertices[0]]
+    cortes = np.searchsorted(acumulado, np.arange(arestas_por_bloco, acumulado[-1], arestas_por_bloco))
+    return [bloco for bloco in np.split(vertices, np.unique(cortes)) if len(bloco)]
+
+
+def _registros_iniciais(n, bits_registro):
+    """Contadores HyperLogLog com um único elemento (o próprio vértice) em cada."""
+    m = 2 ** bits_registro
+    hashes = splitmix64(np.arange(n, dtype=np.uint64))
+    posicoes = (hashes & np.uint64(m - 1)).astype(np.int64)
+    resto = hashes >> np.uint64(bits_registro)
+    # rho = posição do primeiro bit 1 (contando da esquerda) nos 64 - bits_registro bits restantes
+    rho = (64 - bits_registro) - _comprimento_em_bits(resto) + 1
+    registros = np.zeros((n, m), dtype=np.uint8)
+    registros[np.arange(n), posicoes] = rho.astype(np.uint8)
+    return registros
+
+
+def _vizinhanca_jackknife(registros, grupos):
+    """
+    N(t) estimado (soma das cardinalidades de todos os contadores) com todos os registros e sem
+    cada um dos `grupos` grupos de registros consecutivos. Os registros de cada posição recebem uma
+    fração fixa dos elementos (pelo hash), então a estimativa com m' registros é escalada por m / m'.
+    """
+    n, m = registros.shape
+    potencias = np.ldexp(1.0, -registros.astype(np.int32)).reshape(n, grupos, m // grupos)
+    zeros = (registros == 0).reshape(n, grupos, m // grupos)
+    somas_grupo, zeros_grupo = potencias.sum(axis=2), zeros.sum(axis=2)
+    somas, quantidades_zeros = somas_grupo.sum(axis=1), zeros_grupo.sum(axis=1)
+    estimativas = [_estimar_cardinalidades(somas, quantidades_zeros, m).sum()]
+    restantes = m - m // grupos
+    for grupo in range(grupos):
+        parcial = _estimar_cardinalidades(somas - somas_grupo[:, grupo], quantidades_zeros - zeros_grupo[:, grupo], restantes)
+        estimativas.append(parcial.sum() * m / restantes)
+    return estimativas
+
+
+def _estimar_cardinalidades(somas, zeros, m):
+    """
+    Estimativa HyperLogLog de cada contador a partir da soma de 2^-registro e da quantidade de
+    registros zerados de cada um, com a correção de contagem linear para poucos elementos.
+    """
+    alfa = 0.7213 / (1 + 1.079 / m)
+    if m == 16:
+        alfa = 0.673
+    elif m == 32:
+        alfa = 0.697
+    elif m == 64:
+        alfa = 0.709
+    estimativa = alfa * m * m / somas
+    pequenos = (estimativa <= 2.5 * m) & (zeros > 0)
+    estimativa[pequenos] = m * np.log(m / zeros[pequenos])
+    return estimativa
+
+
+# Função de hash de 64 bits vetorizada (contadores HyperLogLog, hashes de arestas em pontes)
+def splitmix64(valores):
+    """Hash de 64 bits (SplitMix64) vetorizado; a aritmética de uint64 dá a volta como em C."""
+    with np.errstate(over="ignore"):
+        z = valores + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _comprimento_em_bits(valores):
+    """Equivalente vetorizado de int.bit_length() para uint64."""
+    comprimento = np.zeros(len(valores), dtype=np.int64)
+    restante = valores.copy()
+    for deslocamento in (32, 16, 8, 4, 2, 1):
+        grandes = restante >= (np.uint64(1) << np.uint64(deslocamento))
+        comprimento[grandes] += deslocamento
+        restante[grandes] >>= np.uint64(deslocamento)
+    comprimento += (restante > 0)
+    return comprimento
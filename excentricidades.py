@@ -0,0 +1,118 @@
+import time
+
+import numpy as np
+
+from amostragem import subgrafo_induzido
+from componentes import componentes_fortes, componentes_fracos
+from grafo_compacto import GrafoCompacto, bfs_csr, grafo_compacto_de_networkx, simetrizar_csr
+
+
+# Tipos de componente aceitos: o maior fortemente conexo (distâncias dirigidas) ou o maior fracamente
+# conexo (arestas sem direção); em grafos não dirigidos os dois são o maior componente conexo
+TIPOS_COMPONENTE = ("forte", "fraco")
+
+# Máximo de BFS por componente: redes aleatórias de diâmetro pequeno (ex.: Erdős–Rényi) podem exigir
+# muitas; com o limite o resultado sai parcial, com intervalos para diâmetro e raio
+LIMITE_BFS = 1_000
+
+
+# Função para calcular diâmetro, raio, periferia e centro exatos do maior componente
+def extremos_distancias(grafo, componente=None, rotulos_componentes=None, limite_bfs=LIMITE_BFS):
+    """
+    Diâmetro, raio, periferia (nós de excentricidade igual ao diâmetro) e centro (igual ao raio)
+    exatos do maior componente, sem calcular todas as distâncias: cada BFS dá a excentricidade
+    exata de um nó e limites inferiores/superiores para a de todos os outros (desigualdade
+    triangular, como no BoundingDiameters/iFUB); nós cujos limites já decidem tudo saem da busca.
+    Em redes reais costuma bastar um punhado de BFS.
+    `componente`: "forte" (padrão em grafos dirigidos; excentricidade de saída) ou "fraco".
+    `rotulos_componentes`: rótulo do componente de cada nó, se já calculado (ex.: métricas
+    "componentes" / "componentes_fortes"). Se `limite_bfs` (None: sem limite) acabar antes, o
+    resultado fica marcado como parcial: os intervalos trazem os limites obtidos e periferia/centro
+    só os nós já confirmados.
+    """
+    inicio = time.perf_counter()
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    componente = componente or ("forte" if grafo.dirigido else "fraco")
+    if componente not in TIPOS_COMPONENTE:
+        raise ValueError(f"Componente desconhecido: {componente} (opções: {', '.join(TIPOS_COMPONENTE)})")
+    if rotulos_componentes is None:
+        calcular = componentes_fortes if componente == "forte" else componentes_fracos
+        rotulos_componentes = calcular(grafo)["rotulos"]
+
+    # Maior componente como subgrafo induzido (os caminhos mínimos entre seus nós não saem dele)
+    maior = int(np.argmax(np.bincount(rotulos_componentes)))
+    subgrafo = subgrafo_induzido(grafo, np.flatnonzero(rotulos_componentes == maior))
+    if not subgrafo.dirigido:
+        limites = limitar_excentricidades(subgrafo.indptr, subgrafo.indices, limite_bfs=limite_bfs)
+    elif componente == "fraco":
+        indptr, indices = simetrizar_csr(subgrafo.indptr, subgrafo.indices, subgrafo.indptr_entrada,
+                                          subgrafo.indices_entrada)
+        limites = limitar_excentricidades(indptr, indices, limite_bfs=limite_bfs)
+    else:
+        limites = limitar_excentricidades(subgrafo.indptr, subgrafo.indices, subgrafo.indptr_entrada,
+                                          subgrafo.indices_entrada, limite_bfs=limite_bfs)
+
+    inferior, superior = limites["inferior"], limites["superior"]
+    exatos = inferior == superior
+    diametro, raio = int(inferior.max()), int(superior.min())
+    rotulos = np.asarray(subgrafo.rotulos)
+    return {
+        "metodo": "limites_excentricidade",
+        "componente": componente if grafo.dirigido else "conexo",
+        "nos_componente": subgrafo.number_of_nodes(),
+        "diametro": diametro,
+        "raio": raio,
+        "periferia": rotulos[exatos & (inferior == diametro)].tolist(),
+        "centro": rotulos[exatos & (superior == raio)].tolist(),
+        "completo": limites["completo"],
+        "intervalo_diametro": (diametro, int(superior.max())),
+        "intervalo_raio": (int(inferior.min()), raio),
+        "bfs": limites["bfs"],
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def limitar_excentricidades(indptr, indices, indptr_entrada=None, indices_entrada=None, limite_bfs=None):
+    """
+    Limites de excentricidade de todos os nós de um CSR (fortemente) conexo. A cada passo escolhe,
+    alternadamente, o candidato de maior limite superior e o de menor limite inferior (empate: maior
+    grau), roda uma BFS a partir dele (duas, em grafos dirigidos: pelo CSR de saída e pelo de
+    entrada) e aperta os limites de todos os nós de uma vez:
+        inferior(w) >= max(d(w, v), exc(v) - d(v, w))    superior(w) <= d(w, v) + exc(v)
+    Primeiro fecha diâmetro e raio: um nó deixa de ser candidato quando não pode aumentar o diâmetro
+    nem diminuir o raio. Depois decide periferia e centro: continuam só os nós que ainda podem ter
+    excentricidade igual ao diâmetro ou ao raio sem que ela seja conhecida.
+    Retorna {"inferior", "superior", "bfs", "completo"}; parcial se `limite_bfs` acabar antes.
+    """
+    n = len(indptr) - 1
+    inferior = np.zeros(n, dtype=np.int64)
+    superior = np.full(n, max(n - 1, 0), dtype=np.int64)
+    graus = np.diff(np.asarray(indptr, dtype=np.int64))
+    pelo_maior = True
+    bfs = 0
+    while limite_bfs is None or bfs < limite_bfs:
+        diametro_minimo, raio_maximo = inferior.max(), superior.min()
+        candidatos = (superior > diametro_minimo) | (inferior < raio_maximo)
+        if not candidatos.any():
+            # Diâmetro e raio fechados: restam os nós que podem estar na periferia ou no centro
+            exatos = inferior == superior
+            candidatos = ~exatos & ((superior == diametro_minimo) | (inferior == raio_maximo))
+            if not candidatos.any():
+                return {"inferior": inferior, "superior": superior, "bfs": bfs, "completo": True}
+        indices_candidatos = np.flatnonzero(candidatos)
+        if pelo_maior:
+            ordem = np.lexsort((-graus[indices_candidatos], -superior[indices_candidatos]))
+        else:
+            ordem = np.lexsort((-graus[indices_candidatos], inferior[indices_candidatos]))
+        v = int(indices_candidatos[ordem[0]])
+        pelo_maior = not pelo_maior
+
+        ida = bfs_csr(indptr, indices, v).astype(np.int64)
+        volta = ida if indptr_entrada is None else bfs_csr(indptr_entrada, indices_entrada, v).astype(np.int64)
+        bfs += 1 if indptr_entrada is None else 2
+        excentricidade = int(ida.max())
+        np.maximum(inferior, np.maximum(volta, excentricidade - ida), out=inferior)
+        np.minimum(superior, volta + excentricidade, out=superior)
+        inferior[v] = superior[v] = excentricidade
+    return {"inferior": inferior, "superior": superior, "bfs": bfs, "completo": False}
@@ -0,0 +1,245 @@
+import io
+import json
+import os
+import pickle
+import re
+import time
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor
+
+
+# Formatos aceitos na exportação das figuras
+FORMATOS = ("html", "png", "svg")
+
+# Nome do arquivo com a lista das figuras exportadas (lido pelo relatório)
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Nome do arquivo com a biblioteca plotly.js compartilhada pelos HTML das figuras
+_ARQUIVO_PLOTLY_JS = "plotly.min.js"
+
+# Exportador ativo (None: as figuras são exibidas com show(), como antes)
+_EXPORTADOR = None
+
+
+class ExportadorFiguras:
+    """
+    Grava as figuras em arquivos em vez de abrir janelas/navegador.
+    Cada figura é serializada no processo principal (plotly: JSON; matplotlib: pickle) e renderizada
+    num pool de processos em segundo plano, então o cálculo da próxima métrica continua enquanto
+    as figuras anteriores são gravadas. `finalizar()` espera as tarefas e grava o manifesto
+    (nome, título, tipo e arquivos de cada figura) em <diretorio>/manifesto.json.
+    Com processos=0 a renderização acontece no próprio processo, sem pool (ex.: dentro de um processo
+    que já é trabalhador de outro pool).
+    Com js_compartilhado=True, os HTML do plotly apontam para um único plotly.min.js no diretório.
+    PNG/SVG de figuras plotly exigem o pacote opcional kaleido; sem ele o erro fica no manifesto.
+    """
+
+    def __init__(self, diretorio, formatos=("html", "png"), processos=None, js_compartilhado=True):
+        desconhecidos = [formato for formato in formatos if formato not in FORMATOS]
+        if desconhecidos:
+            raise ValueError(f"Formato desconhecido: {', '.join(desconhecidos)} (opções: {', '.join(FORMATOS)})")
+        self.diretorio = diretorio
+        self.formatos = tuple(formatos)
+        self.js_compartilhado = js_compartilhado
+        self.processos = min(4, os.cpu_count() or 1) if processos is None else processos
+        self._executor = None
+        self._pendentes = []
+        self._nomes = set()
+        self.grupo = None
+        os.makedirs(diretorio, exist_ok=True)
+
+    def exportar(self, figura, titulo, grupo=None):
+        """Agenda a gravação de uma figura plotly ou matplotlib; retorna o nome base dos arquivos."""
+        grupo = grupo if grupo is not None else self.grupo
+        nome = self._nome_unico(f"{grupo}_{titulo}" if grupo else titulo)
+        if hasattr(figura, "to_json"):
+            tipo, dados = "plotly", figura.to_json()
+            if self.js_compartilhado and "html" in self.formatos:
+                self._gravar_plotly_js()
+        else:
+            import matplotlib.pyplot as plt
+
+            tipo, dados = "matplotlib", pickle.dumps(figura)
+            plt.close(figura)
+        argumentos = (tipo, dados, os.path.join(self.diretorio, nome), self.formatos, self.js_compartilhado)
+        if self.processos == 0:
+            futuro = Future()
+            try:
+                futuro.set_result(_renderizar(*argumentos))
+            except Exception as erro:
+                futuro.set_exception(erro)
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.processos)
+            futuro = self._executor.submit(_renderizar, *argumentos)
+        self._pendentes.append(({"nome": nome, "titulo": titulo, "grupo": grupo, "tipo": tipo}, futuro))
+        return nome
+
+    def figuras(self, grupo=None):
+        """
+        Figuras já agendadas (do `grupo`, se informado), com os arquivos previstos: os caminhos são
+        conhecidos antes da renderização terminar, então o relatório pode referenciá-los de imediato.
+        """
+        return [
+            dict(entrada, arquivos={formato: os.path.join(self.diretorio, f"{entrada['nome']}.{formato}")
+                                    for formato in self.formatos})
+            for entrada, _ in self._pendentes if grupo is None or entrada["grupo"] == grupo
+        ]
+
+    def finalizar(self, gravar=True):
+        """
+        Espera todas as figuras e grava o manifesto (com gravar=False só devolve as entradas, para
+        quem junta figuras de vários processos e grava uma vez com gravar_manifesto).
+        Retorna a lista de entradas das figuras deste exportador.
+        """
+        manifesto = []
+        for entrada, futuro in self._pendentes:
+            try:
+                entrada.update(futuro.result())
+            except Exception as erro:  # Uma figura com problema não derruba as outras
+                entrada.update(arquivos={}, erros={"renderizacao": repr(erro)})
+            manifesto.append(entrada)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._pendentes = []
+        if gravar:
+            gravar_manifesto(self.diretorio, manifesto)
+        return manifesto
+
+    def _nome_unico(self, titulo):
+        base = nome_de_arquivo(titulo)
+        nome, contador = base, 2
+        while nome in self._nomes:
+            nome, contador = f"{base}_{contador}", contador + 1
+        self._nomes.add(nome)
+        return nome
+
+    def _gravar_plotly_js(self):
+        caminho = os.path.join(self.diretorio, _ARQUIVO_PLOTLY_JS)
+        if not os.path.exists(caminho):
+            from plotly.offline import get_plotlyjs
+
+            # Grava com outro nome e renomeia: outro processo pode estar gravando o mesmo arquivo
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.write(get_plotlyjs())
+            os.replace(temporario, caminho)
+
+
+# Função para ativar a exportação: a partir daí mostrar_figura grava arquivos em vez de chamar show()
+def ativar_exportacao(diretorio, formatos=("html", "png"), processos=None, js_compartilhado=True):
+    """Cria e ativa o ExportadorFiguras global. Usa o backend Agg do matplotlib (sem janelas)."""
+    global _EXPORTADOR
+    import matplotlib
+
+    matplotlib.use("Agg")
+    _EXPORTADOR = ExportadorFiguras(diretorio, formatos, processos, js_compartilhado)
+    return _EXPORTADOR
+
+
+# Função para indicar a qual grupo (ex.: rede) pertencem as próximas figuras exportadas
+def definir_grupo(grupo):
+    if _EXPORTADOR is not None:
+        _EXPORTADOR.grupo = grupo
+
+
+# Função para listar as figuras agendadas de um grupo (vazia se a exportação não está ativa)
+def figuras_exportadas(grupo=None):
+    return _EXPORTADOR.figuras(grupo) if _EXPORTADOR is not None else []
+
+
+# Função para encerrar a exportação ativa (espera as figuras e grava o manifesto)
+def finalizar_exportacao(gravar=True):
+    """Retorna o manifesto das figuras exportadas ([] se a exportação não estava ativa)."""
+    global _EXPORTADOR
+    if _EXPORTADOR is None:
+        return []
+    manifesto = _EXPORTADOR.finalizar(gravar)
+    _EXPORTADOR = None
+    return manifesto
+
+
+# Função usada por todas as funções de plotagem no lugar de fig.show() / plt.show()
+def mostrar_figura(figura, titulo, grupo=None):
+    """
+    Com a exportação ativa, agenda a gravação da figura (não bloqueia); senão, exibe como antes.
+    `figura` é uma go.Figure ou uma figura do matplotlib; `grupo` (ex.: nome da rede) entra no nome do arquivo.
+    """
+    if _EXPORTADOR is not None:
+        return _EXPORTADOR.exportar(figura, titulo, grupo)
+    if hasattr(figura, "to_json"):
+        figura.show()
+    else:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+    return None
+
+
+# Função para gravar o manifesto, mantendo as entradas anteriores que não foram substituídas
+def gravar_manifesto(diretorio, entradas):
+    caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+    anteriores = ler_manifesto(diretorio) if os.path.exists(caminho) else []
+    novos = {entrada["nome"] for entrada in entradas}
+    manifesto = [entrada for entrada in anteriores if entrada["nome"] not in novos] + list(entradas)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    return manifesto
+
+
+# Função para ler o manifesto de um diretório de figuras
+def ler_manifesto(diretorio):
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _renderizar(tipo, dados, caminho_base, formatos, js_compartilhado):
+    """Roda no processo trabalhador: grava a figura em cada formato e informa arquivos, erros e tempo."""
+    inicio = time.perf_counter()
+    arquivos, erros = {}, {}
+    if tipo == "plotly":
+        import plotly.io as pio
+
+        figura = pio.from_json(dados)
+        for formato in formatos:
+            caminho = f"{caminho_base}.{formato}"
+            try:
+                if formato == "html":
+                    figura.write_html(caminho, include_plotlyjs="directory" if js_compartilhado else True,
+                                      full_html=True)
+                else:
+                    figura.write_image(caminho, format=formato)
+                arquivos[formato] = caminho
+            except (ValueError, ImportError, RuntimeError) as erro:
+                # Ex.: PNG/SVG sem o pacote kaleido instalado
+                linhas = [linha.strip() for linha in str(erro).splitlines() if linha.strip()]
+                erros[formato] = linhas[0] if linhas else repr(erro)
+    else:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        figura = pickle.loads(dados)
+        for formato in formatos:
+            caminho = f"{caminho_base}.{formato}"
+            if formato == "html":
+                # HTML de figura matplotlib: página com o SVG embutido
+                buffer = io.StringIO()
+                figura.savefig(buffer, format="svg", bbox_inches="tight")
+                with open(caminho, "w", encoding="utf-8") as f:
+                    f.write(f"<!DOCTYPE html><html><head><meta charset=\"UTF-8\"></head><body>{buffer.getvalue()}</body></html>")
+            else:
+                figura.savefig(caminho, format=formato, dpi=100, bbox_inches="tight")
+            arquivos[formato] = caminho
+        plt.close(figura)
+    return {"arquivos": arquivos, "erros": erros, "segundos": time.perf_counter() - inicio}
+
+
+# Função para converter um título num nome de arquivo seguro
+def nome_de_arquivo(titulo):
+    """Título -> nome de arquivo seguro (sem acentos, minúsculas, palavras separadas por _)."""
+    texto = unicodedata.normalize("NFKD", str(titulo)).encode("ascii", "ignore").decode("ascii")
+    texto = re.sub(r"[^a-zA-Z0-9]+", "_", texto).strip("_").lower()
+    return texto[:80] or "figura"
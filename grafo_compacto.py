@@ -0,0 +1,465 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+
+# Diretório padrão onde os grafos compactos ficam salvos entre execuções
+DIRETORIO_CACHE = ".cache_grafos"
+
+# Versão do formato binário do cache (mudar invalida os arquivos antigos)
+VERSAO_CACHE = 1
+
+# Orçamento padrão de memória para a leitura em blocos (bytes)
+MEMORIA_MAXIMA_PADRAO = 256 * 2 ** 20
+
+# Estimativa de bytes por linha do CSV durante a leitura em blocos (DataFrame + arrays temporários)
+BYTES_POR_LINHA = 64
+
+# Arestas por bloco nas passadas sequenciais sobre o CSR (ver blocos_de_arestas): limita a memória de
+# trabalho quando o grafo está mapeado do disco e é maior que a RAM
+ARESTAS_POR_BLOCO = 8 * 2 ** 20
+
+# Bytes gravados por vez ao copiar arrays (possivelmente mapeados do disco) para o arquivo de cache
+_BYTES_POR_ESCRITA = 64 * 2 ** 20
+
+_MAGICA = b"GRAFOCSR"
+_ALINHAMENTO = 64
+
+
+class GrafoCompacto:
+    """
+    Grafo em formato CSR (indptr/indices) com arrays NumPy int32.
+    Os nós são internados: o índice i corresponde ao rótulo original rotulos[i].
+    Para grafos dirigidos também guarda o CSR reverso (arestas de entrada).
+    `nomes` (opcional): tabela de nomes dos nós, separada dos rótulos (ex.: rótulos dos vértices
+    de um arquivo Pajek, cujos nós são identificados por números).
+    `lacos` (opcional): quantidade de laços, se já conhecida (ex.: gravada no cache); senão é
+    contada uma vez, na primeira consulta.
+    """
+
+    def __init__(self, indptr, indices, rotulos, dirigido, indptr_entrada=None, indices_entrada=None, nomes=None,
+                 lacos=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.rotulos = rotulos
+        self.dirigido = dirigido
+        self.indptr_entrada = indptr_entrada
+        self.indices_entrada = indices_entrada
+        self.nomes = nomes
+        self._lacos = lacos
+
+    # Métodos com os mesmos nomes do networkx, para reaproveitar as funções de análise
+    def is_directed(self):
+        return self.dirigido
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    def number_of_edges(self):
+        if self.dirigido:
+            return len(self.indices)
+        # Cada aresta não dirigida aparece duas vezes, exceto laços
+        return (len(self.indices) + self.numero_lacos()) // 2
+
+    def numero_lacos(self):
+        """Quantidade de laços (u, u), contada bloco a bloco só na primeira chamada."""
+        if self._lacos is None:
+            self._lacos = sum(int(np.count_nonzero(u == v)) for u, v in blocos_de_arestas(self.indptr, self.indices))
+        return self._lacos
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def vizinhos(self, u):
+        """Vizinhos de saída do nó interno u (ordenados)."""
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def predecessores(self, u):
+        """Vizinhos de entrada do nó interno u (apenas grafos dirigidos)."""
+        if not self.dirigido:
+            return self.vizinhos(u)
+        return self.indices_entrada[self.indptr_entrada[u]:self.indptr_entrada[u + 1]]
+
+    def graus_saida(self):
+        return np.diff(self.indptr).astype(np.int64)
+
+    def graus_entrada(self):
+        if not self.dirigido:
+            return self.graus_saida()
+        return np.diff(self.indptr_entrada).astype(np.int64)
+
+    def graus(self):
+        """Grau total de cada nó (entrada + saída nos dirigidos), como no networkx."""
+        if self.dirigido:
+            return self.graus_entrada() + self.graus_saida()
+        graus = self.graus_saida()
+        if not self.numero_lacos():
+            return graus
+        # Laços contam duas vezes no grau, como no networkx
+        for u, v in blocos_de_arestas(self.indptr, self.indices):
+            lacos = u[u == v]
+            if len(lacos):
+                graus += np.bincount(lacos, minlength=len(graus))
+        return graus
+
+    def _origens(self):
+        """Array com o nó de origem de cada posição de indices."""
+        return np.repeat(np.arange(self.number_of_nodes(), dtype=np.int32), np.diff(self.indptr))
+
+    def indice_de(self, rotulo):
+        """Converte um rótulo original no índice interno do nó."""
+        posicao = int(np.searchsorted(self.rotulos, rotulo))
+        if posicao >= len(self.rotulos) or self.rotulos[posicao] != rotulo:
+            raise KeyError(rotulo)
+        return posicao
+
+    def bfs(self, origem, reverso=False):
+        """
+        Busca em largura a partir do nó interno `origem`.
+        Retorna um array de distâncias (int32), com -1 para nós inalcançáveis.
+        """
+        if reverso and self.dirigido:
+            indptr, indices = self.indptr_entrada, self.indices_entrada
+        else:
+            indptr, indices = self.indptr, self.indices
+        return bfs_csr(indptr, indices, origem)
+
+    def componentes_conexos(self):
+        """
+        Rotula os componentes conexos (fracamente conexos em grafos dirigidos) com union-find vetorizado.
+        Retorna (rótulo do componente de cada nó, tamanho de cada componente).
+        Para a distribuição de tamanhos e os componentes fortes, use o módulo componentes.
+        """
+        from componentes import componentes_fracos_csr
+
+        return componentes_fracos_csr(self.indptr, self.indices, self.dirigido)
+
+    def pontes(self):
+        """
+        Identifica as arestas pontes com uma DFS iterativa (sem recursão) e valores low-link.
+        Considera o grafo como não direcionado. Retorna pares de rótulos originais.
+        Para componentes 2-aresta-conexos e árvore de pontes, use pontes.analisar_pontes.
+        """
+        from pontes import analisar_pontes
+
+        return analisar_pontes(self)["pontes"]
+
+    def para_networkx(self):
+        """Converte para nx.Graph / nx.DiGraph (somente quando realmente necessário)."""
+        import networkx as nx
+
+        grafo = nx.DiGraph() if self.dirigido else nx.Graph()
+        rotulos = self.rotulos.tolist()
+        grafo.add_nodes_from(rotulos)
+        origens = self._origens()
+        if self.dirigido:
+            pares = zip(origens.tolist(), self.indices.tolist())
+        else:
+            metade = origens <= self.indices
+            pares = zip(origens[metade].tolist(), self.indices[metade].tolist())
+        grafo.add_edges_from((rotulos[u], rotulos[v]) for u, v in pares)
+        return grafo
+
+
+# Função para montar um GrafoCompacto a partir de arrays de origem/destino (rótulos originais)
+def construir_grafo_compacto(origens, destinos, dirigido, nos=None):
+    """
+    Interna os rótulos, remove arestas repetidas e monta os arrays CSR. `nos`: rótulos que também
+    entram no grafo mesmo sem aresta (nós isolados).
+    """
+    origens = np.asarray(origens)
+    destinos = np.asarray(destinos)
+    extras = [np.asarray(nos)] if nos is not None else []
+    rotulos, internos = np.unique(np.concatenate([origens, destinos, *extras]), return_inverse=True)
+    internos = internos.astype(np.int64)
+    u = internos[:len(origens)]
+    v = internos[len(origens):len(origens) + len(destinos)]
+    n = len(rotulos)
+
+    if not dirigido:
+        # Simetriza: cada aresta {u, v} vira (u, v) e (v, u); laços ficam uma vez só
+        sem_laco = u != v
+        u, v = np.concatenate([u, v[sem_laco]]), np.concatenate([v, u[sem_laco]])
+
+    indptr, indices = csr_de_pares(u, v, n)
+    if dirigido:
+        indptr_entrada, indices_entrada = csr_de_pares(v, u, n)
+        return GrafoCompacto(indptr, indices, rotulos, True, indptr_entrada, indices_entrada)
+    return GrafoCompacto(indptr, indices, rotulos, False)
+
+
+# Função para converter um grafo networkx já carregado para o formato compacto
+def grafo_compacto_de_networkx(grafo):
+    """Monta o GrafoCompacto com os nós (inclusive os isolados) e as arestas de um nx.Graph / nx.DiGraph."""
+    nos = np.array(list(grafo.nodes()))
+    arestas = np.array(list(grafo.edges()), dtype=nos.dtype).reshape(-1, 2)
+    return construir_grafo_compacto(arestas[:, 0], arestas[:, 1], grafo.is_directed(), nos=nos)
+
+
+# Função para carregar um grafo compacto a partir de um CSV de arestas, usando o cache binário
+def carregar_grafo_compacto(caminho_arquivo, coluna_origem, coluna_destino, dirigido, diretorio_cache=DIRETORIO_CACHE,
+                            memoria_maxima=None, externo=False):
+    """
+    Carrega um grafo em formato CSR. Na primeira execução lê o CSV e grava um arquivo de cache;
+    nas seguintes o cache é mapeado em memória (np.memmap) e o CSV nem é lido.
+    Passe diretorio_cache=None para não usar cache.
+    Com memoria_maxima (bytes), o CSV é lido em blocos (ver carregar_grafo_em_blocos).
+    Com externo=True o cache é montado por ordenação externa, sem as arestas em memória (ver
+    ordenacao_externa.construir_grafo_externo): para arquivos maiores que a RAM. Exige o cache.
+    """
+    caminho_cache = None
+    if diretorio_cache is not None:
+        caminho_cache = caminho_do_cache(caminho_arquivo, diretorio_cache, coluna_origem, coluna_destino, dirigido)
+        if os.path.exists(caminho_cache):
+            return abrir_cache(caminho_cache)
+
+    if externo:
+        from ordenacao_externa import construir_grafo_externo
+
+        if caminho_cache is None:
+            raise ValueError("O armazenamento externo grava o grafo no diretório de cache: diretorio_cache não pode ser None")
+        return construir_grafo_externo(caminho_arquivo, coluna_origem, coluna_destino, dirigido, caminho_cache,
+                                       memoria_maxima or MEMORIA_MAXIMA_PADRAO)
+    if memoria_maxima is not None:
+        grafo = carregar_grafo_em_blocos(caminho_arquivo, coluna_origem, coluna_destino, dirigido, memoria_maxima)
+    else:
+        import pandas as pd
+
+        arestas = pd.read_csv(caminho_arquivo, usecols=[coluna_origem, coluna_destino])
+        grafo = construir_grafo_compacto(arestas[coluna_origem].to_numpy(), arestas[coluna_destino].to_numpy(), dirigido)
+
+    if caminho_cache is not None:
+        salvar_cache(grafo, caminho_cache)
+        return abrir_cache(caminho_cache)
+    return grafo
+
+
+# Função para ler arquivos de arestas grandes em blocos, com memória limitada
+def carregar_grafo_em_blocos(caminho_arquivo, coluna_origem, coluna_destino, dirigido,
+                             memoria_maxima=MEMORIA_MAXIMA_PADRAO, linhas_por_bloco=None):
+    """
+    Lê o CSV em blocos de tamanho fixo, sem manter o DataFrame inteiro nem um grafo networkx.
+    1ª passada: coleta os rótulos dos nós. 2ª passada: converte cada bloco em chaves de aresta
+    (u * n + v), normaliza as arestas não dirigidas para u <= v e remove repetidas à medida que lê.
+    memoria_maxima (bytes) limita os buffers de leitura e de arestas pendentes; o grafo final
+    ocupa apenas o tamanho do próprio CSR.
+    """
+    if linhas_por_bloco is None:
+        linhas_por_bloco = max(1_000, memoria_maxima // (4 * BYTES_POR_LINHA))
+    colunas = [coluna_origem, coluna_destino]
+
+    def blocos():
+        return blocos_csv(caminho_arquivo, coluna_origem, coluna_destino, linhas_por_bloco)
+
+    rotulos = rotulos_em_blocos(blocos(), caminho_arquivo)
+    n = len(rotulos)
+
+    chaves = np.empty(0, dtype=np.int64)
+    pendentes = []
+    bytes_pendentes = 0
+    for origens, destinos in blocos():
+        u = np.searchsorted(rotulos, origens).astype(np.int64)
+        v = np.searchsorted(rotulos, destinos).astype(np.int64)
+        if not dirigido:
+            u, v = np.minimum(u, v), np.maximum(u, v)
+        bloco = np.unique(u * n + v)
+        pendentes.append(bloco)
+        bytes_pendentes += bloco.nbytes
+        # Quando os buffers passam de metade do orçamento, junta tudo e remove repetidas
+        if bytes_pendentes + chaves.nbytes > memoria_maxima // 2:
+            chaves = np.union1d(chaves, np.concatenate(pendentes))
+            pendentes, bytes_pendentes = [], 0
+    if pendentes:
+        chaves = np.union1d(chaves, np.concatenate(pendentes))
+    del pendentes
+
+    u, v = chaves // n, chaves % n
+    del chaves
+    if dirigido:
+        indptr, indices = csr_de_pares(u, v, n)
+        indptr_entrada, indices_entrada = csr_de_pares(v, u, n)
+        return GrafoCompacto(indptr, indices, rotulos, True, indptr_entrada, indices_entrada)
+    # Simetriza só no final, quando as arestas já são únicas
+    sem_laco = u != v
+    u, v = np.concatenate([u, v[sem_laco]]), np.concatenate([v, u[sem_laco]])
+    indptr, indices = csr_de_pares(u, v, n)
+    return GrafoCompacto(indptr, indices, rotulos, False)
+
+
+def blocos_csv(caminho_arquivo, coluna_origem, coluna_destino, linhas_por_bloco):
+    """Gera (origens, destinos) de cada bloco de `linhas_por_bloco` linhas do CSV."""
+    import pandas as pd
+
+    for bloco in pd.read_csv(caminho_arquivo, usecols=[coluna_origem, coluna_destino], chunksize=linhas_por_bloco):
+        yield bloco[coluna_origem].to_numpy(), bloco[coluna_destino].to_numpy()
+
+
+def rotulos_em_blocos(blocos, caminho_arquivo):
+    """Rótulos distintos (ordenados) de todos os blocos (origens, destinos); só os rótulos ficam em memória."""
+    rotulos = None
+    for origens, destinos in blocos:
+        novos = np.unique(np.concatenate([origens, destinos]))
+        rotulos = novos if rotulos is None else np.union1d(rotulos, novos)
+    if rotulos is None:
+        raise ValueError(f"Arquivo de arestas vazio: {caminho_arquivo}")
+    return rotulos
+
+
+def caminho_do_cache(caminho_arquivo, diretorio_cache, *opcoes):
+    """Nome do arquivo de cache: depende do arquivo de origem (caminho, tamanho, data) e das opções."""
+    estado = os.stat(caminho_arquivo)
+    chave = json.dumps(
+        [os.path.abspath(caminho_arquivo), estado.st_size, estado.st_mtime_ns, list(opcoes), VERSAO_CACHE]
+    )
+    resumo = hashlib.sha1(chave.encode("utf-8")).hexdigest()[:16]
+    nome = os.path.splitext(os.path.basename(caminho_arquivo))[0]
+    return os.path.join(diretorio_cache, f"{nome}-{resumo}.csr")
+
+
+def salvar_cache(grafo, caminho_cache):
+    """Grava os arrays do grafo num único arquivo binário: cabeçalho JSON + arrays alinhados."""
+    arrays = {"indptr": grafo.indptr, "indices": grafo.indices, "rotulos": rotulos_para_disco(grafo.rotulos)}
+    if grafo.dirigido:
+        arrays["indptr_entrada"] = grafo.indptr_entrada
+        arrays["indices_entrada"] = grafo.indices_entrada
+    if grafo.nomes is not None:
+        arrays["nomes"] = rotulos_para_disco(np.asarray(grafo.nomes, dtype=object))
+
+    descricao = {}
+    deslocamento = 0
+    for nome, array in arrays.items():
+        deslocamento = _alinhar(deslocamento)
+        descricao[nome] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": deslocamento}
+        deslocamento += array.nbytes
+    cabecalho = json.dumps(
+        {"versao": VERSAO_CACHE, "dirigido": grafo.dirigido, "lacos": grafo.numero_lacos(), "arrays": descricao}
+    ).encode("utf-8")
+    inicio_dados = _alinhar(len(_MAGICA) + 8 + len(cabecalho))
+
+    os.makedirs(os.path.dirname(caminho_cache) or ".", exist_ok=True)
+    temporario = f"{caminho_cache}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(_MAGICA)
+        f.write(struct.pack("<Q", len(cabecalho)))
+        f.write(cabecalho)
+        for nome, array in arrays.items():
+            f.write(b"\0" * (inicio_dados + descricao[nome]["offset"] - f.tell()))
+            # Em fatias: arrays mapeados do disco (ex.: ordenacao_externa) não são carregados inteiros
+            passo = max(1, _BYTES_POR_ESCRITA // max(array.itemsize, 1))
+            for inicio in range(0, max(len(array), 1), passo):
+                f.write(np.ascontiguousarray(array[inicio:inicio + passo]).tobytes())
+    # Troca atômica: outro processo nunca enxerga um cache pela metade
+    os.replace(temporario, caminho_cache)
+
+
+def abrir_cache(caminho_cache):
+    """Abre um arquivo de cache mapeando os arrays em memória (somente leitura)."""
+    with open(caminho_cache, "rb") as f:
+        if f.read(len(_MAGICA)) != _MAGICA:
+            raise ValueError(f"Arquivo de cache inválido: {caminho_cache}")
+        (tamanho_cabecalho,) = struct.unpack("<Q", f.read(8))
+        cabecalho = json.loads(f.read(tamanho_cabecalho).decode("utf-8"))
+    if cabecalho["versao"] != VERSAO_CACHE:
+        raise ValueError(f"Versão de cache incompatível: {caminho_cache}")
+    inicio_dados = _alinhar(len(_MAGICA) + 8 + tamanho_cabecalho)
+
+    arrays = {}
+    for nome, info in cabecalho["arrays"].items():
+        forma = tuple(info["shape"])
+        if np.prod(forma) == 0:
+            arrays[nome] = np.empty(forma, dtype=info["dtype"])
+        else:
+            arrays[nome] = np.memmap(
+                caminho_cache, dtype=info["dtype"], mode="r", offset=inicio_dados + info["offset"], shape=forma
+            )
+    return GrafoCompacto(
+        arrays["indptr"], arrays["indices"], arrays["rotulos"], cabecalho["dirigido"],
+        arrays.get("indptr_entrada"), arrays.get("indices_entrada"), arrays.get("nomes"), cabecalho.get("lacos"),
+    )
+
+
+# Funções auxiliares sobre arrays CSR (usadas também por outros módulos)
+def bfs_csr(indptr, indices, origem):
+    """BFS vetorizada por níveis: expande a fronteira inteira de uma vez com NumPy."""
+    n = len(indptr) - 1
+    distancias = np.full(n, -1, dtype=np.int32)
+    distancias[origem] = 0
+    fronteira = np.array([origem], dtype=np.int64)
+    nivel = 0
+    while len(fronteira):
+        nivel += 1
+        vizinhos = expandir_fronteira(indptr, indices, fronteira)
+        vizinhos = vizinhos[distancias[vizinhos] == -1]
+        fronteira = np.unique(vizinhos)
+        distancias[fronteira] = nivel
+    return distancias
+
+
+def blocos_de_arestas(indptr, indices, arestas_por_bloco=ARESTAS_POR_BLOCO):
+    """
+    Percorre o CSR em blocos de nós consecutivos com cerca de `arestas_por_bloco` arestas: indices é
+    lido em ordem (páginas sequenciais, se mapeado do disco). Gera (origens, destinos) int64.
+    """
+    n = len(indptr) - 1
+    inicio = 0
+    while inicio < n:
+        limite = int(indptr[inicio]) + arestas_por_bloco
+        fim = min(max(int(np.searchsorted(indptr, limite, side="right")) - 1, inicio + 1), n)
+        graus = np.diff(np.asarray(indptr[inicio:fim + 1], dtype=np.int64))
+        yield (np.repeat(np.arange(inicio, fim, dtype=np.int64), graus),
+               np.asarray(indices[int(indptr[inicio]):int(indptr[fim])], dtype=np.int64))
+        inicio = fim
+
+
+def expandir_fronteira(indptr, indices, fronteira):
+    """Concatena as listas de vizinhos de todos os nós da fronteira, sem laço em Python."""
+    inicios = indptr[fronteira].astype(np.int64)
+    quantidades = indptr[fronteira + 1].astype(np.int64) - inicios
+    total = int(quantidades.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # posição de cada vizinho = início da lista do seu nó + deslocamento dentro da lista
+    deslocamentos = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+    return indices[np.repeat(inicios, quantidades) + deslocamentos].astype(np.int64)
+
+
+# Função para montar um CSR a partir de pares de arestas (u, v)
+def csr_de_pares(u, v, n):
+    """Monta indptr/indices a partir de pares (u, v), removendo repetidos e ordenando os vizinhos."""
+    # Ordena e descarta repetidas (mais rápido que np.unique, que no NumPy 2.x pode usar hash e ordenar depois)
+    chaves = np.sort(u.astype(np.int64) * n + v)
+    if len(chaves):
+        chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))]
+    origens = chaves // n
+    indices = (chaves % n).astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origens, minlength=n), out=indptr[1:])
+    if indptr[-1] <= np.iinfo(np.int32).max:
+        indptr = indptr.astype(np.int32)
+    return indptr, indices
+
+
+# Função para obter a visão não dirigida de um CSR dirigido
+def simetrizar_csr(indptr, indices, indptr_entrada, indices_entrada):
+    """Une o CSR de saída e o de entrada num CSR não direcionado (visão fraca do grafo dirigido)."""
+    n = len(indptr) - 1
+    origens = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    origens_entrada = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr_entrada))
+    u = np.concatenate([origens, origens_entrada])
+    v = np.concatenate([np.asarray(indices, dtype=np.int64), np.asarray(indices_entrada, dtype=np.int64)])
+    return csr_de_pares(u, v, n)
+
+
+# Função para converter rótulos num dtype que pode ser gravado e mapeado do disco
+def rotulos_para_disco(rotulos):
+    """Rótulos texto (dtype object) viram unicode de largura fixa, que pode ser mapeado em memória."""
+    if rotulos.dtype == object:
+        return rotulos.astype(str)
+    return rotulos
+
+
+def _alinhar(posicao):
+    return (posicao + _ALINHAMENTO - 1) // _ALINHAMENTO * _ALINHAMENTO
@@ -0,0 +1,122 @@
+import numpy as np
+
+from grafo_compacto import GrafoCompacto
+
+
+# Quantis reportados nas estatísticas de grau
+QUANTIS = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+# Mínimo de nós na cauda para aceitar um xmin no ajuste da lei de potência
+_CAUDA_MINIMA = 10
+
+
+# Função para calcular os graus de todos os nós de uma vez (bincount sobre os arrays de arestas)
+def calcular_graus(grafo):
+    """
+    Retorna {"entrada", "saida", "total"} com arrays NumPy de graus, um por nó.
+    No GrafoCompacto os graus saem direto do CSR; no networkx, de np.bincount sobre as arestas.
+    """
+    if isinstance(grafo, GrafoCompacto):
+        return {"entrada": grafo.graus_entrada(), "saida": grafo.graus_saida(), "total": grafo.graus()}
+
+    nos = list(grafo.nodes)
+    posicao = {no: i for i, no in enumerate(nos)}
+    arestas = np.array([(posicao[u], posicao[v]) for u, v in grafo.edges()], dtype=np.int64).reshape(-1, 2)
+    n = len(nos)
+    saida = np.bincount(arestas[:, 0], minlength=n)
+    entrada = np.bincount(arestas[:, 1], minlength=n)
+    if grafo.is_directed():
+        return {"entrada": entrada, "saida": saida, "total": entrada + saida}
+    total = entrada + saida
+    return {"entrada": total, "saida": total, "total": total}
+
+
+# Função para calcular as estatísticas de graus (entrada/saída/total) de um grafo
+def estatisticas_graus_grafo(grafo, graus=None):
+    """Estatísticas de graus por tipo: {"entrada", "saida", "total"} nos dirigidos, só {"total"} nos não dirigidos."""
+    if graus is None:
+        graus = calcular_graus(grafo)
+    tipos = ("entrada", "saida", "total") if grafo.is_directed() else ("total",)
+    return {tipo: estatisticas_graus(graus[tipo]) for tipo in tipos}
+
+
+# Função para resumir um array de graus
+def estatisticas_graus(graus, caixas_log=30):
+    """
+    Média, variância, quantis, distribuição (grau -> quantidade de nós), CCDF P(X >= x),
+    histograma com caixas logarítmicas e ajuste de lei de potência por máxima verossimilhança.
+    """
+    graus = np.asarray(graus, dtype=np.int64)
+    contagens = np.bincount(graus) if len(graus) else np.zeros(1, dtype=np.int64)
+    valores = np.flatnonzero(contagens)
+    return {
+        "n": len(graus),
+        "media": float(graus.mean()) if len(graus) else float("nan"),
+        "variancia": float(graus.var()) if len(graus) else float("nan"),
+        "minimo": int(graus.min()) if len(graus) else 0,
+        "maximo": int(graus.max()) if len(graus) else 0,
+        "quantis": {q: float(v) for q, v in zip(QUANTIS, np.quantile(graus, QUANTIS))} if len(graus) else {},
+        "distribuicao": {"graus": valores, "quantidades": contagens[valores]},
+        "ccdf": _ccdf(valores, contagens[valores]),
+        "histograma_log": _histograma_log(graus, caixas_log),
+        "lei_de_potencia": ajustar_lei_de_potencia(graus),
+    }
+
+
+# Função para ajustar uma lei de potência P(k) ~ k^-alfa à cauda da distribuição de graus
+def ajustar_lei_de_potencia(graus, xmin=None):
+    """
+    Estimador de máxima verossimilhança (Clauset, Shalizi e Newman) para dados discretos:
+    alfa = 1 + n / sum(ln(k / (xmin - 1/2))), com erro padrão (alfa - 1) / sqrt(n).
+    Sem `xmin`, escolhe o valor que minimiza a distância de Kolmogorov-Smirnov da cauda.
+    """
+    graus = np.sort(np.asarray(graus, dtype=np.float64))
+    graus = graus[graus > 0]
+    if len(graus) < _CAUDA_MINIMA:
+        return None
+
+    candidatos = [xmin] if xmin is not None else np.unique(graus)
+    melhor = None
+    for candidato in candidatos:
+        cauda = graus[np.searchsorted(graus, candidato):]
+        if len(cauda) < _CAUDA_MINIMA:
+            break
+        alfa = 1 + len(cauda) / np.sum(np.log(cauda / (candidato - 0.5)))
+        # KS entre a CCDF empírica da cauda e a do modelo (aproximação contínua)
+        unicos, primeiros = np.unique(cauda, return_index=True)
+        empirica = 1 - primeiros / len(cauda)
+        modelo = (unicos / candidato) ** (1 - alfa)
+        ks = float(np.max(np.abs(empirica - modelo)))
+        if melhor is None or ks < melhor["ks"]:
+            melhor = {
+                "alfa": float(alfa),
+                "erro_padrao": float((alfa - 1) / np.sqrt(len(cauda))),
+                "xmin": int(candidato),
+                "nos_na_cauda": len(cauda),
+                "ks": ks,
+            }
+    return melhor
+
+
+def _ccdf(valores, quantidades):
+    """P(X >= x) para cada grau x presente."""
+    total = quantidades.sum()
+    maiores_ou_iguais = np.cumsum(quantidades[::-1])[::-1]
+    return {"graus": valores, "probabilidades": maiores_ou_iguais / total if total else maiores_ou_iguais}
+
+
+def _histograma_log(graus, caixas):
+    """Histograma com caixas de largura crescente (logarítmica), normalizado pela largura da caixa."""
+    positivos = graus[graus > 0]
+    if not len(positivos):
+        return {"bordas": np.empty(0), "centros": np.empty(0), "densidades": np.empty(0)}
+    bordas = np.unique(np.floor(np.logspace(0, np.log10(positivos.max() + 1), caixas + 1)))
+    if len(bordas) < 2:
+        bordas = np.array([1.0, positivos.max() + 1.0])
+    contagens, bordas = np.histogram(positivos, bins=bordas)
+    larguras = np.diff(bordas)
+    return {
+        "bordas": bordas,
+        "centros": np.sqrt(bordas[:-1] * bordas[1:]),
+        "densidades": contagens / (larguras * len(positivos)),
+    }
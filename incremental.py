@@ -0,0 +1,624 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from componentes import comprimir_caminhos, histograma_tamanhos, numerar_componentes
+from grafo_compacto import GrafoCompacto, csr_de_pares, rotulos_para_disco
+from metricas import METRICAS, MetricasGrafo
+from pajek import ler_pajek
+
+
+# Diretório padrão do estado incremental (um subdiretório por rede)
+DIRETORIO_INCREMENTAL = ".incremental"
+
+# Métricas mantidas a cada lote; as demais ficam obsoletas e são recalculadas sob demanda
+METRICAS_MANTIDAS = ("graus", "grau_medio", "densidade", "componentes")
+
+# Arquivos do estado: resumo em JSON, logs (só acrescentados) das arestas e dos rótulos novos e o
+# retrato dos arrays por nó, regravado só por GrafoIncremental.compactar
+_ARQUIVO_ESTADO = "estado.json"
+_ARQUIVO_ARESTAS = "arestas_novas.bin"
+_ARQUIVO_ROTULOS = "rotulos_novos.jsonl"
+_ARQUIVO_RETRATO = "retrato.npz"
+
+
+class GrafoIncremental:
+    """
+    Grafo base (GrafoCompacto, normalmente o cache mapeado em memória) mais os lotes de arestas
+    aplicados depois dele. Cada lote atualiza em tempo proporcional ao seu tamanho: contagens de
+    nós e arestas, graus e histograma de graus, componentes (fracos) por union-find e o tamanho do
+    maior componente. O grafo completo só é remontado quando alguma métrica não mantida
+    (pontes, distâncias, layout, ...) é pedida, e `chave` muda a cada lote, então essas métricas
+    são recalculadas uma vez por estado e guardadas no CacheResultados.
+    Os índices dos nós seguem a ordem de chegada (base primeiro); `grafo()` devolve o grafo com os
+    rótulos ordenados, igual ao que carregar o arquivo completo produziria.
+    Em disco (salvar / abrir), cada lote só acrescenta suas arestas e rótulos novos aos logs; os
+    arrays por nó (O(n)) só são regravados por compactar().
+    """
+
+    def __init__(self, base, chave=None):
+        self.base = base
+        self.dirigido = base.is_directed()
+        self.chave = chave
+        self.lotes = []
+        self.rotulos = base.rotulos.tolist()
+        self._indice = {rotulo: i for i, rotulo in enumerate(self.rotulos)}
+        self._tipo_rotulo = str if np.asarray(base.rotulos).dtype.kind in "USO" else None
+        n = base.number_of_nodes()
+        self.numero_arestas = base.number_of_edges()
+        # Grau: tamanho da linha no CSR (laço conta 1) e laços por nó (no total o laço conta 2, como no networkx)
+        self._linha = base.graus_saida()
+        self._entrada = base.graus_entrada()
+        self._lacos = base.graus() - self._linha if not self.dirigido else np.zeros(n, dtype=np.int64)
+        self.histograma = np.bincount(self._graus_totais(np.arange(n)), minlength=1).astype(np.int64)
+        # Union-find: cada nó aponta para o primeiro nó do seu componente
+        componente, tamanhos = base.componentes_conexos()
+        _, primeiros = np.unique(componente, return_index=True)
+        self._pai = primeiros[componente].astype(np.int64)
+        self._tamanho = np.zeros(n, dtype=np.int64)
+        self._tamanho[primeiros] = tamanhos
+        self.numero_componentes = len(tamanhos)
+        self.maior_componente = int(tamanhos.max()) if len(tamanhos) else 0
+        # Arestas novas (índices de chegada) por lote e as chaves u << 32 | v de todas, ordenadas
+        self._origens_novas = []
+        self._destinos_novos = []
+        self._chaves_novas = np.empty(0, dtype=np.int64)
+        self._chaves_na_base = None
+        self._grafo = None
+        self._ordem = None
+
+    def number_of_nodes(self):
+        return len(self.rotulos)
+
+    def number_of_edges(self):
+        return self.numero_arestas
+
+    def aplicar_arestas(self, origens, destinos):
+        """
+        Acrescenta um lote de arestas (rótulos originais). Arestas já existentes e repetidas no lote
+        são ignoradas; rótulos novos viram nós novos. Retorna o resumo do lote.
+        """
+        inicio = time.perf_counter()
+        origens, destinos = np.asarray(origens), np.asarray(destinos)
+        if self._tipo_rotulo is str:
+            origens, destinos = origens.astype(str), destinos.astype(str)
+        else:
+            # Rótulos lidos como texto (ex.: lista de arestas) viram o tipo dos rótulos da base: "1" e 1 são o mesmo nó
+            tipo = np.asarray(self.base.rotulos).dtype
+            try:
+                origens, destinos = origens.astype(tipo), destinos.astype(tipo)
+            except ValueError:
+                raise ValueError(f"Rótulos do lote incompatíveis com os rótulos da base ({tipo})") from None
+        nos_antes = self.number_of_nodes()
+        u = self._internar(origens)
+        v = self._internar(destinos)
+        if not self.dirigido:
+            u, v = np.minimum(u, v), np.maximum(u, v)
+        pares = np.unique(np.stack([u, v], axis=1), axis=0) if len(u) else np.empty((0, 2), dtype=np.int64)
+        chaves = _chaves(pares[:, 0], pares[:, 1])
+        novas = pares[~_contidas(chaves, self._chaves_novas) & ~_contidas(chaves, self._chaves_base())]
+        fusoes = self._acrescentar_pares(novas[:, 0], novas[:, 1]) if len(novas) else 0
+        resumo = {
+            "arestas_lidas": len(origens),
+            "arestas_novas": len(novas),
+            "nos_novos": self.number_of_nodes() - nos_antes,
+            "fusoes_componentes": fusoes,
+            "segundos": time.perf_counter() - inicio,
+        }
+        if len(novas):
+            # A chave do estado encadeia a do estado anterior com o conteúdo do lote
+            conteudo = hashlib.sha256(np.ascontiguousarray(novas, dtype=np.int64).tobytes()).hexdigest()
+            self.chave = hashlib.sha256(f"{self.chave}|{conteudo}".encode("utf-8")).hexdigest()
+            self.lotes.append({"arestas_novas": len(novas), "nos_novos": resumo["nos_novos"],
+                               "data": time.strftime("%Y-%m-%dT%H:%M:%S"), "chave": self.chave})
+        return resumo
+
+    def aplicar_arquivo(self, caminho_arquivo, coluna_origem=None, coluna_destino=None, formato=None):
+        """
+        Aplica um arquivo de arestas novas: CSV com as mesmas colunas do arquivo da rede ou, sem
+        colunas, lista de arestas "u v" por linha (rótulos lidos como texto, como no nx.read_edgelist, e
+        convertidos para o tipo dos rótulos da base).
+        Com formato="pajek", arcos e arestas de um arquivo Pajek (números de vértice inteiros).
+        """
+        if formato == "pajek":
+            pajek = ler_pajek(caminho_arquivo)
+            (u, v), (a, b) = pajek["arcos"], pajek["arestas"]
+            if self.dirigido:
+                # Cada aresta não dirigida do arquivo vira dois arcos
+                origens, destinos = np.concatenate([u, a, b]), np.concatenate([v, b, a])
+            else:
+                origens, destinos = np.concatenate([u, a]), np.concatenate([v, b])
+        else:
+            import pandas as pd
+
+            if coluna_origem is None:
+                arestas = pd.read_csv(caminho_arquivo, sep=r"\s+", header=None, usecols=[0, 1], dtype=str, comment="#")
+                coluna_origem, coluna_destino = 0, 1
+            else:
+                arestas = pd.read_csv(caminho_arquivo, usecols=[coluna_origem, coluna_destino])
+            origens, destinos = arestas[coluna_origem].to_numpy(), arestas[coluna_destino].to_numpy()
+        resumo = self.aplicar_arestas(origens, destinos)
+        if self.lotes and resumo["arestas_novas"]:
+            self.lotes[-1]["arquivo"] = os.path.abspath(caminho_arquivo)
+        return resumo
+
+    def graus(self):
+        """Graus por nó no formato de graus.calcular_graus (ordem de chegada dos nós)."""
+        n = self.number_of_nodes()
+        if self.dirigido:
+            saida, entrada = self._linha[:n], self._entrada[:n]
+            return {"entrada": entrada.copy(), "saida": saida.copy(), "total": entrada + saida}
+        return {"entrada": self._linha[:n].copy(), "saida": self._linha[:n].copy(),
+                "total": self._linha[:n] + self._lacos[:n]}
+
+    def componentes(self):
+        """{"rotulos", "tamanhos", "histograma"} como a métrica "componentes" (na ordem de chegada dos nós)."""
+        rotulos, tamanhos = numerar_componentes(self._raizes())
+        return {"rotulos": rotulos, "tamanhos": tamanhos, "histograma": histograma_tamanhos(tamanhos)}
+
+    def resumo(self):
+        """Métricas mantidas, sem remontar o grafo."""
+        n = self.number_of_nodes()
+        graus = np.flatnonzero(self.histograma)
+        return {
+            "numero_nos": n,
+            "numero_arestas": self.numero_arestas,
+            "numero_componentes": self.numero_componentes,
+            "tamanho_maior_componente": self.maior_componente,
+            "grau_medio": float((self.histograma * np.arange(len(self.histograma))).sum() / n) if n else 0.0,
+            "histograma_graus": {"graus": graus, "quantidades": self.histograma[graus]},
+            "lotes": len(self.lotes),
+        }
+
+    def grafo(self):
+        """GrafoCompacto completo (base + lotes) com rótulos ordenados; remontado só após um lote novo."""
+        if self._grafo is None:
+            self._grafo = self._montar_grafo()
+        return self._grafo
+
+    def metricas(self, nome=None, cache=None, arquivo=None, **opcoes):
+        """
+        MetricasGrafo do estado atual. As métricas mantidas já entram calculadas, sem montar o grafo;
+        o CSR completo só é montado quando uma métrica não mantida (pontes, distâncias, ...) pede os
+        arrays, e essas métricas, com `cache`, ficam guardadas sob `chave`, então cada uma é recalculada
+        no máximo uma vez por lote. `opcoes` vão para o MetricasGrafo.
+        """
+        ordem = self._ordem_rotulos()
+        graus = {tipo: valores[ordem] for tipo, valores in self.graus().items()}
+        # Renumera os componentes na ordem dos nós do grafo montado (menor nó primeiro, como a BFS)
+        rotulos, tamanhos = numerar_componentes(self._raizes()[ordem])
+        componentes = {"rotulos": rotulos, "tamanhos": tamanhos, "histograma": histograma_tamanhos(tamanhos)}
+        # grau_medio e densidade saem das contagens mantidas (laços contam 2 no grau não dirigido)
+        n, m = self.number_of_nodes(), self.numero_arestas
+        if self.dirigido:
+            grau_medio = {"entrada": m / n, "saida": m / n}
+            pares = n * (n - 1)
+        else:
+            grau_medio = {"total": 2 * m / n}
+            pares = n * (n - 1) / 2
+        valores = {"graus": graus, "componentes": componentes, "grau_medio": grau_medio,
+                   "densidade": m / pares if n > 1 else 0.0}
+        return MetricasGrafo(_GrafoSobDemanda(self), nome=nome, cache=cache,
+                             chave_grafo=self.chave if cache is not None else None, arquivo=arquivo, valores=valores,
+                             **opcoes)
+
+    def obsoletas(self, cache=None, **opcoes):
+        """
+        Métricas persistentes não mantidas que ainda não foram calculadas para o estado atual
+        (todas, sem cache). São recalculadas quando pedidas ao objeto de metricas().
+        """
+        nao_mantidas = [nome for nome, definicao in METRICAS.items()
+                        if nome not in METRICAS_MANTIDAS and definicao["persistente"]]
+        if cache is None:
+            return nao_mantidas
+        # Mesmas opções (com os mesmos padrões) que o MetricasGrafo usaria para montar as chaves
+        opcoes = MetricasGrafo(self.base, **opcoes).opcoes
+        return [
+            nome for nome in nao_mantidas
+            if not cache.contem(cache.chave(self.chave, nome, METRICAS[nome]["versao"],
+                                            {opcao: opcoes[opcao] for opcao in METRICAS[nome]["opcoes"]}))
+        ]
+
+    def salvar(self, diretorio):
+        """
+        Grava em `diretorio` só o que mudou desde a última gravação, em tempo proporcional aos lotes
+        novos: as arestas e os rótulos novos são acrescentados aos logs e estado.json (contagens
+        gravadas, chave e lotes) é substituído de uma vez. Os arrays por nó ficam para compactar().
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        gravado = self._estado_gravado(diretorio)
+        arestas_gravadas = gravado.get("arestas_gravadas", 0)
+        nos_gravados = gravado.get("nos_gravados", 0)
+        n_base = self.base.number_of_nodes()
+        with open(os.path.join(diretorio, _ARQUIVO_ARESTAS), "ab") as f:
+            # Descarta o que uma gravação interrompida tenha deixado depois da última registrada
+            f.truncate(arestas_gravadas * 2 * np.dtype(np.int64).itemsize)
+            f.write(self._pares_desde(arestas_gravadas).tobytes())
+        with open(os.path.join(diretorio, _ARQUIVO_ROTULOS), "ab") as f:
+            f.truncate(gravado.get("bytes_rotulos", 0))
+            f.write("".join(f"{json.dumps(rotulo, ensure_ascii=False)}\n"
+                            for rotulo in self.rotulos[n_base + nos_gravados:]).encode("utf-8"))
+            bytes_rotulos = f.tell()
+        estado = {
+            "dirigido": self.dirigido,
+            "chave": self.chave,
+            "nos_base": n_base,
+            "arestas_gravadas": len(self._chaves_novas),
+            "nos_gravados": self.number_of_nodes() - n_base,
+            "bytes_rotulos": bytes_rotulos,
+            "lotes": self.lotes,
+        }
+        caminho = os.path.join(diretorio, _ARQUIVO_ESTADO)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+
+    def compactar(self, diretorio):
+        """
+        Grava o estado (salvar) e um retrato dos arrays por nó (O(n)), do qual abrir() parte em vez
+        de recalcular os componentes da base e reaplicar o log inteiro. Para rodar de vez em quando.
+        """
+        self.salvar(diretorio)
+        n, n_base = self.number_of_nodes(), self.base.number_of_nodes()
+        contagens = [len(self._chaves_novas), n - n_base, self.numero_arestas, self.numero_componentes,
+                     self.maior_componente]
+        caminho = os.path.join(diretorio, _ARQUIVO_RETRATO)
+        temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+        np.savez(temporario, pai=self._pai[:n], tamanho=self._tamanho[:n], linha=self._linha[:n],
+                 entrada=self._entrada[:n], lacos=self._lacos[:n], histograma=self.histograma,
+                 contagens=np.array(contagens, dtype=np.int64))
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def abrir(cls, diretorio, base, chave=None):
+        """
+        Reabre um estado gravado sobre o mesmo grafo `base`; sem estado gravado, começa da base.
+        Parte do retrato da última compactação (ou da base) e reaplica as arestas e os rótulos
+        gravados depois dele.
+        """
+        estado = cls._estado_gravado(diretorio)
+        if not estado:
+            return cls(base, chave)
+        if estado["nos_base"] != base.number_of_nodes():
+            raise ValueError(f"O estado em {diretorio} foi criado sobre outro grafo base")
+        # Os logs podem ter dados além do registrado se uma gravação anterior foi interrompida
+        pares = np.empty((0, 2), dtype=np.int64)
+        caminho_arestas = os.path.join(diretorio, _ARQUIVO_ARESTAS)
+        if os.path.exists(caminho_arestas):
+            pares = np.fromfile(caminho_arestas, dtype=np.int64, count=2 * estado["arestas_gravadas"]).reshape(-1, 2)
+        rotulos_novos = []
+        caminho_rotulos = os.path.join(diretorio, _ARQUIVO_ROTULOS)
+        if os.path.exists(caminho_rotulos):
+            with open(caminho_rotulos, "rb") as f:
+                texto = f.read(estado["bytes_rotulos"]).decode("utf-8")
+            rotulos_novos = [json.loads(linha) for linha in texto.splitlines()]
+
+        caminho_retrato = os.path.join(diretorio, _ARQUIVO_RETRATO)
+        if os.path.exists(caminho_retrato):
+            retrato = np.load(caminho_retrato)
+            arestas_retrato, nos_retrato, *contagens = retrato["contagens"].tolist()
+            grafo = cls.__new__(cls)
+            grafo.base = base
+            grafo.dirigido = estado["dirigido"]
+            grafo.rotulos = base.rotulos.tolist() + rotulos_novos[:nos_retrato]
+            grafo._indice = {rotulo: i for i, rotulo in enumerate(grafo.rotulos)}
+            grafo._tipo_rotulo = str if np.asarray(base.rotulos).dtype.kind in "USO" else None
+            for nome in ("pai", "tamanho", "linha", "entrada", "lacos"):
+                setattr(grafo, f"_{nome}", retrato[nome].copy())
+            grafo.histograma = retrato["histograma"].copy()
+            grafo.numero_arestas, grafo.numero_componentes, grafo.maior_componente = contagens
+            grafo._origens_novas, grafo._destinos_novos = [], []
+            grafo._chaves_novas = np.empty(0, dtype=np.int64)
+            grafo._chaves_na_base = None
+            grafo._grafo = None
+            grafo._ordem = None
+            # Arestas já contadas no retrato: só entram no log e nas chaves
+            grafo._registrar_pares(pares[:arestas_retrato, 0], pares[:arestas_retrato, 1])
+        else:
+            arestas_retrato, nos_retrato = 0, 0
+            grafo = cls(base)
+        grafo._acrescentar_rotulos(rotulos_novos[nos_retrato:])
+        if len(pares) > arestas_retrato:
+            grafo._acrescentar_pares(pares[arestas_retrato:, 0], pares[arestas_retrato:, 1])
+        grafo.chave = estado["chave"]
+        grafo.lotes = estado["lotes"]
+        return grafo
+
+    @staticmethod
+    def _estado_gravado(diretorio):
+        caminho = os.path.join(diretorio, _ARQUIVO_ESTADO)
+        if not os.path.exists(caminho):
+            return {}
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _internar(self, rotulos):
+        """Rótulos -> índices internos; rótulos novos viram nós isolados (ver _acrescentar_rotulos)."""
+        unicos, inverso = np.unique(rotulos, return_inverse=True)
+        unicos = unicos.tolist()
+        indices = np.array([self._indice.get(rotulo, -1) for rotulo in unicos], dtype=np.int64)
+        novos = np.flatnonzero(indices < 0)
+        indices[novos] = np.arange(len(self.rotulos), len(self.rotulos) + len(novos))
+        self._acrescentar_rotulos([unicos[posicao] for posicao in novos])
+        return indices[inverso].reshape(-1)
+
+    def _acrescentar_rotulos(self, rotulos):
+        """Nós novos, no fim da ordem de chegada: isolados (grau 0, componente próprio)."""
+        if not rotulos:
+            return
+        for rotulo in rotulos:
+            self._indice[rotulo] = len(self.rotulos)
+            self.rotulos.append(rotulo)
+        self._ordem = None
+        self._garantir_capacidade(len(self.rotulos))
+        self.histograma[0] += len(rotulos)
+        self.numero_componentes += len(rotulos)
+        self.maior_componente = max(self.maior_componente, 1)
+
+    def _acrescentar_pares(self, u, v):
+        """Arestas novas (índices de chegada, sem repetidas): graus, componentes e log. Retorna as fusões."""
+        self._atualizar_graus(u, v)
+        fusoes = sum(self._unir(a, b) for a, b in zip(u.tolist(), v.tolist()))
+        self._registrar_pares(u, v)
+        self.numero_arestas += len(u)
+        self._grafo = None
+        return fusoes
+
+    def _registrar_pares(self, u, v):
+        """Guarda as arestas novas no log em memória e as suas chaves no array ordenado."""
+        u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+        self._origens_novas.append(u)
+        self._destinos_novos.append(v)
+        chaves = np.sort(_chaves(u, v))
+        self._chaves_novas = np.insert(self._chaves_novas, np.searchsorted(self._chaves_novas, chaves), chaves)
+
+    def _pares_desde(self, inicio):
+        """Pares (u, v) novos a partir do `inicio`-ésimo, sem concatenar os lotes anteriores a ele."""
+        restantes = len(self._chaves_novas) - inicio
+        partes = []
+        for u, v in zip(reversed(self._origens_novas), reversed(self._destinos_novos)):
+            if restantes <= 0:
+                break
+            quantidade = min(restantes, len(u))
+            partes.append(np.stack([u[len(u) - quantidade:], v[len(v) - quantidade:]], axis=1))
+            restantes -= quantidade
+        return np.concatenate(partes[::-1]).astype(np.int64) if partes else np.empty((0, 2), dtype=np.int64)
+
+    def _garantir_capacidade(self, n):
+        """Cresce os arrays por nó (dobrando) para caber `n` nós; posições novas são nós isolados."""
+        capacidade = len(self._pai)
+        if n <= capacidade:
+            return
+        nova = max(n, 2 * capacidade)
+        self._pai = np.concatenate([self._pai, np.arange(capacidade, nova, dtype=np.int64)])
+        self._tamanho = np.concatenate([self._tamanho, np.ones(nova - capacidade, dtype=np.int64)])
+        for nome in ("_linha", "_entrada", "_lacos"):
+            setattr(self, nome, np.concatenate([getattr(self, nome), np.zeros(nova - capacidade, dtype=np.int64)]))
+
+    def _chaves_base(self):
+        """
+        Chaves u << 32 | v das arestas da base, já ordenadas (linhas do CSR em ordem, vizinhos
+        ordenados); sem direção, só as com u <= v, como os pares dos lotes. Montadas no primeiro lote.
+        """
+        if self._chaves_na_base is None:
+            indptr = np.asarray(self.base.indptr, dtype=np.int64)
+            origens = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+            destinos = np.asarray(self.base.indices, dtype=np.int64)
+            if not self.dirigido:
+                metade = origens <= destinos
+                origens, destinos = origens[metade], destinos[metade]
+            self._chaves_na_base = _chaves(origens, destinos)
+        return self._chaves_na_base
+
+    def _graus_totais(self, nos):
+        if self.dirigido:
+            return self._linha[nos] + self._entrada[nos]
+        return self._linha[nos] + self._lacos[nos]
+
+    def _atualizar_graus(self, u, v):
+        """Atualiza graus e histograma só dos nós tocados pelo lote."""
+        tocados = np.unique(np.concatenate([u, v]))
+        antes = self._graus_totais(tocados)
+        if self.dirigido:
+            np.add.at(self._linha, u, 1)
+            np.add.at(self._entrada, v, 1)
+        else:
+            laco = u == v
+            np.add.at(self._linha, u, 1)
+            np.add.at(self._linha, v[~laco], 1)
+            np.add.at(self._lacos, u[laco], 1)
+        depois = self._graus_totais(tocados)
+        if depois.max() >= len(self.histograma):
+            self.histograma = np.concatenate(
+                [self.histograma, np.zeros(depois.max() + 1 - len(self.histograma), dtype=np.int64)]
+            )
+        np.subtract.at(self.histograma, antes, 1)
+        np.add.at(self.histograma, depois, 1)
+
+    def _raiz(self, x):
+        pai = self._pai
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    def _unir(self, a, b):
+        """União por tamanho; retorna True se a e b estavam em componentes diferentes."""
+        raiz_a, raiz_b = self._raiz(a), self._raiz(b)
+        if raiz_a == raiz_b:
+            return False
+        if self._tamanho[raiz_a] < self._tamanho[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self._pai[raiz_b] = raiz_a
+        self._tamanho[raiz_a] += self._tamanho[raiz_b]
+        self.numero_componentes -= 1
+        self.maior_componente = max(self.maior_componente, int(self._tamanho[raiz_a]))
+        return True
+
+    def _raizes(self):
+        """Raiz de cada nó, com compressão de caminho vetorizada (pai = pai[pai] até estabilizar)."""
+        return comprimir_caminhos(self._pai[:self.number_of_nodes()])
+
+    def _ordem_rotulos(self):
+        """
+        Ordem dos nós (índices de chegada) com os rótulos ordenados, como no grafo montado. Os rótulos
+        da base já vêm ordenados: só os rótulos novos são ordenados e intercalados (busca binária).
+        """
+        if self._ordem is None:
+            n_base = self.base.number_of_nodes()
+            rotulos_base = np.asarray(self.base.rotulos)
+            novos = np.array(self.rotulos[n_base:], dtype=str if self._tipo_rotulo else rotulos_base.dtype)
+            ordem_novos = np.argsort(novos, kind="stable")
+            posicoes = np.searchsorted(rotulos_base, novos[ordem_novos])
+            self._ordem = np.insert(np.arange(n_base, dtype=np.int64), posicoes, n_base + ordem_novos)
+        return self._ordem
+
+    def _montar_grafo(self):
+        """Base + arestas novas -> GrafoCompacto com rótulos ordenados."""
+        n = self.number_of_nodes()
+        rotulos = np.array(self.rotulos, dtype=np.asarray(self.base.rotulos).dtype if not self._tipo_rotulo else object)
+        ordem = self._ordem_rotulos()
+        nova_posicao = np.empty(n, dtype=np.int64)
+        nova_posicao[ordem] = np.arange(n)
+        origens = [np.repeat(np.arange(self.base.number_of_nodes(), dtype=np.int64), np.diff(self.base.indptr))]
+        destinos = [np.asarray(self.base.indices, dtype=np.int64)]
+        if self._origens_novas:
+            u, v = np.concatenate(self._origens_novas), np.concatenate(self._destinos_novos)
+            origens.append(u)
+            destinos.append(v)
+            if not self.dirigido:
+                sem_laco = u != v
+                origens.append(v[sem_laco])
+                destinos.append(u[sem_laco])
+        u = nova_posicao[np.concatenate(origens)]
+        v = nova_posicao[np.concatenate(destinos)]
+        indptr, indices = csr_de_pares(u, v, n)
+        rotulos = rotulos_para_disco(rotulos[ordem]) if self._tipo_rotulo else rotulos[ordem]
+        if self.dirigido:
+            indptr_entrada, indices_entrada = csr_de_pares(v, u, n)
+            return GrafoCompacto(indptr, indices, rotulos, True, indptr_entrada, indices_entrada)
+        return GrafoCompacto(indptr, indices, rotulos, False)
+
+
+def _chaves(u, v):
+    """Chave de cada par (u, v) de índices de nós, que ordena os pares como (u, v)."""
+    return np.left_shift(np.asarray(u, dtype=np.int64), 32) | np.asarray(v, dtype=np.int64)
+
+
+def _contidas(chaves, ordenadas):
+    """Máscara das `chaves` presentes no array ordenado `ordenadas` (busca binária vetorizada)."""
+    if not len(ordenadas):
+        return np.zeros(len(chaves), dtype=bool)
+    posicao = np.minimum(np.searchsorted(ordenadas, chaves), len(ordenadas) - 1)
+    return ordenadas[posicao] == chaves
+
+
+class _GrafoSobDemanda(GrafoCompacto):
+    """
+    Grafo de GrafoIncremental.metricas: nós, arestas e direção vêm das contagens mantidas; os arrays
+    (indptr, indices, rótulos, ...) só são montados, com GrafoIncremental.grafo, no primeiro acesso.
+    """
+
+    def __init__(self, estado):
+        self._estado = estado
+        self.dirigido = estado.dirigido
+        self._lacos = None if estado.dirigido else int(estado._lacos[:estado.number_of_nodes()].sum())
+
+    def number_of_nodes(self):
+        return self._estado.number_of_nodes()
+
+    def number_of_edges(self):
+        return self._estado.numero_arestas
+
+    @property
+    def indptr(self):
+        return self._estado.grafo().indptr
+
+    @property
+    def indices(self):
+        return self._estado.grafo().indices
+
+    @property
+    def rotulos(self):
+        return self._estado.grafo().rotulos
+
+    @property
+    def indptr_entrada(self):
+        return self._estado.grafo().indptr_entrada
+
+    @property
+    def indices_entrada(self):
+        return self._estado.grafo().indices_entrada
+
+    @property
+    def nomes(self):
+        return self._estado.grafo().nomes
+
+
+# Bloco principal: aplica um lote de arestas a uma rede de redes.json, mostra o resumo ou recalcula métricas
+if __name__ == "__main__":
+    import analise_grafos
+    from cache_resultados import CacheResultados
+
+    parser = argparse.ArgumentParser(description="Atualização incremental das redes de redes.json.")
+    parser.add_argument("--config", default=analise_grafos.ARQUIVO_REDES, help="Arquivo JSON com as redes.")
+    parser.add_argument("--diretorio", default=DIRETORIO_INCREMENTAL, help="Diretório do estado incremental.")
+    parser.add_argument("--sem-cache", action="store_true", help="Não usa o cache de resultados.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    aplicar = subcomandos.add_parser("aplicar", help="Aplica um arquivo de arestas novas (mesmo formato da rede).")
+    aplicar.add_argument("rede", help="Rede da configuração (--config).")
+    aplicar.add_argument("arquivo")
+    resumir = subcomandos.add_parser("resumo", help="Mostra as métricas mantidas e as que estão obsoletas.")
+    resumir.add_argument("rede", help="Rede da configuração (--config).")
+    recalcular = subcomandos.add_parser("recalcular", help="Recalcula as métricas obsoletas (ou as pedidas).")
+    recalcular.add_argument("rede", help="Rede da configuração (--config).")
+    recalcular.add_argument("--metricas", nargs="+", choices=list(METRICAS), default=None)
+    compactar = subcomandos.add_parser("compactar", help="Regrava os arrays por nó (O(n)): o estado abre mais rápido.")
+    compactar.add_argument("rede", help="Rede da configuração (--config).")
+    argumentos = parser.parse_args()
+
+    try:
+        configuracao = analise_grafos.usar_configuracao_redes(argumentos.config)
+    except (OSError, ValueError) as erro:
+        parser.error(f"configuração inválida em {argumentos.config}: {erro}")
+    if argumentos.rede not in configuracao:
+        parser.error(f"rede desconhecida: {argumentos.rede} (opções: {', '.join(configuracao)})")
+    dados = configuracao[argumentos.rede]
+    cache_resultados = None if argumentos.sem_cache else CacheResultados()
+    diretorio = os.path.join(argumentos.diretorio, argumentos.rede)
+    estado = analise_grafos.abrir_estado_incremental(argumentos.rede, cache_resultados, diretorio=argumentos.diretorio)
+    # Mesmas opções de métricas que analise_grafos usa para a rede (a chave no cache depende delas)
+    opcoes = {"modo_distancias": "exato"} if dados["analise"] == "citacoes" else {"modo_distancias": "amostragem"}
+
+    if argumentos.comando == "aplicar":
+        if dados["formato"] == "csv":
+            lote = estado.aplicar_arquivo(argumentos.arquivo, dados["coluna_origem"], dados["coluna_destino"])
+        elif dados["formato"] == "pajek":
+            lote = estado.aplicar_arquivo(argumentos.arquivo, formato="pajek")
+        else:
+            lote = estado.aplicar_arquivo(argumentos.arquivo)
+        estado.salvar(diretorio)
+        print(f"{lote['arestas_lidas']:,} arestas lidas, {lote['arestas_novas']:,} novas, {lote['nos_novos']:,} nós novos, "
+              f"{lote['fusoes_componentes']:,} fusões de componentes em {lote['segundos']:.2f}s.")
+    elif argumentos.comando == "compactar":
+        estado.compactar(diretorio)
+    elif argumentos.comando == "recalcular":
+        nomes = argumentos.metricas or estado.obsoletas(cache_resultados, **opcoes)
+        metricas = estado.metricas(nome=argumentos.rede, cache=cache_resultados, arquivo=dados["caminho"], **opcoes)
+        for nome in nomes:
+            inicio = time.perf_counter()
+            metricas[nome]
+            print(f"{nome}: {time.perf_counter() - inicio:.2f}s")
+
+    resumo = estado.resumo()
+    print(f"Rede {argumentos.rede}: {resumo['numero_nos']:,} nós, {resumo['numero_arestas']:,} arestas, "
+          f"{resumo['lotes']} lote(s) aplicado(s).")
+    print(f"Componentes: {resumo['numero_componentes']:,} (maior: {resumo['tamanho_maior_componente']:,} nós); "
+          f"grau médio: {resumo['grau_medio']:.4f}.")
+    obsoletas = estado.obsoletas(cache_resultados, **opcoes)
+    print(f"Métricas obsoletas: {', '.join(obsoletas) if obsoletas else 'nenhuma'}.")
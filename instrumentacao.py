@@ -0,0 +1,212 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, a memória por RSS fica indisponível
+    resource = None
+
+from exportacao import nome_de_arquivo
+
+
+# Fontes de memória aceitas: RSS do processo (barato), tracemalloc (preciso, mais lento) ou nenhuma
+FONTES_MEMORIA = ("rss", "tracemalloc", "nenhuma")
+
+# Instrumentação ativa (None: etapa() não mede nada)
+_INSTRUMENTACAO = None
+
+# Nota das etapas que rodaram junto com outra thread (ex.: pré-carga da próxima rede)
+_NOTA_SIMULTANEA = "Etapa simultânea a outra thread: memória do processo não atribuível a ela (não medida)."
+
+
+class Instrumentacao:
+    """
+    Mede cada etapa do pipeline (carregamento de uma rede, cada Questão): tempo de parede, tempo de
+    CPU da thread da etapa (time.thread_time: a pré-carga da próxima rede não soma a CPU da análise
+    em andamento), pico de memória e tamanho do grafo. Etapas podem ser aninhadas; cada uma vira um
+    registro em `self.etapas`, na ordem em que terminam.
+    Memória: "rss" usa o pico de RSS do processo (getrusage: só cresce, então o aumento na etapa é o
+    que ela acrescentou ao pico); "tracemalloc" mede o pico de alocações Python/NumPy da própria
+    etapa, com custo extra de tempo em código Python puro.
+    A pilha de etapas em andamento é por thread (ex.: a pré-carga da próxima rede mede o próprio
+    carregamento). As duas fontes de memória são do processo inteiro: etapas que rodaram ao mesmo
+    tempo que outra thread ficam com "simultanea" True e sem memória (None), porque o valor medido
+    não é só delas.
+    Com `diretorio_perfil`, cada etapa iniciada sem outro perfil em andamento é perfilada com cProfile e gravada
+    em <diretorio_perfil>/<grupo>_<etapa>.prof (abra com pstats ou snakeviz).
+    """
+
+    def __init__(self, memoria="rss", diretorio_perfil=None):
+        if memoria not in FONTES_MEMORIA:
+            raise ValueError(f"Fonte de memória desconhecida: {memoria} (opções: {', '.join(FONTES_MEMORIA)})")
+        if memoria == "rss" and resource is None:
+            memoria = "nenhuma"
+        self.memoria = memoria
+        self.diretorio_perfil = diretorio_perfil
+        self.etapas = []
+        self._local = threading.local()
+        self._perfilando = False
+        # Etapas em andamento em todas as threads, para marcar as que se sobrepõem
+        self._em_andamento = []
+        self._trava = threading.Lock()
+        if diretorio_perfil is not None:
+            os.makedirs(diretorio_perfil, exist_ok=True)
+        if memoria == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def etapa(self, nome, grupo=None, grafo=None):
+        registro = {"etapa": nome, "grupo": grupo, "nivel": len(self._pilha), "nos": None, "arestas": None,
+                    "perfil": None}
+        if grafo is not None:
+            _tamanho_do_grafo(registro, grafo)
+        perfil = None
+        # Um perfil por vez no processo (etapas aninhadas ou em outra thread entram no perfil de fora)
+        if self.diretorio_perfil is not None and not self._perfilando:
+            import cProfile
+
+            perfil = cProfile.Profile()
+            self._perfilando = True
+        estado = {"registro": registro, "perfil": perfil, "pico_filhas": 0, "thread": threading.get_ident(),
+                  "simultanea": False}
+        with self._trava:
+            for outra in self._em_andamento:
+                if outra["thread"] != estado["thread"]:
+                    outra["simultanea"] = estado["simultanea"] = True
+            self._em_andamento.append(estado)
+        if self.memoria == "tracemalloc":
+            atual, pico = tracemalloc.get_traced_memory()
+            if self._pilha:
+                # Guarda o pico da etapa de fora até aqui antes de zerar o contador para esta
+                self._pilha[-1]["pico_filhas"] = max(self._pilha[-1]["pico_filhas"], pico)
+            tracemalloc.reset_peak()
+            estado["memoria_inicial"] = atual
+        elif self.memoria == "rss":
+            estado["memoria_inicial"] = _pico_rss()
+        self._pilha.append(estado)
+        inicio_parede, inicio_cpu = time.perf_counter(), time.thread_time()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            yield registro
+        finally:
+            if perfil is not None:
+                perfil.disable()
+                self._perfilando = False
+            registro["segundos"] = time.perf_counter() - inicio_parede
+            registro["segundos_cpu"] = time.thread_time() - inicio_cpu
+            self._pilha.pop()
+            with self._trava:
+                self._em_andamento.remove(estado)
+            registro["simultanea"] = estado["simultanea"]
+            self._medir_memoria(registro, estado)
+            if perfil is not None:
+                nome_arquivo = nome_de_arquivo(f"{grupo}_{nome}" if grupo else nome)
+                caminho = os.path.join(self.diretorio_perfil, f"{nome_arquivo}.prof")
+                perfil.dump_stats(caminho)
+                registro["perfil"] = caminho
+            self.etapas.append(registro)
+
+    @property
+    def _pilha(self):
+        if not hasattr(self._local, "pilha"):
+            self._local.pilha = []
+        return self._local.pilha
+
+    def registrar_grafo(self, grafo):
+        """Anota o tamanho de `grafo` na etapa em andamento mais interna (ex.: o grafo que ela acabou de carregar)."""
+        if self._pilha:
+            _tamanho_do_grafo(self._pilha[-1]["registro"], grafo)
+
+    def tabela(self):
+        """Resumo das etapas em texto, para o console."""
+        linhas = [f"{'Etapa':<44} {'Parede (s)':>10} {'CPU (s)':>9} {'Memória (MB)':>13} {'Nós':>11} {'Arestas':>12}"]
+        for registro in self.etapas:
+            nome = "  " * registro["nivel"] + (f"{registro['grupo']}: " if registro["grupo"] else "") + registro["etapa"]
+            if registro["simultanea"]:
+                nome = f"{nome[:42]} *"
+            memoria = registro["memoria_pico_bytes"]
+            linhas.append(
+                f"{nome[:44]:<44} {registro['segundos']:>10.2f} {registro['segundos_cpu']:>9.2f} "
+                f"{'—' if memoria is None else f'{memoria / 2 ** 20:,.1f}':>13} "
+                f"{_inteiro(registro['nos']):>11} {_inteiro(registro['arestas']):>12}"
+            )
+        if any(registro["simultanea"] for registro in self.etapas):
+            linhas.append(f"* {_NOTA_SIMULTANEA}")
+        return "\n".join(linhas)
+
+    def para_json(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump({"memoria": self.memoria, "etapas": self.etapas}, f, ensure_ascii=False, indent=2)
+
+    def _medir_memoria(self, registro, estado):
+        registro["memoria_fonte"] = self.memoria
+        if estado["simultanea"]:
+            # A etapa de fora (mesma thread) também se sobrepõe à outra thread e fica sem memória
+            registro["memoria_pico_bytes"] = registro["memoria_aumento_bytes"] = None
+        elif self.memoria == "tracemalloc":
+            pico = max(tracemalloc.get_traced_memory()[1], estado["pico_filhas"])
+            registro["memoria_pico_bytes"] = pico
+            registro["memoria_aumento_bytes"] = max(pico - estado["memoria_inicial"], 0)
+            if self._pilha:
+                self._pilha[-1]["pico_filhas"] = max(self._pilha[-1]["pico_filhas"], pico)
+        elif self.memoria == "rss":
+            pico = _pico_rss()
+            registro["memoria_pico_bytes"] = pico
+            registro["memoria_aumento_bytes"] = pico - estado["memoria_inicial"]
+        else:
+            registro["memoria_pico_bytes"] = registro["memoria_aumento_bytes"] = None
+
+
+# Função para ativar a instrumentação: a partir daí cada etapa() é medida
+def ativar_instrumentacao(memoria="rss", diretorio_perfil=None):
+    global _INSTRUMENTACAO
+    _INSTRUMENTACAO = Instrumentacao(memoria, diretorio_perfil)
+    return _INSTRUMENTACAO
+
+
+# Função para encerrar a instrumentação ativa; retorna o objeto com as etapas medidas (ou None)
+def finalizar_instrumentacao():
+    global _INSTRUMENTACAO
+    instrumentacao, _INSTRUMENTACAO = _INSTRUMENTACAO, None
+    if instrumentacao is not None and instrumentacao.memoria == "tracemalloc" and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return instrumentacao
+
+
+# Função usada pelo pipeline para marcar uma etapa (sem instrumentação ativa, não faz nada)
+@contextmanager
+def etapa(nome, grupo=None, grafo=None):
+    """Uso: with etapa("Questão 1B", rede, grafo): ...  — `grupo` é a rede; `grafo` dá o tamanho da etapa."""
+    if _INSTRUMENTACAO is None:
+        yield None
+    else:
+        with _INSTRUMENTACAO.etapa(nome, grupo, grafo) as registro:
+            yield registro
+
+
+# Função para anotar o grafo carregado na etapa em andamento
+def registrar_grafo(grafo):
+    if _INSTRUMENTACAO is not None:
+        _INSTRUMENTACAO.registrar_grafo(grafo)
+
+
+def _tamanho_do_grafo(registro, grafo):
+    registro["nos"] = int(grafo.number_of_nodes())
+    registro["arestas"] = int(grafo.number_of_edges())
+
+
+def _inteiro(valor):
+    return "—" if valor is None else f"{valor:,}"
+
+
+def _pico_rss():
+    """Pico de RSS do processo em bytes (ru_maxrss vem em KB no Linux e em bytes no macOS)."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
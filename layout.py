@@ -0,0 +1,279 @@
+import numpy as np
+
+
+# Nós por célula (em média) na grade mais fina da aproximação de repulsão
+_NOS_POR_CELULA = 4
+
+# Máximo de pares do campo próximo por nó (acima disso a grade mais fina é refinada)
+_PARES_POR_NO = 64
+
+# Tamanho máximo do grafo mais grosseiro do esquema multinível
+_TAMANHO_MINIMO_NIVEL = 64
+
+# Pares por bloco no cálculo exato de repulsão entre células vizinhas (limita a memória)
+_PARES_POR_BLOCO = 4_000_000
+
+
+# Função para calcular o layout de um grafo inteiro (força dirigida multinível)
+def calcular_layout(grafo, iteracoes=40, iteracoes_nivel_grosseiro=200, semente=42):
+    """
+    Layout force-directed (Fruchterman-Reingold) multinível, vetorizado com NumPy.
+    O grafo é engrossado por emparelhamento de vizinhos até ficar pequeno; o nível mais grosseiro é
+    posicionado com muitas iterações e cada nível mais fino herda as posições e faz poucas iterações.
+    A repulsão usa uma aproximação tipo Barnes-Hut em grades hierárquicas (células distantes agem
+    pelo centro de massa), então cada iteração custa O(n log n + m) em vez de O(n²).
+    Retorna um array (n, 2) com as posições em [0, 1]².
+    """
+    gerador = np.random.default_rng(semente)
+    n = grafo.number_of_nodes()
+    if grafo.dirigido:
+        from grafo_compacto import simetrizar_csr
+
+        indptr, indices = simetrizar_csr(grafo.indptr, grafo.indices, grafo.indptr_entrada, grafo.indices_entrada)
+    else:
+        indptr, indices = grafo.indptr, grafo.indices
+    origens = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    destinos = np.asarray(indices, dtype=np.int64)
+    metade = origens < destinos
+    arestas = np.stack([origens[metade], destinos[metade]], axis=1)
+
+    # Hierarquia: (arestas, pesos das arestas, massas dos nós, mapa para o nível de cima)
+    niveis = [(arestas, np.ones(len(arestas)), np.ones(n), None)]
+    while len(niveis[-1][2]) > _TAMANHO_MINIMO_NIVEL:
+        arestas_nivel, pesos_nivel, massas_nivel, _ = niveis[-1]
+        mapa = _emparelhar(arestas_nivel, len(massas_nivel), gerador)
+        quantidade = int(mapa.max()) + 1
+        if quantidade > 0.95 * len(massas_nivel):
+            break  # o emparelhamento quase não reduz mais (ex.: muitos nós isolados)
+        arestas_grossas, pesos_grossos = _engrossar_arestas(arestas_nivel, pesos_nivel, mapa)
+        niveis[-1] = (arestas_nivel, pesos_nivel, massas_nivel, mapa)
+        niveis.append((arestas_grossas, pesos_grossos, np.bincount(mapa, weights=massas_nivel), None))
+
+    posicoes = gerador.random((len(niveis[-1][2]), 2))
+    for indice in range(len(niveis) - 1, -1, -1):
+        arestas_nivel, pesos_nivel, massas_nivel, mapa = niveis[indice]
+        if indice < len(niveis) - 1:
+            # Herda a posição do nó grosseiro, com uma pequena perturbação
+            posicoes = posicoes[niveis[indice][3]] + gerador.normal(0, 1e-3, (len(massas_nivel), 2))
+        quantidade_iteracoes = iteracoes_nivel_grosseiro if indice == len(niveis) - 1 else iteracoes
+        posicoes = _fruchterman_reingold(posicoes, arestas_nivel, pesos_nivel, massas_nivel, quantidade_iteracoes)
+    return _normalizar(posicoes)
+
+
+# Função para reduzir a quantidade de arestas desenhadas (decimação)
+def decimar_arestas(grafo, max_arestas=200_000, semente=42):
+    """
+    Arestas (u, v) do grafo como array (m, 2), cada aresta não dirigida uma única vez.
+    Acima de `max_arestas`, mantém uma amostra aleatória uniforme: a densidade visual das regiões
+    é preservada e o desenho continua interativo.
+    """
+    n = grafo.number_of_nodes()
+    origens = np.repeat(np.arange(n, dtype=np.int64), np.diff(grafo.indptr))
+    destinos = np.asarray(grafo.indices, dtype=np.int64)
+    if not grafo.dirigido:
+        metade = origens <= destinos
+        origens, destinos = origens[metade], destinos[metade]
+    if len(origens) > max_arestas:
+        escolhidas = np.sort(np.random.default_rng(semente).choice(len(origens), max_arestas, replace=False))
+        origens, destinos = origens[escolhidas], destinos[escolhidas]
+    return np.stack([origens, destinos], axis=1)
+
+
+# Função para rasterizar todas as arestas em uma imagem de densidade
+def rasterizar_arestas(posicoes, arestas, resolucao=1500, pontos_por_pixel=1.0):
+    """
+    Acumula as arestas em uma grade resolucao x resolucao: cada aresta é amostrada em pontos
+    espaçados de ~1 pixel e cada ponto soma 1 no pixel em que cai. Regiões com muitas arestas
+    sobrepostas ficam mais intensas (efeito parecido com o de agrupamento de arestas), e o custo
+    não depende de desenhar milhões de linhas. Retorna a matriz de contagens (linhas = eixo y).
+    """
+    imagem = np.zeros(resolucao * resolucao)
+    if not len(arestas):
+        return imagem.reshape(resolucao, resolucao)
+    inicio = posicoes[arestas[:, 0]] * (resolucao - 1)
+    fim = posicoes[arestas[:, 1]] * (resolucao - 1)
+    passos = np.maximum(np.ceil(np.abs(fim - inicio).max(axis=1) * pontos_por_pixel), 1).astype(np.int64)
+    # Processa em blocos para limitar a memória dos pontos intermediários
+    limites = np.searchsorted(np.cumsum(passos), np.arange(_PARES_POR_BLOCO, passos.sum(), _PARES_POR_BLOCO))
+    for bloco in np.split(np.arange(len(arestas)), np.unique(limites)):
+        if not len(bloco):
+            continue
+        quantidade = passos[bloco] + 1
+        aresta = np.repeat(bloco, quantidade)
+        fracao = (np.arange(len(aresta)) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)) / passos[aresta]
+        pontos = inicio[aresta] + (fim[aresta] - inicio[aresta]) * fracao[:, None]
+        pixels = np.rint(pontos).astype(np.int64)
+        imagem += np.bincount(pixels[:, 1] * resolucao + pixels[:, 0], minlength=resolucao * resolucao)
+    return imagem.reshape(resolucao, resolucao)
+
+
+def _fruchterman_reingold(posicoes, arestas, pesos, massas, iteracoes):
+    n = len(posicoes)
+    posicoes = _normalizar(posicoes)
+    k = np.sqrt(1.0 / max(massas.sum(), 1.0))  # distância ideal entre nós
+    temperatura = 0.1
+    resfriamento = (0.005 / temperatura) ** (1 / max(iteracoes, 1))
+    for _ in range(iteracoes):
+        deslocamento = k * k * massas[:, None] * repulsao_aproximada(posicoes, massas)
+        if len(arestas):
+            delta = posicoes[arestas[:, 0]] - posicoes[arestas[:, 1]]
+            distancia = np.sqrt((delta ** 2).sum(axis=1)) + 1e-12
+            atracao = delta * (pesos * distancia / k)[:, None]
+            for eixo in range(2):
+                deslocamento[:, eixo] -= np.bincount(arestas[:, 0], weights=atracao[:, eixo], minlength=n)
+                deslocamento[:, eixo] += np.bincount(arestas[:, 1], weights=atracao[:, eixo], minlength=n)
+        comprimento = np.sqrt((deslocamento ** 2).sum(axis=1)) + 1e-12
+        posicoes = posicoes + deslocamento * (np.minimum(comprimento, temperatura) / comprimento)[:, None]
+        posicoes = _normalizar(posicoes)
+        temperatura *= resfriamento
+    return posicoes
+
+
+# Função para calcular a repulsão entre todos os nós com custo O(n log n)
+def repulsao_aproximada(posicoes, massas):
+    """
+    Soma, para cada nó i, de m_j (x_i - x_j) / |x_i - x_j|² sobre todos os j != i.
+    Grades hierárquicas (2^l x 2^l células): em cada nível, as células filhas das vizinhas da célula-mãe
+    que não são vizinhas da própria célula (a "lista de interação") agem pelo seu centro de massa.
+    No nível mais fino, as 3x3 células vizinhas são somadas par a par, exatamente.
+    """
+    n = len(posicoes)
+    forca = np.zeros((n, 2))
+    if n < 2:
+        return forca
+    x = np.clip(posicoes, 0, 1 - 1e-9)
+    nivel_fino = _nivel_fino(x)
+
+    for nivel in range(2, nivel_fino + 1):
+        lado = 2 ** nivel
+        celula = np.floor(x * lado).astype(np.int64)
+        indice = celula[:, 0] * lado + celula[:, 1]
+        massa = np.bincount(indice, weights=massas, minlength=lado * lado)
+        centro = np.stack([np.bincount(indice, weights=massas * x[:, eixo], minlength=lado * lado) for eixo in range(2)], 1)
+        ocupadas = massa > 0
+        centro[ocupadas] /= massa[ocupadas, None]
+        massa = massa.reshape(lado, lado)
+        centro = centro.reshape(lado, lado, 2)
+        # A interação é calculada célula a célula (no centro de massa da célula alvo) e depois
+        # distribuída aos nós: o custo por nível é O(4^nivel) e não O(n)
+        forca_celula = np.zeros((lado, lado, 2))
+        paridade_x = (np.arange(lado) % 2)[:, None]
+        paridade_y = (np.arange(lado) % 2)[None, :]
+        for dx in range(-3, 4):
+            for dy in range(-3, 4):
+                if abs(dx) <= 1 and abs(dy) <= 1:
+                    continue
+                # A célula fonte precisa ser filha de uma vizinha da célula-mãe: depende da paridade do alvo
+                alvo_x = slice(max(0, -dx), min(lado, lado - dx))
+                alvo_y = slice(max(0, -dy), min(lado, lado - dy))
+                fonte_x = slice(max(0, dx), min(lado, lado + dx))
+                fonte_y = slice(max(0, dy), min(lado, lado + dy))
+                validos = ((-2 - paridade_x[alvo_x] <= dx) & (dx <= 3 - paridade_x[alvo_x]) &
+                           (-2 - paridade_y[:, alvo_y] <= dy) & (dy <= 3 - paridade_y[:, alvo_y]))
+                delta = centro[alvo_x, alvo_y] - centro[fonte_x, fonte_y]
+                quadrado = (delta ** 2).sum(axis=2) + 1e-12
+                peso = np.where(validos, massa[fonte_x, fonte_y] / quadrado, 0.0)
+                forca_celula[alvo_x, alvo_y] += delta * peso[:, :, None]
+        forca += forca_celula.reshape(-1, 2)[indice]
+
+    # Campo próximo: pares exatos entre células vizinhas no nível mais fino
+    lado = 2 ** nivel_fino
+    celula = np.floor(x * lado).astype(np.int64)
+    indice = celula[:, 0] * lado + celula[:, 1]
+    ordem = np.argsort(indice, kind="stable")
+    inicio_celula = np.searchsorted(indice[ordem], np.arange(lado * lado + 1))
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            cx, cy = celula[:, 0] + dx, celula[:, 1] + dy
+            validos = np.flatnonzero((cx >= 0) & (cx < lado) & (cy >= 0) & (cy < lado))
+            vizinha = cx[validos] * lado + cy[validos]
+            quantidades = inicio_celula[vizinha + 1] - inicio_celula[vizinha]
+            for bloco in _blocos_de_pares(quantidades):
+                nos = validos[bloco]
+                qtd = quantidades[bloco]
+                total = int(qtd.sum())
+                if not total:
+                    continue
+                deslocamentos = np.arange(total) - np.repeat(np.cumsum(qtd) - qtd, qtd)
+                j = ordem[np.repeat(inicio_celula[vizinha[bloco]], qtd) + deslocamentos]
+                i = np.repeat(nos, qtd)
+                diferentes = i != j
+                i, j = i[diferentes], j[diferentes]
+                delta_x, delta_y = x[i, 0] - x[j, 0], x[i, 1] - x[j, 1]
+                peso = massas[j] / (delta_x * delta_x + delta_y * delta_y + 1e-12)
+                forca[:, 0] += np.bincount(i, weights=delta_x * peso, minlength=n)
+                forca[:, 1] += np.bincount(i, weights=delta_y * peso, minlength=n)
+    return forca
+
+
+def _nivel_fino(x):
+    """
+    Nível da grade mais fina: parte de ~_NOS_POR_CELULA nós por célula e refina enquanto o campo
+    próximo (pares em células vizinhas) passar de _PARES_POR_NO por nó, o que acontece quando o
+    layout já tem aglomerados densos. A grade não passa de ~4 células por nó.
+    """
+    n = len(x)
+    nivel = max(2, int(np.ceil(np.log2(np.sqrt(n / _NOS_POR_CELULA)))))
+    while 4 ** nivel < 4 * n:
+        lado = 2 ** nivel
+        celula = np.floor(x * lado).astype(np.int64)
+        ocupacao = np.bincount(celula[:, 0] * lado + celula[:, 1], minlength=lado * lado).reshape(lado, lado)
+        borda = np.pad(ocupacao, 1)
+        vizinhanca = sum(borda[1 + dx:lado + 1 + dx, 1 + dy:lado + 1 + dy] for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        if int((ocupacao * vizinhanca).sum()) <= _PARES_POR_NO * n:
+            break
+        nivel += 1
+    return nivel
+
+
+def _blocos_de_pares(quantidades):
+    """Divide os nós em blocos cuja soma de pares não passa de _PARES_POR_BLOCO."""
+    if not len(quantidades):
+        return []
+    acumulado = np.cumsum(quantidades)
+    cortes = np.searchsorted(acumulado, np.arange(_PARES_POR_BLOCO, acumulado[-1], _PARES_POR_BLOCO))
+    return np.split(np.arange(len(quantidades)), np.unique(cortes))
+
+
+def _emparelhar(arestas, n, gerador):
+    """Emparelhamento guloso de vizinhos em ordem aleatória; retorna o nó grosseiro de cada nó."""
+    vizinhos = [[] for _ in range(n)]
+    for u, v in arestas.tolist():
+        vizinhos[u].append(v)
+        vizinhos[v].append(u)
+    par = [-1] * n
+    for u in gerador.permutation(n).tolist():
+        if par[u] != -1:
+            continue
+        par[u] = u
+        for v in vizinhos[u]:
+            if par[v] == -1:
+                par[u], par[v] = v, u
+                break
+    representante = np.minimum(np.arange(n), np.array(par))
+    # Nós que sobraram sem par (ex.: folhas de um hub) entram no grupo de um vizinho já emparelhado
+    for u in np.flatnonzero(representante == np.arange(n)).tolist():
+        if par[u] == u and vizinhos[u]:
+            representante[u] = representante[vizinhos[u][0]]
+    _, mapa = np.unique(representante, return_inverse=True)
+    return mapa
+
+
+def _engrossar_arestas(arestas, pesos, mapa):
+    """Arestas entre nós grosseiros distintos, somando os pesos das arestas repetidas."""
+    u, v = mapa[arestas[:, 0]], mapa[arestas[:, 1]]
+    diferentes = u != v
+    u, v, pesos = np.minimum(u, v)[diferentes], np.maximum(u, v)[diferentes], pesos[diferentes]
+    if not len(u):
+        return np.empty((0, 2), dtype=np.int64), np.empty(0)
+    chaves, inverso = np.unique(u * (int(mapa.max()) + 1) + v, return_inverse=True)
+    quantidade = int(mapa.max()) + 1
+    return np.stack([chaves // quantidade, chaves % quantidade], axis=1), np.bincount(inverso, weights=pesos)
+
+
+def _normalizar(posicoes):
+    minimo = posicoes.min(axis=0)
+    amplitude = (posicoes.max(axis=0) - minimo).max()
+    if amplitude <= 0:
+        return posicoes - minimo + 0.5
+    return (posicoes - minimo) / amplitude * 0.98 + 0.01
@@ -0,0 +1,244 @@
+from distancias import distribuicao_distancias_amostrada, distribuicao_distancias_exata, distribuicao_distancias_hyperanf
+from pontes import analisar_pontes
+from graus import calcular_graus, estatisticas_graus_grafo
+from ciclos import contar_ciclos, e_aciclico, posto_ciclos
+from alcance import indice_alcance
+from centralidade import hits, intermediacao_amostrada, pagerank
+from componentes import componentes_fortes, componentes_fracos, nos_dos_componentes
+from excentricidades import extremos_distancias
+from layout import calcular_layout
+from triangulos import clustering_amostrado, contar_triangulos
+
+
+# Registro das métricas: nome -> função, dependências, versão, opções usadas e se vai para o cache em disco
+METRICAS = {}
+
+
+def metrica(nome, dependencias=(), versao=1, opcoes=(), persistente=True):
+    """
+    Decorador que registra uma métrica e declara de quais outras métricas ela depende.
+    `versao` deve ser incrementada quando o cálculo muda (invalida o cache em disco);
+    `opcoes` lista as opções de MetricasGrafo que alteram o resultado (entram na chave do cache).
+    """
+    def registrar(funcao):
+        METRICAS[nome] = {
+            "funcao": funcao,
+            "dependencias": tuple(dependencias),
+            "versao": versao,
+            "opcoes": tuple(opcoes),
+            "persistente": persistente,
+        }
+        return funcao
+    return registrar
+
+
+class MetricasGrafo:
+    """
+    Calcula as métricas de um grafo sob demanda e memoriza cada uma.
+    metricas["nome"] resolve primeiro as dependências declaradas e depois chama a função da métrica,
+    que recebe o grafo, as opções e os valores das dependências. Cada métrica roda no máximo uma vez,
+    então a saída do console, os gráficos e o relatório HTML usam os mesmos valores.
+    Com `cache` (CacheResultados) e `chave_grafo` (CacheResultados.chave_entrada), as métricas
+    persistentes também são lidas/gravadas em disco e sobrevivem entre execuções.
+    Com `arestas_por_bloco`, componentes e pontes leem as arestas em blocos sequenciais (grafos
+    mapeados do disco maiores que a RAM; ver ordenacao_externa).
+    """
+
+    def __init__(self, grafo, nome=None, grafo_networkx=None, modo_distancias="exato", amostras=200, processos=None,
+                 amostrador=None, cache=None, chave_grafo=None, arquivo=None, ciclos_comprimento_maximo=None,
+                 ciclos_tempo_maximo=60, ciclos_limite=10_000_000, arestas_por_bloco=None, clustering_amostras=None,
+                 valores=None):
+        self.grafo = grafo
+        self.nome = nome
+        self.opcoes = {
+            "modo_distancias": modo_distancias,
+            "amostras": amostras,
+            "amostrador": amostrador,
+            "processos": processos,
+            "ciclos_comprimento_maximo": ciclos_comprimento_maximo,
+            "ciclos_tempo_maximo": ciclos_tempo_maximo,
+            "ciclos_limite": ciclos_limite,
+            "clustering_amostras": clustering_amostras,
+            # Não entra na chave do cache: muda só a memória usada, não o resultado
+            "arestas_por_bloco": arestas_por_bloco,
+        }
+        self.cache = cache if chave_grafo is not None else None
+        self.chave_grafo = chave_grafo
+        self.arquivo = arquivo
+        self._valores = {}
+        if grafo_networkx is not None:
+            self._valores["grafo_networkx"] = grafo_networkx
+        # Métricas já conhecidas (ex.: mantidas pelo modo incremental) entram prontas
+        self._valores.update(valores or {})
+
+    def __getitem__(self, nome):
+        if nome not in self._valores:
+            if nome not in METRICAS:
+                raise KeyError(f"Métrica desconhecida: {nome}")
+            definicao = METRICAS[nome]
+            chave = None
+            if self.cache is not None and definicao["persistente"]:
+                opcoes = {opcao: self.opcoes[opcao] for opcao in definicao["opcoes"]}
+                chave = self.cache.chave(self.chave_grafo, nome, definicao["versao"], opcoes)
+                encontrado, valor = self.cache.obter(chave)
+                if encontrado:
+                    # Valor do cache: as dependências nem chegam a ser calculadas
+                    self._valores[nome] = valor
+                    return valor
+
+            valores_dependencias = {dependencia: self[dependencia] for dependencia in definicao["dependencias"]}
+            valor = definicao["funcao"](self.grafo, self.opcoes, **valores_dependencias)
+            self._valores[nome] = valor
+            if chave is not None:
+                self.cache.guardar(
+                    chave, valor, metrica=nome, versao=definicao["versao"], rede=self.nome, arquivo=self.arquivo,
+                    opcoes={opcao: self.opcoes[opcao] for opcao in definicao["opcoes"]},
+                )
+        return self._valores[nome]
+
+    def __contains__(self, nome):
+        return nome in self._valores
+
+    def calculadas(self):
+        """Nomes das métricas já calculadas, na ordem em que foram calculadas."""
+        return list(self._valores)
+
+
+@metrica("grafo_networkx", persistente=False)
+def _grafo_networkx(grafo, opcoes):
+    return grafo.para_networkx()
+
+
+@metrica("graus")
+def _graus(grafo, opcoes):
+    return calcular_graus(grafo)
+
+
+@metrica("estatisticas_graus", dependencias=("graus",))
+def _estatisticas_graus(grafo, opcoes, graus):
+    return estatisticas_graus_grafo(grafo, graus)
+
+
+@metrica("grau_medio", dependencias=("graus",))
+def _grau_medio(grafo, opcoes, graus):
+    if grafo.is_directed():
+        return {"entrada": float(graus["entrada"].mean()), "saida": float(graus["saida"].mean())}
+    return {"total": float(graus["total"].mean())}
+
+
+@metrica("densidade")
+def _densidade(grafo, opcoes):
+    n = grafo.number_of_nodes()
+    if n < 2:
+        return 0.0
+    pares = n * (n - 1) if grafo.is_directed() else n * (n - 1) / 2
+    return grafo.number_of_edges() / pares
+
+
+@metrica("componentes", versao=2)
+def _componentes(grafo, opcoes):
+    """Componentes conexos (fracamente conexos, se dirigido): rótulo por nó, tamanhos e histograma de tamanhos."""
+    return componentes_fracos(grafo, opcoes["arestas_por_bloco"])
+
+
+@metrica("componentes_fortes", versao=2)
+def _componentes_fortes(grafo, opcoes):
+    """Componentes fortemente conexos (Tarjan iterativo no grafo compacto), no formato de "componentes"."""
+    return componentes_fortes(grafo, opcoes["arestas_por_bloco"])
+
+
+@metrica("distancias", opcoes=("modo_distancias", "amostras", "amostrador"))
+def _distancias(grafo, opcoes):
+    modo = opcoes["modo_distancias"]
+    if modo == "exato":
+        return distribuicao_distancias_exata(grafo, processos=opcoes["processos"])
+    if modo == "amostragem":
+        return distribuicao_distancias_amostrada(grafo, amostras=opcoes["amostras"], amostrador=opcoes["amostrador"])
+    if modo == "hyperanf":
+        return distribuicao_distancias_hyperanf(grafo)
+    raise ValueError(f"Modo de distância desconhecido: {modo}")
+
+
+@metrica("excentricidades", dependencias=("componentes",), versao=2)
+def _excentricidades(grafo, opcoes, componentes):
+    """
+    Diâmetro, raio, periferia e centro exatos do maior componente: {"conexo": ...} em grafos não
+    dirigidos; {"fraco": ...} em dirigidos (o maior componente forte fica em "excentricidades_fortes").
+    """
+    tipo = "fraco" if grafo.is_directed() else "conexo"
+    return {tipo: extremos_distancias(grafo, "fraco", componentes["rotulos"])}
+
+
+@metrica("excentricidades_fortes", dependencias=("componentes_fortes",))
+def _excentricidades_fortes(grafo, opcoes, componentes_fortes):
+    """Extremos das distâncias dirigidas no maior componente forte (só grafos dirigidos; ver "excentricidades")."""
+    return extremos_distancias(grafo, "forte", componentes_fortes["rotulos"])
+
+
+@metrica("alcance", dependencias=("componentes_fortes",))
+def _alcance(grafo, opcoes, componentes_fortes):
+    """
+    Índice de alcance transitivo sobre o DAG de componentes fortes: camadas topológicas, quantos nós
+    cada nó alcança / o alcançam e os bitsets para consultas (ver alcance.alcanca).
+    """
+    return indice_alcance(grafo, componentes_fortes["rotulos"])
+
+
+@metrica("pontes")
+def _pontes(grafo, opcoes):
+    return analisar_pontes(grafo, arestas_por_bloco=opcoes["arestas_por_bloco"])
+
+
+@metrica("ciclos", dependencias=("grafo_networkx", "componentes", "componentes_fortes"), versao=2,
+         opcoes=("ciclos_comprimento_maximo", "ciclos_tempo_maximo", "ciclos_limite"))
+def _ciclos(grafo, opcoes, grafo_networkx, componentes, componentes_fortes):
+    """
+    Análise de ciclos: teste de DAG e número ciclomático (baratos) e a contagem de ciclos simples,
+    sem guardá-los, limitada por comprimento, tempo e quantidade (pode ser parcial).
+    """
+    aciclico = e_aciclico(grafo_networkx)
+    if aciclico:
+        contagem = {"ciclos": 0, "por_comprimento": {}, "completo": True, "motivo_interrupcao": None}
+    else:
+        contagem = contar_ciclos(
+            grafo_networkx,
+            comprimento_maximo=opcoes["ciclos_comprimento_maximo"],
+            tempo_maximo=opcoes["ciclos_tempo_maximo"],
+            limite=opcoes["ciclos_limite"],
+            componentes=nos_dos_componentes(grafo, componentes_fortes["rotulos"]),
+        )
+    contagem.update(aciclico=aciclico, posto_ciclos=posto_ciclos(grafo_networkx, len(componentes["tamanhos"])))
+    return contagem
+
+
+@metrica("clustering", versao=2, opcoes=("clustering_amostras", "amostrador"))
+def _clustering(grafo, opcoes):
+    """
+    Triângulos e clustering (local, médio, transitividade e curva por grau) contados de forma exata;
+    com `clustering_amostras`, estimados a partir desse número de nós (do `amostrador`, se houver).
+    """
+    if opcoes["clustering_amostras"] is None:
+        return contar_triangulos(grafo, processos=opcoes["processos"])
+    return clustering_amostrado(grafo, amostras=opcoes["clustering_amostras"], amostrador=opcoes["amostrador"])
+
+
+@metrica("pagerank")
+def _pagerank(grafo, opcoes):
+    return pagerank(grafo)
+
+
+@metrica("hits")
+def _hits(grafo, opcoes):
+    return hits(grafo)
+
+
+@metrica("intermediacao", versao=2, opcoes=("amostras",))
+def _intermediacao(grafo, opcoes):
+    """Intermediação estimada por Brandes a partir de `amostras` fontes (exata se amostras >= n)."""
+    return intermediacao_amostrada(grafo, amostras=opcoes["amostras"])
+
+
+@metrica("layout")
+def _layout(grafo, opcoes):
+    """Posições (n, 2) do layout multinível do grafo inteiro, na ordem dos nós do grafo compacto."""
+    return calcular_layout(grafo)
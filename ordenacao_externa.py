@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from grafo_compacto import (
+    BYTES_POR_LINHA, MEMORIA_MAXIMA_PADRAO, GrafoCompacto, abrir_cache, blocos_csv, rotulos_em_blocos, salvar_cache,
+)
+
+
+# Função para montar o CSR de um arquivo de arestas maior que a RAM, direto no disco
+def construir_grafo_externo(caminho_arquivo, coluna_origem, coluna_destino, dirigido, caminho_saida,
+                            memoria_maxima=MEMORIA_MAXIMA_PADRAO, diretorio_temporario=None):
+    """
+    Constrói o arquivo de cache (formato de salvar_cache) com ordenação externa, sem manter as
+    arestas em memória: 1ª passada coleta os rótulos (só eles ficam em RAM); 2ª passada converte
+    cada bloco do CSV em chaves de aresta (u * n + v) e grava sequências ordenadas e sem repetidas
+    ("runs") em arquivos temporários; por fim as runs são intercaladas (k-way merge) em fatias,
+    gravando indices em ordem e contando os graus para o indptr. Em grafos dirigidos a mesma coisa
+    é feita com as chaves invertidas para o CSR de entrada. `memoria_maxima` (bytes) limita os blocos
+    do CSV, as runs e os buffers da intercalação. Retorna o grafo mapeado do arquivo (abrir_cache).
+    """
+    linhas_por_bloco = max(1_000, memoria_maxima // (4 * BYTES_POR_LINHA))
+    rotulos = rotulos_em_blocos(
+        blocos_csv(caminho_arquivo, coluna_origem, coluna_destino, linhas_por_bloco), caminho_arquivo
+    )
+    n = len(rotulos)
+
+    temporario = tempfile.mkdtemp(prefix="grafo_externo_", dir=diretorio_temporario)
+    try:
+        runs = {"saida": [], "entrada": []}
+        pendentes = {"saida": [], "entrada": []}
+        bytes_pendentes = 0
+        for origens, destinos in blocos_csv(caminho_arquivo, coluna_origem, coluna_destino, linhas_por_bloco):
+            u = np.searchsorted(rotulos, origens).astype(np.int64)
+            v = np.searchsorted(rotulos, destinos).astype(np.int64)
+            if dirigido:
+                pendentes["saida"].append(u * n + v)
+                pendentes["entrada"].append(v * n + u)
+            else:
+                # Simetriza: (u, v) e (v, u) no mesmo CSR; laços repetidos somem na remoção de repetidas
+                pendentes["saida"].append(np.concatenate([u * n + v, v * n + u]))
+            bytes_pendentes += 2 * u.nbytes
+            if bytes_pendentes > memoria_maxima // 4:
+                _gravar_runs(pendentes, runs, temporario)
+                bytes_pendentes = 0
+        _gravar_runs(pendentes, runs, temporario)
+
+        arrays = {}
+        for sentido in ("saida", "entrada") if dirigido else ("saida",):
+            caminho_indices = os.path.join(temporario, f"indices_{sentido}.bin")
+            graus = _intercalar_runs(runs[sentido], n, caminho_indices, memoria_maxima)
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(graus, out=indptr[1:])
+            if indptr[-1] <= np.iinfo(np.int32).max:
+                indptr = indptr.astype(np.int32)
+            indices = (np.memmap(caminho_indices, dtype=np.int32, mode="r") if indptr[-1]
+                       else np.empty(0, dtype=np.int32))
+            arrays[sentido] = (indptr, indices)
+
+        grafo = GrafoCompacto(*arrays["saida"], rotulos, dirigido, *arrays.get("entrada", (None, None)))
+        salvar_cache(grafo, caminho_saida)
+        del grafo, arrays
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+    return abrir_cache(caminho_saida)
+
+
+def _gravar_runs(pendentes, runs, diretorio):
+    """Ordena e remove as repetidas das chaves pendentes de cada sentido e grava cada uma como uma run."""
+    for sentido, blocos in pendentes.items():
+        if not blocos:
+            continue
+        chaves = np.sort(np.concatenate(blocos))
+        chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))]
+        caminho = os.path.join(diretorio, f"run_{sentido}_{len(runs[sentido])}.bin")
+        chaves.tofile(caminho)
+        runs[sentido].append((caminho, len(chaves)))
+        blocos.clear()
+
+
+def _intercalar_runs(runs, n, caminho_indices, memoria_maxima):
+    """
+    Intercala as runs ordenadas em fatias: de cada run lê-se um buffer; só saem as chaves até o menor
+    último valor entre os buffers das runs que ainda têm dados (nada menor pode aparecer depois). As
+    chaves de cada rodada são ordenadas, as repetidas entre runs descartadas e os destinos (chave % n)
+    anexados ao arquivo de indices. Retorna o grau de cada nó (contagem das origens, chave // n).
+    """
+    graus = np.zeros(n, dtype=np.int64)
+    arquivos = [np.memmap(caminho, dtype=np.int64, mode="r") for caminho, tamanho in runs if tamanho]
+    posicoes = [0] * len(arquivos)
+    buffer = max(1_024, memoria_maxima // (4 * 8 * max(len(arquivos), 1)))
+    ultima = -1
+    with open(caminho_indices, "wb") as saida:
+        while any(posicao < len(arquivo) for posicao, arquivo in zip(posicoes, arquivos)):
+            fatias = [arquivo[posicao:posicao + buffer] for posicao, arquivo in zip(posicoes, arquivos)]
+            continuam = [fatia[-1] for fatia, posicao, arquivo in zip(fatias, posicoes, arquivos)
+                         if len(fatia) and posicao + len(fatia) < len(arquivo)]
+            limite = min(continuam) if continuam else np.iinfo(np.int64).max
+            partes = []
+            for i, fatia in enumerate(fatias):
+                quantidade = int(np.searchsorted(fatia, limite, side="right"))
+                partes.append(np.asarray(fatia[:quantidade]))
+                posicoes[i] += quantidade
+            chaves = np.sort(np.concatenate(partes))
+            chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))] if len(chaves) else chaves
+            chaves = chaves[chaves != ultima]
+            if not len(chaves):
+                continue
+            ultima = int(chaves[-1])
+            # Origens em ordem: conta cada sequência de origens iguais sem um bincount do tamanho de n
+            origens = chaves // n
+            inicios = np.flatnonzero(np.concatenate(([True], origens[1:] != origens[:-1])))
+            graus[origens[inicios]] += np.diff(inicios, append=len(origens))
+            (chaves % n).astype(np.int32).tofile(saida)
+    del arquivos
+    return graus
@@ -0,0 +1,204 @@
+import os
+import re
+
+import numpy as np
+
+from grafo_compacto import DIRETORIO_CACHE, GrafoCompacto, abrir_cache, caminho_do_cache, csr_de_pares, salvar_cache
+
+
+# Seções de dados aceitas (em minúsculas): tabela de vértices, arcos (dirigidos) e arestas (não dirigidas)
+SECOES_PAJEK = ("*vertices", "*arcs", "*edges")
+
+# Seções de cabeçalho que só dão nome à rede e não trazem dados
+_SECOES_IGNORADAS = ("*network",)
+
+# Linha da tabela de vértices: número, rótulo entre aspas (ou palavra solta) e o resto (coordenadas etc.)
+_LINHA_VERTICE = re.compile(rb'^[ \t]*(\d+)(?:[ \t]+(?:"([^"\r\n]*)"|([^\s"]+)))?', re.MULTILINE)
+
+# Maior quantidade de dígitos de um número de vértice (cabe em int64)
+_MAX_DIGITOS = 18
+
+
+# Função para ler um arquivo Pajek (.net) em bloco, com NumPy sobre o arquivo mapeado em memória
+def ler_pajek(caminho_arquivo):
+    """
+    Lê as seções *Vertices, *Arcs e *Edges de um arquivo Pajek sem passar linha a linha pelo Python:
+    o arquivo é mapeado em memória (np.memmap) e os números de vértice das linhas de arcos/arestas
+    são decodificados de uma vez (sequências de dígitos -> int64). Só os dois primeiros números de
+    cada linha contam (peso e atributos são ignorados); linhas começadas por % ou # são comentários.
+    Arquivo sem nenhuma seção é lido como lista de arcos "u v" por linha.
+    Retorna {"vertices": N declarado em *Vertices (ou None), "ids", "nomes": tabela de vértices,
+    "arcos": (origens, destinos), "arestas": (origens, destinos)}.
+    """
+    if os.path.getsize(caminho_arquivo) == 0:
+        raise ValueError(f"Arquivo Pajek vazio: {caminho_arquivo}")
+    dados = np.memmap(caminho_arquivo, dtype=np.uint8, mode="r")
+    fins = np.flatnonzero(dados == ord("\n"))
+    if not len(fins) or fins[-1] != len(dados) - 1:
+        fins = np.append(fins, len(dados))
+    inicios = np.concatenate(([0], fins[:-1] + 1))
+
+    # Primeiro caractere visível de cada linha: separa cabeçalhos (*), comentários (%) e linhas vazias.
+    # Só as linhas que começam com espaço (ex.: tabela de vértices alinhada) precisam procurá-lo
+    primeiro_caractere = dados[np.minimum(inicios, len(dados) - 1)].copy()
+    recuadas = np.flatnonzero(primeiro_caractere <= ord(" "))
+    if len(recuadas):
+        visiveis = np.flatnonzero(dados > ord(" "))
+        proximos = np.searchsorted(visiveis, inicios[recuadas])
+        achados = proximos < len(visiveis)
+        posicoes = visiveis[np.minimum(proximos, max(len(visiveis) - 1, 0))] if len(visiveis) else proximos
+        na_linha = achados & (posicoes < fins[recuadas])
+        primeiro_caractere[recuadas] = np.where(na_linha, dados[np.minimum(posicoes, len(dados) - 1)], 0)
+    comentarios = np.isin(primeiro_caractere, (ord("%"), ord("#")))
+
+    resultado = {
+        "vertices": None,
+        "ids": np.empty(0, dtype=np.int64),
+        "nomes": np.empty(0, dtype=object),
+        "arcos": [],
+        "arestas": [],
+    }
+    cabecalhos = np.flatnonzero(primeiro_caractere == ord("*"))
+    if not len(cabecalhos):
+        secoes = [("*arcs", 0, len(fins))]
+    else:
+        secoes = []
+        for posicao, linha in enumerate(cabecalhos):
+            palavras = bytes(dados[inicios[linha]:fins[linha]]).decode("utf-8", errors="replace").split()
+            nome = palavras[0].lower()
+            if nome in _SECOES_IGNORADAS:
+                continue
+            if nome not in SECOES_PAJEK:
+                raise ValueError(f"Seção Pajek não suportada: {palavras[0]} (suportadas: {', '.join(SECOES_PAJEK)})")
+            if nome == "*vertices":
+                resultado["vertices"] = int(palavras[1]) if len(palavras) > 1 else None
+            fim = cabecalhos[posicao + 1] if posicao + 1 < len(cabecalhos) else len(fins)
+            secoes.append((nome, linha + 1, fim))
+
+    for nome, primeira, fim in secoes:
+        if primeira >= fim:
+            continue
+        trecho = slice(inicios[primeira], fins[fim - 1])
+        if nome == "*vertices":
+            ids, nomes = _ler_vertices(bytes(dados[trecho]))
+            resultado["ids"] = np.concatenate([resultado["ids"], ids])
+            resultado["nomes"] = np.concatenate([resultado["nomes"], nomes])
+        else:
+            pares = _ler_pares(dados[trecho], inicios[primeira], fins[primeira:fim], comentarios[primeira:fim])
+            resultado["arcos" if nome == "*arcs" else "arestas"].append(pares)
+
+    for chave in ("arcos", "arestas"):
+        pares = resultado[chave]
+        vazio = np.empty(0, dtype=np.int64)
+        resultado[chave] = (
+            np.concatenate([u for u, _ in pares]) if pares else vazio,
+            np.concatenate([v for _, v in pares]) if pares else vazio,
+        )
+    return resultado
+
+
+# Função para montar o GrafoCompacto de um arquivo Pajek já lido
+def grafo_compacto_de_pajek(pajek, dirigido=None):
+    """
+    Nós indexados pelos números de vértice (rótulos inteiros); com *Vertices N entram todos os
+    vértices 1..N, inclusive os isolados, e grafo.nomes traz a tabela de rótulos (o número, se o
+    vértice não tiver rótulo). `dirigido` None: dirigido se houver *Arcs. Num grafo dirigido cada
+    linha de *Edges vira dois arcos; num não dirigido os arcos perdem a direção.
+    """
+    arcos, arestas = pajek["arcos"], pajek["arestas"]
+    if dirigido is None:
+        dirigido = len(arcos[0]) > 0
+    if pajek["vertices"] is not None:
+        rotulos = np.arange(1, pajek["vertices"] + 1, dtype=np.int64)
+        extremos = np.concatenate([arcos[0], arcos[1], arestas[0], arestas[1], pajek["ids"]])
+        if len(extremos) and (extremos.min() < 1 or extremos.max() > pajek["vertices"]):
+            raise ValueError(f"Vértice fora de 1..{pajek['vertices']} no arquivo Pajek")
+        nomes = rotulos.astype(str).astype(object)
+        nomes[pajek["ids"] - 1] = pajek["nomes"]
+    else:
+        rotulos = np.unique(np.concatenate([arcos[0], arcos[1], arestas[0], arestas[1]]))
+        nomes = None
+    if not len(rotulos):
+        raise ValueError("Arquivo Pajek sem vértices nem arestas")
+
+    n = len(rotulos)
+    if pajek["vertices"] is not None:
+        internos = [extremos - 1 for extremos in (*arcos, *arestas)]
+    else:
+        internos = [np.searchsorted(rotulos, extremos) for extremos in (*arcos, *arestas)]
+    if dirigido:
+        u = np.concatenate([internos[0], internos[2], internos[3]])
+        v = np.concatenate([internos[1], internos[3], internos[2]])
+        indptr, indices = csr_de_pares(u, v, n)
+        indptr_entrada, indices_entrada = csr_de_pares(v, u, n)
+        return GrafoCompacto(indptr, indices, rotulos, True, indptr_entrada, indices_entrada, nomes)
+    u = np.concatenate([internos[0], internos[2]])
+    v = np.concatenate([internos[1], internos[3]])
+    # Simetriza: cada aresta {u, v} vira (u, v) e (v, u); laços ficam uma vez só
+    sem_laco = u != v
+    u, v = np.concatenate([u, v[sem_laco]]), np.concatenate([v, u[sem_laco]])
+    indptr, indices = csr_de_pares(u, v, n)
+    return GrafoCompacto(indptr, indices, rotulos, False, nomes=nomes)
+
+
+# Função para carregar um arquivo Pajek no formato compacto, usando o cache binário
+def carregar_grafo_pajek(caminho_arquivo, dirigido=None, diretorio_cache=DIRETORIO_CACHE):
+    """Como carregar_grafo_compacto, para arquivos Pajek; diretorio_cache=None desliga o cache."""
+    caminho_cache = None
+    if diretorio_cache is not None:
+        caminho_cache = caminho_do_cache(caminho_arquivo, diretorio_cache, "pajek", dirigido)
+        if os.path.exists(caminho_cache):
+            return abrir_cache(caminho_cache)
+
+    grafo = grafo_compacto_de_pajek(ler_pajek(caminho_arquivo), dirigido)
+    if caminho_cache is not None:
+        salvar_cache(grafo, caminho_cache)
+        return abrir_cache(caminho_cache)
+    return grafo
+
+
+def _ler_pares(trecho, deslocamento, fins, comentarios):
+    """
+    Dois primeiros números de cada linha de um trecho de arcos/arestas. `fins`: posição (no arquivo)
+    do fim de cada linha do trecho, que começa na posição `deslocamento`; `comentarios`: linhas a pular.
+    """
+    digito = (trecho >= ord("0")) & (trecho <= ord("9"))
+    borda = np.diff(digito.astype(np.int8), prepend=0, append=0)
+    comecos, finais = np.flatnonzero(borda == 1), np.flatnonzero(borda == -1)
+    linhas = np.searchsorted(fins - deslocamento, comecos)
+    manter = ~comentarios[linhas]
+    comecos, finais, linhas = comecos[manter], finais[manter], linhas[manter]
+
+    # Posição de cada número dentro da sua linha: só o 1º (origem) e o 2º (destino) interessam
+    # (os números saem em ordem de posição, então as linhas já vêm ordenadas)
+    primeiros = np.flatnonzero(np.diff(linhas, prepend=-1))
+    linhas_com_numeros = linhas[primeiros]
+    quantidades = np.diff(primeiros, append=len(linhas))
+    if (quantidades < 2).any():
+        linha = int(linhas_com_numeros[np.argmax(quantidades < 2)])
+        inicio = 0 if linha == 0 else int(fins[linha - 1] - deslocamento) + 1
+        texto = bytes(trecho[inicio:int(fins[linha] - deslocamento)]).decode("utf-8", errors="replace").strip()
+        raise ValueError(f"Linha sem origem e destino no arquivo Pajek: {texto!r}")
+    numeros = np.concatenate([primeiros, primeiros + 1])
+    comecos, tamanhos = comecos[numeros], finais[numeros] - comecos[numeros]
+    if len(tamanhos) and tamanhos.max() > _MAX_DIGITOS:
+        raise ValueError("Número de vértice grande demais no arquivo Pajek")
+
+    # Decodifica todos os números de uma vez, um dígito por passo (no máximo _MAX_DIGITOS passos)
+    valores = np.zeros(len(comecos), dtype=np.int64)
+    for posicao in range(int(tamanhos.max(initial=0))):
+        ativos = tamanhos > posicao
+        valores[ativos] = valores[ativos] * 10 + (trecho[comecos[ativos] + posicao] - ord("0"))
+    metade = len(primeiros)
+    return valores[:metade], valores[metade:]
+
+
+def _ler_vertices(texto):
+    """Números e rótulos da tabela *Vertices (uma expressão regular sobre o trecho inteiro)."""
+    encontrados = _LINHA_VERTICE.findall(texto)
+    ids = np.array([int(numero) for numero, _, _ in encontrados], dtype=np.int64)
+    nomes = np.array(
+        [(entre_aspas or solto or numero).decode("utf-8", errors="replace") for numero, entre_aspas, solto in encontrados],
+        dtype=object,
+    )
+    return ids, nomes
@@ -0,0 +1,216 @@
+import numpy as np
+
+from componentes import comprimir_caminhos, numerar_componentes, unir_arestas
+from distancias import splitmix64
+from grafo_compacto import (
+    ARESTAS_POR_BLOCO, GrafoCompacto, blocos_de_arestas, csr_de_pares, expandir_fronteira, grafo_compacto_de_networkx,
+    simetrizar_csr,
+)
+
+
+# Função para encontrar pontes, componentes 2-aresta-conexos e a árvore de pontes numa única DFS
+def analisar_pontes(grafo, tamanho_amostra=10, arestas_por_bloco=None):
+    """
+    Analisa as pontes de um grafo (tratado como não direcionado) numa única passada.
+    Com `arestas_por_bloco`, usa pontes_e_componentes_em_blocos (memória O(n), arestas lidas em
+    blocos sequenciais; para grafos mapeados do disco maiores que a RAM); as pontes saem na ordem
+    do nó filho em vez da ordem da DFS.
+    Retorna um dicionário com:
+      - "pontes": lista de pares de rótulos, na ordem em que a DFS as encontra;
+      - "quantidade" e "amostra" (as primeiras `tamanho_amostra` pontes);
+      - "componente_2_aresta": rótulo do componente 2-aresta-conexo de cada nó interno;
+      - "tamanhos_componentes": tamanho de cada componente 2-aresta-conexo;
+      - "arvore_pontes": arestas (componente, componente) da árvore de pontes.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    if arestas_por_bloco is not None:
+        pares, componente = pontes_e_componentes_em_blocos(grafo, arestas_por_bloco)
+    else:
+        if grafo.dirigido:
+            indptr, indices = simetrizar_csr(grafo.indptr, grafo.indices, grafo.indptr_entrada, grafo.indices_entrada)
+        else:
+            indptr, indices = grafo.indptr, grafo.indices
+        pares, componente = pontes_e_componentes_csr(indptr, indices)
+    rotulos = grafo.rotulos.tolist()
+    pontes = [(rotulos[u], rotulos[v]) for u, v in pares]
+    arvore = [(int(componente[u]), int(componente[v])) for u, v in pares]
+    return {
+        "pontes": pontes,
+        "quantidade": len(pontes),
+        "amostra": pontes[:tamanho_amostra],
+        "componente_2_aresta": componente,
+        "tamanhos_componentes": np.bincount(componente) if len(componente) else np.empty(0, dtype=np.int64),
+        "arvore_pontes": arvore,
+    }
+
+
+def pontes_e_componentes_csr(indptr, indices):
+    """
+    DFS iterativa (pilha explícita, sem recursão) com valores low-link sobre um CSR não direcionado
+    sem arestas repetidas. O estado de cada nó fica em arrays indexados pelo nó, não em dicionários.
+    Os nós vão para uma segunda pilha ao serem descobertos; quando (pai, u) é ponte ou u é raiz,
+    os nós empilhados a partir de u formam um componente 2-aresta-conexo. Tempo O(n + m).
+    Retorna (lista de pontes (pai, filho) em índices internos, rótulo do componente de cada nó).
+    """
+    n = len(indptr) - 1
+    indptr = np.asarray(indptr).tolist()
+    indices = np.asarray(indices).tolist()
+    descoberta = [-1] * n
+    low = [0] * n
+    pai = [-1] * n
+    proxima = indptr[:-1]  # próxima posição de indices a visitar para cada nó
+    componente = [-1] * n
+    pilha_componente = []
+    pontes = []
+    tempo = 0
+    componentes = 0
+
+    for raiz in range(n):
+        if descoberta[raiz] != -1:
+            continue
+        descoberta[raiz] = low[raiz] = tempo
+        tempo += 1
+        pilha = [raiz]
+        pilha_componente.append(raiz)
+        while pilha:
+            u = pilha[-1]
+            if proxima[u] < indptr[u + 1]:
+                v = indices[proxima[u]]
+                proxima[u] += 1
+                if descoberta[v] == -1:
+                    pai[v] = u
+                    descoberta[v] = low[v] = tempo
+                    tempo += 1
+                    pilha.append(v)
+                    pilha_componente.append(v)
+                elif v != pai[u]:
+                    low[u] = min(low[u], descoberta[v])
+                continue
+
+            pilha.pop()
+            p = pai[u]
+            if p != -1 and low[u] < low[p]:
+                low[p] = low[u]
+            if p == -1 or low[u] > descoberta[p]:
+                if p != -1:
+                    pontes.append((p, u))
+                # Fecha o componente 2-aresta-conexo que começa em u
+                while True:
+                    w = pilha_componente.pop()
+                    componente[w] = componentes
+                    if w == u:
+                        break
+                componentes += 1
+
+    return pontes, np.array(componente, dtype=np.int32)
+
+
+def pontes_e_componentes_em_blocos(grafo, arestas_por_bloco=ARESTAS_POR_BLOCO, semente=42):
+    """
+    Pontes sem DFS e sem o CSR em memória: só arrays de um valor por nó, com as arestas lidas em
+    blocos sequenciais (três passadas).
+    1. Floresta geradora: union-find vetorizado que guarda, para cada raiz ligada, a aresta original
+       que a ligou (as arestas vencedoras formam uma floresta).
+    2. Cada aresta fora da floresta recebe um hash aleatório de 64 bits, somado (XOR) nos seus dois
+       extremos; enraizada a floresta, o XOR da subárvore de x é o XOR das arestas fora da floresta
+       que saem dela. A aresta (pai(x), x) é ponte exatamente quando nenhuma sai: XOR zero (um falso
+       zero tem probabilidade 2^-64 por aresta).
+    3. Componentes 2-aresta-conexos: os da floresta sem as pontes.
+    Retorna (pontes (pai, filho) em índices internos, componente 2-aresta-conexo de cada nó).
+    """
+    n = grafo.number_of_nodes()
+    pai = np.arange(n, dtype=np.int64)
+    arvore = []
+    for u, v in _arestas_sem_direcao(grafo, arestas_por_bloco):
+        pai = _unir_guardando_arestas(pai, u, v, arvore)
+    arvore_u = np.concatenate([u for u, _ in arvore]) if arvore else np.empty(0, dtype=np.int64)
+    arvore_v = np.concatenate([v for _, v in arvore]) if arvore else np.empty(0, dtype=np.int64)
+    chaves_arvore = np.sort(np.minimum(arvore_u, arvore_v) * n + np.maximum(arvore_u, arvore_v))
+
+    soma = np.zeros(n, dtype=np.uint64)
+    for u, v in _arestas_sem_direcao(grafo, arestas_por_bloco):
+        chaves = u * n + v
+        posicao = np.minimum(np.searchsorted(chaves_arvore, chaves), max(len(chaves_arvore) - 1, 0))
+        fora = chaves_arvore[posicao] != chaves if len(chaves_arvore) else np.ones(len(chaves), dtype=bool)
+        valores = splitmix64((chaves[fora] ^ semente).astype(np.uint64))
+        np.bitwise_xor.at(soma, u[fora], valores)
+        np.bitwise_xor.at(soma, v[fora], valores)
+
+    # Enraíza a floresta nas raízes do union-find (BFS por níveis) e acumula o XOR das folhas para a raiz
+    indptr, indices = csr_de_pares(np.concatenate([arvore_u, arvore_v]), np.concatenate([arvore_v, arvore_u]), n)
+    pai_arvore = np.full(n, -1, dtype=np.int64)
+    visitado = np.zeros(n, dtype=bool)
+    fronteira = np.flatnonzero(pai == np.arange(n))
+    visitado[fronteira] = True
+    niveis = []
+    while len(fronteira):
+        quantidades = np.diff(np.asarray(indptr, dtype=np.int64))[fronteira]
+        origens = np.repeat(fronteira, quantidades)
+        destinos = expandir_fronteira(indptr, indices, fronteira)
+        novos = ~visitado[destinos]
+        origens, destinos = origens[novos], destinos[novos]
+        pai_arvore[destinos] = origens
+        visitado[destinos] = True
+        if len(destinos):
+            niveis.append(destinos)
+        fronteira = destinos
+    for nivel in reversed(niveis):
+        np.bitwise_xor.at(soma, pai_arvore[nivel], soma[nivel])
+
+    filhos = np.flatnonzero((pai_arvore >= 0) & (soma == 0))
+    pontes = list(zip(pai_arvore[filhos].tolist(), filhos.tolist()))
+    nao_pontes = np.flatnonzero((pai_arvore >= 0) & (soma != 0))
+    raizes = unir_arestas(np.arange(n, dtype=np.int64), nao_pontes, pai_arvore[nao_pontes])
+    componente, _ = numerar_componentes(raizes)
+    return pontes, componente
+
+
+def _arestas_sem_direcao(grafo, arestas_por_bloco):
+    """
+    Gera blocos (u, v), u < v, com cada aresta do grafo visto sem direção uma única vez (sem laços).
+    Nos dirigidos, os CSR de saída e de entrada são lidos lado a lado, pelos mesmos nós.
+    """
+    if not grafo.dirigido:
+        for u, v in blocos_de_arestas(grafo.indptr, grafo.indices, arestas_por_bloco):
+            menor = u < v
+            yield u[menor], v[menor]
+        return
+    n = grafo.number_of_nodes()
+    indptr_total = np.asarray(grafo.indptr, dtype=np.int64) + np.asarray(grafo.indptr_entrada, dtype=np.int64)
+    inicio = 0
+    while inicio < n:
+        fim = min(max(int(np.searchsorted(indptr_total, indptr_total[inicio] + arestas_por_bloco, side="right")) - 1,
+                      inicio + 1), n)
+        vizinhos = []
+        for indptr, indices in ((grafo.indptr, grafo.indices), (grafo.indptr_entrada, grafo.indices_entrada)):
+            graus = np.diff(np.asarray(indptr[inicio:fim + 1], dtype=np.int64))
+            u = np.repeat(np.arange(inicio, fim, dtype=np.int64), graus)
+            v = np.asarray(indices[int(indptr[inicio]):int(indptr[fim])], dtype=np.int64)
+            vizinhos.append(u[u < v] * n + v[u < v])
+        # Arco u -> v e arco v -> u viram a mesma aresta: ambos aparecem na linha do menor extremo
+        chaves = np.sort(np.concatenate(vizinhos))
+        chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))] if len(chaves) else chaves
+        yield chaves // n, chaves % n
+        inicio = fim
+
+
+def _unir_guardando_arestas(pai, u, v, arvore):
+    """
+    Como componentes.unir_arestas, mas guarda em `arvore` a aresta original (u, v) que ligou cada
+    raiz: a cada rodada, cada raiz é ligada à menor raiz vizinha por uma única aresta.
+    """
+    while len(u):
+        raiz_u, raiz_v = pai[u], pai[v]
+        cruzam = raiz_u != raiz_v
+        u, v, raiz_u, raiz_v = u[cruzam], v[cruzam], raiz_u[cruzam], raiz_v[cruzam]
+        if not len(u):
+            break
+        maior, menor = np.maximum(raiz_u, raiz_v), np.minimum(raiz_u, raiz_v)
+        np.minimum.at(pai, maior, menor)
+        vencedoras = np.flatnonzero(pai[maior] == menor)
+        _, primeiras = np.unique(maior[vencedoras], return_index=True)
+        escolhidas = vencedoras[primeiras]
+        arvore.append((u[escolhidas], v[escolhidas]))
+        pai = comprimir_caminhos(pai)
+    return pai
@@ -0,0 +1,319 @@
+import csv
+import html
+import numbers
+import os
+from string import Template
+
+import numpy as np
+
+from exportacao import nome_de_arquivo
+
+
+# Linhas exibidas no HTML para listas grandes (o conteúdo completo vai para um CSV ao lado do relatório)
+LINHAS_POR_TABELA = 20
+
+# Listas com até este número de itens são escritas inline, sem tabela nem CSV
+_ITENS_INLINE = 10
+
+# Modelo do início do relatório (cabeçalho, estilo e abertura do container)
+MODELO_INICIO = Template("""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$titulo</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            margin: 0;
+            padding: 0;
+            background-color: #f9f9f9;
+            color: #333;
+        }
+        header {
+            background-color: #5c2d91;
+            color: white;
+            padding: 20px;
+            text-align: center;
+        }
+        .container {
+            margin: 20px auto;
+            max-width: 900px;
+            padding: 20px;
+            background: white;
+            box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+            border-radius: 8px;
+        }
+        h1, h2 {
+            font-family: 'Arial Black', sans-serif;
+            margin-top: 0;
+        }
+        h3 {
+            color: #5c2d91;
+        }
+        .section {
+            margin-bottom: 30px;
+        }
+        .results-table {
+            border-collapse: collapse;
+            width: 100%;
+            margin-top: 10px;
+        }
+        .results-table th, .results-table td {
+            border: 1px solid #ddd;
+            padding: 10px;
+            text-align: left;
+            vertical-align: top;
+        }
+        .results-table th {
+            background-color: #e6e6e6;
+        }
+        .inner-table td {
+            border: none;
+            padding: 2px 8px;
+        }
+        .note {
+            color: #777;
+            font-size: 0.9em;
+        }
+        .figure iframe {
+            width: 100%;
+            height: 520px;
+            border: none;
+        }
+        .figure img {
+            max-width: 100%;
+        }
+        ul {
+            padding-left: 20px;
+        }
+        li {
+            margin-bottom: 5px;
+        }
+        p {
+            font-size: 1.1em;
+            margin: 5px 0;
+        }
+        footer {
+            text-align: center;
+            padding: 10px 0;
+            background-color: #5c2d91;
+            color: white;
+            margin-top: 20px;
+        }
+    </style>
+</head>
+<body>
+<header>
+    <h1>$titulo</h1>
+</header>
+<div class="container">
+""")
+
+# Modelo de uma seção (uma rede): tabela de métricas seguida dos gráficos
+MODELO_SECAO = Template("""
+    <div class="section" id="$ancora">
+        <h3>Rede: $rede</h3>
+        <table class="results-table">
+            <tr><th>Métrica</th><th>Valor</th></tr>
+$linhas
+        </table>
+$figuras
+    </div>
+""")
+
+# Modelo da seção de desempenho: tempo e memória de cada etapa (ver instrumentacao.py)
+MODELO_ETAPAS = Template("""
+    <div class="section" id="desempenho">
+        <h3>Tempo e memória por etapa</h3>
+        <table class="results-table">
+            <tr><th>Etapa</th><th>Parede (s)</th><th>CPU (s)</th><th>Pico de memória</th><th>Aumento</th><th>Nós</th><th>Arestas</th></tr>
+$linhas
+        </table>
+        <p class="note">Memória medida por $fonte.$nota</p>
+    </div>
+""")
+
+# Modelo do fim do relatório
+MODELO_FIM = Template("""
+</div>
+<footer>
+    <p>&copy; 2024 Análise de Grafos</p>
+</footer>
+</body>
+</html>
+""")
+
+
+class RelatorioHTML:
+    """
+    Escreve o relatório HTML em disco aos poucos: o cabeçalho ao abrir, uma seção por rede assim que
+    as métricas dela ficam prontas (adicionar_secao) e o rodapé ao fechar. Nada é acumulado em memória.
+    Listas grandes (ex.: pontes) mostram só as primeiras LINHAS_POR_TABELA linhas e são gravadas
+    completas em CSV na pasta <relatorio>_arquivos/. Os gráficos exportados (ver exportacao.py)
+    entram como <iframe>/<img> com carregamento tardio; os HTML do plotly compartilham um único
+    plotly.min.js, então o relatório continua pequeno.
+    """
+
+    def __init__(self, caminho="resultados.html", titulo="Resultados da Análise de Grafos",
+                 linhas_por_tabela=LINHAS_POR_TABELA):
+        self.caminho = caminho
+        self.linhas_por_tabela = linhas_por_tabela
+        self.diretorio_arquivos = f"{os.path.splitext(caminho)[0]}_arquivos"
+        self.secoes = 0
+        self._arquivo = open(caminho, "w", encoding="utf-8")
+        self._escrever(MODELO_INICIO.substitute(titulo=html.escape(titulo)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def adicionar_secao(self, rede, resumo, figuras=()):
+        """
+        Grava a seção de uma rede. `resumo` é {métrica: valor} (ver resumo_metricas em analise_grafos);
+        `figuras` são entradas do manifesto de exportacao.py ({"titulo", "arquivos"}).
+        """
+        linhas = "\n".join(
+            f"            <tr><td>{html.escape(_nome_metrica(metrica))}</td><td>{self._formatar(rede, metrica, valor)}</td></tr>"
+            for metrica, valor in resumo.items()
+        )
+        self._escrever(MODELO_SECAO.substitute(
+            ancora=html.escape(nome_de_arquivo(rede)),
+            rede=html.escape(str(rede).capitalize()),
+            linhas=linhas,
+            figuras="\n".join(self._figura(figura) for figura in figuras),
+        ))
+        self.secoes += 1
+
+    def adicionar_etapas(self, etapas):
+        """Grava a tabela de desempenho: `etapas` são os registros de instrumentacao.Instrumentacao."""
+        if not etapas:
+            return
+        linhas = "\n".join(f"            <tr>{_linha_etapa(etapa)}</tr>" for etapa in etapas)
+        fonte = etapas[0].get("memoria_fonte") or "nenhuma"
+        nota = (" * Etapa simultânea a outra thread (pré-carga da próxima rede): a memória do processo não é só dela "
+                "e não é mostrada." if any(etapa.get("simultanea") for etapa in etapas) else "")
+        self._escrever(MODELO_ETAPAS.substitute(linhas=linhas, fonte=html.escape(fonte), nota=html.escape(nota)))
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._escrever(MODELO_FIM.substitute())
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _escrever(self, texto):
+        self._arquivo.write(texto)
+        # Cada seção fica visível no disco assim que é escrita (relatório parcial em execuções longas)
+        self._arquivo.flush()
+
+    def _formatar(self, rede, metrica, valor):
+        """Valor -> HTML: números com separador de milhar, dicionários como tabela, listas grandes em CSV."""
+        if isinstance(valor, np.ndarray):
+            valor = valor.tolist()
+        if isinstance(valor, dict):
+            linhas = "".join(
+                f"<tr><td>{html.escape(str(chave))}</td><td>{self._formatar(rede, f'{metrica}_{chave}', item)}</td></tr>"
+                for chave, item in valor.items()
+            )
+            return f'<table class="inner-table">{linhas}</table>'
+        if isinstance(valor, (list, tuple)) and not _e_par(valor):
+            return self._formatar_lista(rede, metrica, list(valor))
+        return _formatar_escalar(valor)
+
+    def _formatar_lista(self, rede, metrica, itens):
+        if len(itens) <= _ITENS_INLINE:
+            return html.escape(", ".join(_texto(item) for item in itens)) or "—"
+        caminho_csv = self._gravar_csv(rede, metrica, itens)
+        visiveis = itens[:self.linhas_por_tabela]
+        linhas = "".join(
+            "<tr>" + "".join(f"<td>{html.escape(_texto(campo))}</td>" for campo in _campos(item)) + "</tr>"
+            for item in visiveis
+        )
+        relativo = os.path.relpath(caminho_csv, os.path.dirname(os.path.abspath(self.caminho)))
+        return (f'<table class="inner-table">{linhas}</table>'
+                f'<p class="note">Mostrando {len(visiveis):,} de {len(itens):,}. '
+                f'<a href="{html.escape(relativo)}" download>Lista completa (CSV)</a></p>')
+
+    def _gravar_csv(self, rede, metrica, itens):
+        os.makedirs(self.diretorio_arquivos, exist_ok=True)
+        caminho = os.path.join(self.diretorio_arquivos, f"{nome_de_arquivo(rede)}_{nome_de_arquivo(metrica)}.csv")
+        with open(caminho, "w", encoding="utf-8", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerows(_campos(item) for item in itens)
+        return caminho
+
+    def _figura(self, figura):
+        arquivos = figura.get("arquivos", {})
+        base = os.path.dirname(os.path.abspath(self.caminho))
+        titulo = html.escape(figura.get("titulo", ""))
+        if "html" in arquivos:
+            fonte = html.escape(os.path.relpath(arquivos["html"], base))
+            return (f'        <div class="figure"><iframe loading="lazy" title="{titulo}" src="{fonte}"></iframe>'
+                    f'<p class="note"><a href="{fonte}">{titulo}</a></p></div>')
+        for formato in ("svg", "png"):
+            if formato in arquivos:
+                fonte = html.escape(os.path.relpath(arquivos[formato], base))
+                return f'        <div class="figure"><img loading="lazy" alt="{titulo}" src="{fonte}"></div>'
+        return ""
+
+
+def _linha_etapa(etapa):
+    nome = f"{etapa['grupo']}: {etapa['etapa']}" if etapa["grupo"] else etapa["etapa"]
+    if etapa.get("simultanea"):
+        nome += " *"
+    celulas = [
+        "&nbsp;" * 4 * etapa["nivel"] + html.escape(nome),
+        f"{etapa['segundos']:,.2f}",
+        f"{etapa['segundos_cpu']:,.2f}",
+        _formatar_bytes(etapa.get("memoria_pico_bytes")),
+        _formatar_bytes(etapa.get("memoria_aumento_bytes")),
+        _formatar_escalar(etapa["nos"]),
+        _formatar_escalar(etapa["arestas"]),
+    ]
+    return "".join(f"<td>{celula}</td>" for celula in celulas)
+
+
+def _formatar_bytes(valor):
+    return "—" if valor is None else f"{valor / 2 ** 20:,.1f} MB"
+
+
+def _formatar_escalar(valor):
+    if isinstance(valor, (bool, np.bool_)):
+        return "Sim" if valor else "Não"
+    if isinstance(valor, numbers.Integral):
+        return f"{int(valor):,}"
+    if isinstance(valor, numbers.Real):
+        valor = float(valor)
+        if valor != valor:  # NaN
+            return "—"
+        if valor != 0 and abs(valor) < 0.01:
+            return f"{valor:.3e}"
+        return f"{valor:,.4f}"
+    if valor is None:
+        return "—"
+    if isinstance(valor, tuple):
+        return "(" + ", ".join(_formatar_escalar(item) for item in valor) + ")"
+    return html.escape(str(valor))
+
+
+def _e_par(valor):
+    """Tupla curta de escalares (ex.: uma aresta ou um intervalo) é tratada como um único valor."""
+    return isinstance(valor, tuple) and len(valor) <= 3 and all(not isinstance(item, (list, tuple, dict)) for item in valor)
+
+
+def _campos(item):
+    return list(item) if isinstance(item, (list, tuple)) else [item]
+
+
+def _texto(item):
+    if isinstance(item, tuple):
+        return "(" + ", ".join(_texto(campo) for campo in item) + ")"
+    if isinstance(item, np.generic):
+        return str(item.item())
+    return str(item)
+
+
+def _nome_metrica(metrica):
+    return str(metrica).replace("_", " ").capitalize()
@@ -0,0 +1,190 @@
+import os
+
+import numpy as np
+
+from compartilhado import ARRAYS_COMPARTILHADOS, pool_compartilhado
+from grafo_compacto import GrafoCompacto, csr_de_pares, expandir_fronteira, grafo_compacto_de_networkx, simetrizar_csr
+
+
+# Máximo de candidatos (u, v, w) testados de uma vez: limita a memória de cada passo da interseção
+CANDIDATOS_POR_BLOCO = 4 * 2 ** 20
+
+# Tarefas por processo na contagem paralela (faixas de nós menores equilibram melhor a carga)
+TAREFAS_POR_PROCESSO = 4
+
+
+# Função para contar os triângulos de cada nó e calcular clustering local, médio e transitividade
+def contar_triangulos(grafo, processos=None):
+    """
+    Triângulos por nó no grafo visto sem direção (sem laços nem arestas repetidas), com o algoritmo
+    "forward": cada aresta é orientada do nó de menor (grau, índice) para o de maior, então cada nó
+    tem poucos vizinhos "adiante" e cada triângulo é achado uma única vez, a partir do seu menor nó.
+    Para cada aresta adiante u -> v, os vizinhos adiante w de v são procurados entre os de u por
+    busca binária nas chaves ordenadas u * n + w do CSR adiante (interseção de listas ordenadas,
+    vetorizada). As faixas de nós são divididas entre `processos` processos (padrão: um por CPU),
+    com o CSR em memória compartilhada (compartilhado.pool_compartilhado).
+    Retorna o dicionário de _resumo_clustering, com "triangulos_por_no" e "clustering_local".
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    indptr, indices = _sem_direcao(grafo)
+    n = len(indptr) - 1
+    graus = np.diff(np.asarray(indptr, dtype=np.int64))
+
+    # Orienta cada aresta para o extremo de maior (grau, índice)
+    posto = np.empty(n, dtype=np.int64)
+    posto[np.lexsort((np.arange(n), graus))] = np.arange(n)
+    origens = np.repeat(np.arange(n, dtype=np.int64), graus)
+    destinos = np.asarray(indices, dtype=np.int64)
+    adiante = posto[origens] < posto[destinos]
+    indptr_adiante, indices_adiante = csr_de_pares(origens[adiante], destinos[adiante], n)
+    del origens, destinos, adiante
+    indptr_adiante = np.asarray(indptr_adiante, dtype=np.int64)
+    chaves = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr_adiante)) * n + indices_adiante
+
+    # Trabalho de cada nó u: soma dos graus adiante dos seus vizinhos adiante (candidatos a testar)
+    graus_adiante = np.diff(indptr_adiante)
+    trabalho = np.bincount(chaves // n, weights=graus_adiante[indices_adiante], minlength=n) if len(chaves) \
+        else np.zeros(n)
+    processos = processos or os.cpu_count() or 1
+    faixas = _faixas_por_trabalho(trabalho, processos * TAREFAS_POR_PROCESSO)
+
+    arrays = {"indptr": indptr_adiante, "indices": np.asarray(indices_adiante, dtype=np.int64), "chaves": chaves}
+    triangulos = np.zeros(n, dtype=np.int64)
+    with pool_compartilhado(arrays, min(processos, len(faixas))) as mapear:
+        for parcial in mapear(_triangulos_faixa, faixas):
+            triangulos += parcial
+
+    local = np.divide(2.0 * triangulos, graus * (graus - 1.0), out=np.zeros(n), where=graus > 1)
+    resultado = _resumo_clustering(graus, triangulos, local, np.ones(n))
+    resultado.update(metodo="forward", triangulos=int(triangulos.sum()) // 3, triangulos_por_no=triangulos,
+                     clustering_local=local)
+    return resultado
+
+
+# Função para estimar clustering e transitividade a partir de uma amostra de nós
+def clustering_amostrado(grafo, amostras=200, amostrador=None, semente=42):
+    """
+    Estimativa a partir de `amostras` nós: uniforme ou, com `amostrador` (nome em
+    amostragem.AMOSTRADORES ou função), os nós desse amostrador, cada um pesando o inverso da sua
+    probabilidade relativa de inclusão (estimadores de razão ponderados, como em
+    distancias.distribuicao_distancias_amostrada). Os triângulos de cada nó sorteado x são os pares
+    de vizinhos ligados entre si: para cada vizinho v, os vizinhos de v procurados entre os de x.
+    Retorna o mesmo dicionário de contar_triangulos, sem os valores por nó.
+    """
+    if not isinstance(grafo, GrafoCompacto):
+        grafo = grafo_compacto_de_networkx(grafo)
+    indptr, indices = _sem_direcao(grafo)
+    n = len(indptr) - 1
+    if amostrador is None:
+        nos = np.sort(np.random.default_rng(semente).choice(n, size=min(amostras, n), replace=False))
+        pesos = np.ones(len(nos))
+        metodo = "amostragem"
+    else:
+        from amostragem import amostrar
+
+        amostra = amostrar(grafo, amostrador, amostras, semente=semente)
+        nos, pesos = amostra["nos"], amostra["pesos"]
+        metodo = f"amostragem_{amostra['metodo']}"
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    graus = np.diff(indptr)
+    triangulos = np.zeros(len(nos), dtype=np.int64)
+    for i, x in enumerate(nos):
+        vizinhos = indices[indptr[x]:indptr[x + 1]]
+        if len(vizinhos) < 2:
+            continue
+        candidatos = expandir_fronteira(indptr, indices, vizinhos)
+        posicao = np.minimum(np.searchsorted(vizinhos, candidatos), len(vizinhos) - 1)
+        # Cada triângulo (x, v, w) aparece duas vezes: a partir de v e a partir de w
+        triangulos[i] = int(np.count_nonzero(vizinhos[posicao] == candidatos)) // 2
+
+    graus_amostra = graus[nos]
+    local = np.divide(2.0 * triangulos, graus_amostra * (graus_amostra - 1.0), out=np.zeros(len(nos)),
+                      where=graus_amostra > 1)
+    resultado = _resumo_clustering(graus_amostra, triangulos, local, pesos)
+    # Total de triângulos: cada um tem três vértices; a soma ponderada estima a média por nó
+    resultado.update(metodo=metodo, triangulos=float(n * (pesos * triangulos).sum() / pesos.sum() / 3) if len(nos) else 0.0,
+                     amostras=len(nos))
+    return resultado
+
+
+def _resumo_clustering(graus, triangulos, local, pesos):
+    """
+    Clustering médio (média ponderada dos locais, com zero para grau < 2, como no nx), transitividade
+    (3 x triângulos / trios conectados = soma de t(x) / soma de d(x)(d(x) - 1) / 2) e a curva de
+    clustering médio por grau: {"graus", "clustering", "quantidades"}.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    trios = graus * (graus - 1) / 2.0
+    soma_pesos = pesos.sum()
+    soma_trios = (pesos * trios).sum()
+    valores_graus, inverso, quantidades = np.unique(graus, return_inverse=True, return_counts=True)
+    media_por_grau = np.bincount(inverso, weights=pesos * local) / np.bincount(inverso, weights=pesos)
+    return {
+        "clustering_medio": float((pesos * local).sum() / soma_pesos) if soma_pesos else 0.0,
+        "transitividade": float((pesos * triangulos).sum() / soma_trios) if soma_trios else 0.0,
+        "clustering_por_grau": {"graus": valores_graus, "clustering": media_por_grau, "quantidades": quantidades},
+    }
+
+
+def _sem_direcao(grafo):
+    """CSR sem direção e sem laços (os dirigidos são simetrizados; arestas repetidas já não existem)."""
+    if grafo.dirigido:
+        indptr, indices = simetrizar_csr(grafo.indptr, grafo.indices, grafo.indptr_entrada, grafo.indices_entrada)
+    else:
+        indptr, indices = grafo.indptr, grafo.indices
+    origens = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(np.asarray(indptr, dtype=np.int64)))
+    lacos = origens == np.asarray(indices)
+    if lacos.any():
+        return csr_de_pares(origens[~lacos], np.asarray(indices)[~lacos], len(indptr) - 1)
+    return indptr, indices
+
+
+def _faixas_por_trabalho(trabalho, quantidade):
+    """Divide os nós em até `quantidade` faixas contíguas [inicio, fim) com trabalho parecido."""
+    n = len(trabalho)
+    acumulado = np.cumsum(trabalho)
+    total = acumulado[-1] if n else 0
+    if not total:
+        return [(0, n)] if n else []
+    cortes = np.searchsorted(acumulado, total * np.arange(1, quantidade) / quantidade, side="right")
+    limites = np.unique(np.concatenate(([0], cortes, [n])))
+    return [(int(inicio), int(fim)) for inicio, fim in zip(limites[:-1], limites[1:])]
+
+
+def _triangulos_faixa(faixa):
+    """
+    Triângulos achados a partir das arestas adiante u -> v com u na faixa [inicio, fim): candidatos
+    (u, v, w) para cada w adiante de v, em blocos de até CANDIDATOS_POR_BLOCO; (u, w) existe se a
+    chave u * n + w está nas chaves ordenadas. Retorna a contagem por nó (cada triângulo soma 1 nos três).
+    """
+    indptr = ARRAYS_COMPARTILHADOS["indptr"]
+    indices = ARRAYS_COMPARTILHADOS["indices"]
+    chaves = ARRAYS_COMPARTILHADOS["chaves"]
+    n = len(indptr) - 1
+    inicio, fim = faixa
+    triangulos = np.zeros(n, dtype=np.int64)
+    primeira, ultima = int(indptr[inicio]), int(indptr[fim])
+    # Candidatos de cada aresta adiante (posição em indices) = grau adiante do destino
+    custos = np.diff(indptr)[indices[primeira:ultima]]
+    acumulado = np.cumsum(custos)
+    comeco = 0
+    while comeco < len(custos):
+        limite = (acumulado[comeco - 1] if comeco else 0) + CANDIDATOS_POR_BLOCO
+        final = max(int(np.searchsorted(acumulado, limite, side="right")), comeco + 1)
+        arestas = np.arange(primeira + comeco, primeira + final)
+        u = chaves[arestas] // n
+        v = indices[arestas]
+        w = expandir_fronteira(indptr, indices, v)
+        u = np.repeat(u, custos[comeco:final])
+        procurado = u * n + w
+        posicao = np.minimum(np.searchsorted(chaves, procurado), max(len(chaves) - 1, 0))
+        achados = chaves[posicao] == procurado
+        if achados.any():
+            v = np.repeat(v, custos[comeco:final])
+            for vertices in (u[achados], v[achados], w[achados]):
+                triangulos += np.bincount(vertices, minlength=n)
+        comeco = final
+    return triangulos